@@ -2,6 +2,7 @@
 Django Admin Configuration for ShareTools
 """
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
 from .models import (
     User, Category, Location, Item, ItemImage, ItemPrice, 
@@ -126,12 +127,12 @@ class ItemAdmin(admin.ModelAdmin):
     actions = ['publish_items', 'unpublish_items']
     
     def publish_items(self, request, queryset):
-        updated = queryset.update(status='active')
+        updated = queryset.update(status='active', updated_at=timezone.now())
         self.message_user(request, f'{updated} items were successfully published.')
     publish_items.short_description = "Publish selected items"
     
     def unpublish_items(self, request, queryset):
-        updated = queryset.update(status='draft')
+        updated = queryset.update(status='draft', updated_at=timezone.now())
         self.message_user(request, f'{updated} items were successfully unpublished.')
     unpublish_items.short_description = "Unpublish selected items"
 
@@ -222,14 +223,21 @@ class CartAdmin(admin.ModelAdmin):
     list_display = ['user', 'get_items_count', 'get_total_price', 'created_at', 'updated_at']
     search_fields = ['user__username', 'user__email']
     readonly_fields = ['created_at', 'updated_at']
+    list_select_related = ['user']
+
+    def get_queryset(self, request):
+        # Count and total come from one annotated query instead of two per row
+        return super().get_queryset(request).with_totals()
 
     def get_items_count(self, obj):
         return obj.get_items_count()
     get_items_count.short_description = 'Items Count'
+    get_items_count.admin_order_field = 'items_count'
     
     def get_total_price(self, obj):
         return f"£{obj.get_total_price():.2f}"
     get_total_price.short_description = 'Total Price'
+    get_total_price.admin_order_field = 'total_price'
 
 
 @admin.register(CartItem)
@@ -238,6 +246,7 @@ class CartItemAdmin(admin.ModelAdmin):
     list_filter = ['start_date', 'end_date', 'added_at']
     search_fields = ['cart__user__username', 'item__title']
     readonly_fields = ['duration_days', 'added_at']
+    list_select_related = ['cart__user', 'item']
     
     def cart_user(self, obj):
         return obj.cart.user.username
@@ -7,4 +7,8 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
-    verbose_name = 'ShareTools核心功能' 
\ No newline at end of file
+    verbose_name = 'ShareTools核心功能' 
+
+    def ready(self):
+        """Connect cache invalidation signals"""
+        from . import signals  # noqa: F401
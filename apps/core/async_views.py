@@ -0,0 +1,296 @@
+"""
+Native async views for the read-heavy core APIs
+
+Under ASGI (``config.asgi``) these run on the event loop and use the async
+ORM, so a slow client holds a coroutine rather than a worker thread. Their
+JSON is identical to the DRF endpoints they stand in for. Under WSGI they
+still work; Django runs each one in its own event loop.
+"""
+import asyncio
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage, Paginator
+from django.db import close_old_connections
+from django.db.models import Avg, Count, F
+from django.shortcuts import render
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_safe
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from config.metrics import query_budget, timed
+from config.renderers import json_response
+
+from .etags import etag_matches, item_etag, not_modified, with_etag
+from .models import Category, Item, ItemImage, ItemPrice, Location, Review
+from .serializers import CategorySerializer, ItemSerializer, LocationSerializer
+from .suggest import suggestion_index
+from .viewsets import ItemViewSet
+
+SUGGEST_DEFAULT_LIMIT = 8
+SUGGEST_MAX_LIMIT = 20
+AVAILABILITY_WINDOW_DAYS = 90  # How far ahead the product page shows bookings
+
+# Shown when an item has no prices, or on the demo page
+DEFAULT_PRODUCT_PRICES = [
+    {'duration': 1, 'totalPrice': 20, 'dailyPrice': 20},
+    {'duration': 3, 'totalPrice': 54, 'dailyPrice': 18},
+    {'duration': 7, 'totalPrice': 105, 'dailyPrice': 15},
+    {'duration': 30, 'totalPrice': 360, 'dailyPrice': 12},
+]
+
+# PUT, PATCH, DELETE and OPTIONS on /api/items/<id>/ stay with the DRF viewset
+item_detail_writes = ItemViewSet.as_view({'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'})
+
+
+async def run_concurrently(query):
+    """
+    Run a blocking ORM call on a pool thread with its own database connection.
+
+    The async ORM runs every query of a request on one shared thread, so
+    gathering ``aget()`` calls still executes them one after another; this
+    lets independent queries overlap. Connections are closed afterwards per
+    ``CONN_MAX_AGE``, as at the end of a request.
+    """
+    def call():
+        close_old_connections()
+        try:
+            return query()
+        finally:
+            close_old_connections()
+    return await sync_to_async(call, thread_sensitive=False)()
+
+
+def attach_related(item, name, objects):
+    """Store ``objects`` as the prefetched ``item.<name>.all()`` so templates reuse them"""
+    for obj in objects:
+        obj.item = item
+    queryset = getattr(item, name).all()
+    queryset._result_cache = list(objects)
+    queryset._prefetch_done = True
+    item.__dict__.setdefault('_prefetched_objects_cache', {})[name] = queryset
+
+
+def availability_window(bookings, today):
+    """Booked date ranges in the coming window and the first free day (``bookings`` sorted by start)"""
+    next_available = today
+    for start, end in bookings:
+        if start <= next_available <= end:
+            next_available = end + timedelta(days=1)
+    return {
+        'booked': [{'start': start, 'end': end} for start, end in bookings],
+        'nextAvailable': next_available,
+        'isBookedToday': next_available != today,
+    }
+
+
+def not_found(model):
+    """404 body matching DRF's for a missing object"""
+    return json_response({'detail': f'No {model._meta.object_name} matches the given query.'}, status=404)
+
+
+async def paginated_response(request, queryset, serializer_class):
+    """One page of ``queryset`` in DRF ``PageNumberPagination`` format"""
+    count = await queryset.acount()
+    paginator = Paginator(range(count), api_settings.PAGE_SIZE)
+    page_number = request.GET.get('page', 1)
+    if page_number == 'last':
+        page_number = paginator.num_pages
+    try:
+        page = paginator.page(page_number)
+    except InvalidPage:
+        return json_response({'detail': 'Invalid page.'}, status=404)
+
+    rows = [obj async for obj in queryset[page.object_list.start:page.object_list.stop]]
+    with timed('serializer'):
+        results = serializer_class(rows, many=True, context={'request': request}).data
+
+    url = request.build_absolute_uri()
+    next_link = replace_query_param(url, 'page', page.next_page_number()) if page.has_next() else None
+    previous_link = None
+    if page.has_previous():
+        previous_number = page.previous_page_number()
+        previous_link = (
+            remove_query_param(url, 'page') if previous_number == 1
+            else replace_query_param(url, 'page', previous_number)
+        )
+    return json_response({'count': count, 'next': next_link, 'previous': previous_link, 'results': results})
+
+
+def read_only_views(queryset, serializer_class):
+    """Async list and detail views equivalent to a DRF ``ReadOnlyModelViewSet``"""
+    @query_budget(2)
+    @require_safe
+    async def list_view(request):
+        return await paginated_response(request, queryset, serializer_class)
+
+    @query_budget(1)
+    @require_safe
+    async def detail_view(request, pk):
+        obj = await queryset.filter(pk=pk).afirst()
+        if obj is None:
+            return not_found(queryset.model)
+        with timed('serializer'):
+            data = serializer_class(obj, context={'request': request}).data
+        return json_response(data)
+
+    return list_view, detail_view
+
+
+category_list_api, category_detail_api = read_only_views(Category.objects.filter(is_active=True), CategorySerializer)
+location_list_api, location_detail_api = read_only_views(Location.objects.filter(is_active=True), LocationSerializer)
+
+
+@csrf_exempt
+async def item_detail_api(request, pk):
+    """
+    Item details, as ``ItemViewSet.retrieve``: counts a view unless the owner
+    is looking, and answers a matching If-None-Match with 304.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return await sync_to_async(item_detail_writes)(request, pk=pk)
+
+    user = await request.auser()
+    queryset = Item.objects.for_listing()
+    if request.headers.get('If-None-Match'):
+        current = await queryset.filter(pk=pk).values_list('updated_at', 'owner_id').afirst()
+        if current is not None:
+            updated_at, owner_id = current
+            etag = item_etag(request, pk, updated_at)
+            if etag_matches(request, etag):
+                if user.pk != owner_id:
+                    await Item.objects.filter(pk=pk).aupdate(view_count=F('view_count') + 1)
+                return not_modified(etag)
+
+    item = await queryset.filter(pk=pk).afirst()
+    if item is None:
+        return not_found(Item)
+    if user.pk != item.owner_id:
+        await Item.objects.filter(pk=pk).aupdate(view_count=F('view_count') + 1)
+        item.view_count += 1
+
+    # Everything the serializer reads was joined or prefetched above, so this does no I/O
+    with timed('serializer'):
+        data = ItemSerializer(item, context={'request': request}).data
+    return with_etag(json_response(data), item_etag(request, item.pk, item.updated_at))
+
+
+@query_budget(3)  # Only when the index is (re)built
+@require_safe
+async def item_suggest_api(request):
+    """Typeahead suggestions from active item titles, category names and location names"""
+    query = request.GET.get('q', '')
+    try:
+        limit = int(request.GET.get('limit', SUGGEST_DEFAULT_LIMIT))
+    except ValueError:
+        return json_response({'error': 'limit must be an integer'}, status=400)
+    limit = max(1, min(limit, SUGGEST_MAX_LIMIT))
+
+    await suggestion_index.aensure_fresh()
+    return json_response({'query': query, 'suggestions': suggestion_index.suggest(query, limit)})
+
+
+@query_budget(8)  # Session and user, then view count, item, prices, images, bookings and rating
+async def product_detail_view(request, product_id=None):
+    """
+    Render product detail page.
+
+    The item (after counting the view), its prices and images, the upcoming
+    bookings and the owner's rating are loaded concurrently, so the page waits
+    for the slowest query rather than the sum of them.
+    """
+    if not product_id:
+        # If no product_id provided, show demo page
+        context = {
+            'product_id': None,
+            'demo_mode': True,
+            'item': None,
+            'product_data_json': {
+                'id': None,
+                'title': 'Demo Product',
+                'itemValue': 500,
+                'minDailyPrice': 12,
+                'prices': DEFAULT_PRODUCT_PRICES,
+            },
+        }
+        return await sync_to_async(render)(request, 'product_detail.html', context)
+
+    user = await request.auser()
+    today = timezone.now().date()
+    # Imported here: the rental app depends on core models
+    from apps.rental.models import RentalOrder
+
+    def load_item():
+        # Increase view count (avoid incrementing when item owner views their own item)
+        if user.is_authenticated:
+            Item.objects.filter(pk=product_id).exclude(owner=user).update(view_count=F('view_count') + 1)
+        return Item.objects.select_related('owner', 'category', 'location').filter(pk=product_id).first()
+
+    item, prices, images, bookings, owner_rating = await asyncio.gather(
+        run_concurrently(load_item),
+        run_concurrently(lambda: list(ItemPrice.objects.filter(item_id=product_id))),
+        run_concurrently(lambda: list(ItemImage.objects.filter(item_id=product_id))),
+        run_concurrently(lambda: list(
+            RentalOrder.objects.filter(
+                item_id=product_id, status='active', end_date__gte=today,
+                start_date__lte=today + timedelta(days=AVAILABILITY_WINDOW_DAYS),
+            ).order_by('start_date').values_list('start_date', 'end_date')
+        )),
+        run_concurrently(lambda: Review.objects.filter(reviewee__owned_items=product_id).aggregate(
+            average=Avg('rating'), count=Count('id')
+        )),
+    )
+
+    if item is None:
+        # If product doesn't exist, return 404 page or redirect to product list
+        context = {
+            'error': 'Product not found',
+            'product_id': product_id,
+            'item': None,
+            'product_data_json': {
+                'id': None,
+                'title': 'Product Not Found',
+                'itemValue': 500,
+                'minDailyPrice': 20,
+                'prices': DEFAULT_PRODUCT_PRICES[:1],
+            },
+        }
+        return await sync_to_async(render)(request, 'product_detail.html', context)
+
+    attach_related(item, 'prices', prices)
+    attach_related(item, 'images', images)
+
+    # Prepare product data JSON, with prices sorted by rental period
+    product_data = {
+        'id': str(item.id),
+        'title': item.title,
+        'itemValue': float(item.item_value) if item.item_value else 500,
+        'minDailyPrice': None,
+        'prices': [],
+        'availability': availability_window(bookings, today),
+    }
+    active_prices = sorted((price for price in prices if price.is_active), key=lambda price: price.duration_days)
+    if active_prices:
+        for price in active_prices:
+            product_data['prices'].append({
+                'duration': price.duration_days,
+                'totalPrice': float(price.price),
+                'dailyPrice': float(price.daily_price)
+            })
+        product_data['minDailyPrice'] = float(min(price.daily_price for price in active_prices))
+    else:
+        # If no price data, use default prices
+        product_data['prices'] = DEFAULT_PRODUCT_PRICES
+        product_data['minDailyPrice'] = 12.0  # Daily price for 30-day rental
+
+    context = {
+        'item': item,
+        'product_id': product_id,
+        'product_data_json': product_data,
+        'owner_rating': owner_rating,
+        'availability': product_data['availability'],
+    }
+    # Rendering reads the session user, which is a blocking lookup
+    return await sync_to_async(render)(request, 'product_detail.html', context)
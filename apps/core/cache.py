@@ -0,0 +1,87 @@
+"""Cached lookups and rendered pages for the core application"""
+
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.utils.text import slugify
+
+from config.db_routers import read_from_primary
+
+LOCATION_MAP_KEY = 'core:location_map'
+LOCATION_PAGE_VERSION_KEY = 'core:location_page_version:{}'
+LOCATION_PAGE_KEY = 'core:location_page:{}:{}'
+ITEM_AGGREGATES_VERSION_KEY = 'core:item_aggregates_version'
+ITEM_CLUSTERS_KEY = 'core:item_clusters:{}:{}:{}'
+ITEM_FACETS_KEY = 'core:item_facets:{}:{}'
+
+
+def bump_version(version_key):
+    """Increment a cache version counter, creating it if needed, and return the new version"""
+    # Versioning (rather than deleting) means a computation that started before
+    # a change can't store a stale result under the new key
+    if cache.add(version_key, 1, None):
+        return 1
+    try:
+        return cache.incr(version_key)
+    except ValueError:
+        cache.set(version_key, 1, None)
+        return 1
+
+
+def get_location_map():
+    """Map active location slugs to ``{'id', 'slug', 'name'}``, cached until a Location changes"""
+    locations = cache.get(LOCATION_MAP_KEY)
+    if locations is None:
+        from .models import Location
+
+        with read_from_primary():
+            locations = {
+                slug: {'id': pk, 'slug': slug, 'name': name}
+                for pk, slug, name in Location.objects.filter(is_active=True).values_list('id', 'slug', 'name')
+            }
+        cache.set(LOCATION_MAP_KEY, locations, None)
+    return locations
+
+
+def resolve_location(location_name):
+    """Resolve a location slug (or display name) from the URL, or None if unknown"""
+    locations = get_location_map()
+    return locations.get(location_name) or locations.get(slugify(location_name))
+
+
+def invalidate_location_map():
+    """Drop the cached location map"""
+    cache.delete(LOCATION_MAP_KEY)
+
+
+def location_page_key(location_id):
+    """Cache key for the current version of a location's rendered first page"""
+    version = cache.get(LOCATION_PAGE_VERSION_KEY.format(location_id), 0)
+    return LOCATION_PAGE_KEY.format(location_id, version)
+
+
+def invalidate_location_pages(location_ids):
+    """Retire the cached first page of each location by bumping its version"""
+    for location_id in set(location_ids):
+        if location_id is None:
+            continue
+        bump_version(LOCATION_PAGE_VERSION_KEY.format(location_id))
+
+
+def item_clusters_key(precision, bbox):
+    """Cache key for map clusters at ``precision`` within a grid-snapped ``bbox``"""
+    version = cache.get(ITEM_AGGREGATES_VERSION_KEY, 0)
+    return ITEM_CLUSTERS_KEY.format(version, precision, ','.join(f'{value:.6f}' for value in bbox))
+
+
+def item_facets_key(filters):
+    """Cache key for search facets under a normalized ``{name: value}`` filter set"""
+    version = cache.get(ITEM_AGGREGATES_VERSION_KEY, 0)
+    normalized = json.dumps(sorted((name, str(value)) for name, value in filters.items()))
+    return ITEM_FACETS_KEY.format(version, hashlib.md5(normalized.encode()).hexdigest())
+
+
+def invalidate_item_aggregates():
+    """Retire all cached item aggregates (map clusters and search facets)"""
+    bump_version(ITEM_AGGREGATES_VERSION_KEY)
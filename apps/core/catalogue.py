@@ -0,0 +1,229 @@
+"""Process-local columnar snapshot of active items for read-heavy pages"""
+
+import math
+import threading
+import time
+from array import array
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+
+from config.db_routers import read_from_primary
+
+from .cache import bump_version
+
+CATALOGUE_VERSION_KEY = 'core:catalogue_version'
+
+# Sort orders the snapshot can serve, matching ItemFilter's ``sort`` values. View counts are
+# bumped with .update() (no signals, no version bump), so popularity sorts are served from SQL
+CATALOGUE_SORTS = {'', 'created_at', '-created_at', 'item_value', '-item_value'}
+
+
+def item_card(item):
+    """Product card fields for an Item instance (same shape as ``CatalogueSnapshot.card``)"""
+    image = item.primary_image
+    return {
+        'id': item.id,
+        'title': item.title,
+        'category_name': item.category.name,
+        'location_slug': item.location.slug,
+        'image_url': image.image.url if image and image.image else None,
+        'min_daily_price': item.min_daily_price,
+    }
+
+
+class CatalogueSnapshot:
+    """
+    Immutable column arrays for every active item, newest first.
+
+    Row ``n`` of each column describes the same item. Category and location
+    filters use precomputed row lists, so serving a browse page touches only
+    the rows it returns rather than building model instances.
+    """
+    __slots__ = (
+        'version', 'ids', 'titles', 'category_ids', 'location_ids', 'item_values',
+        'created_at', 'min_prices', 'image_names',
+        'category_names', 'category_ids_by_name', 'location_slugs', 'location_ids_by_slug',
+        'rows_by_category', 'rows_by_location',
+    )
+
+    @read_from_primary()
+    def __init__(self, version):
+        from .models import LISTED_STATUSES, Category, Item, ItemImage, ItemPrice, Location
+
+        self.version = version
+        self.ids = []
+        self.titles = []
+        self.category_ids = array('l')
+        self.location_ids = array('l')
+        self.item_values = array('d')
+        self.created_at = array('d')
+        rows_by_category = defaultdict(lambda: array('l'))
+        rows_by_location = defaultdict(lambda: array('l'))
+
+        items = Item.objects.active().order_by('-created_at').values_list(
+            'id', 'title', 'category_id', 'location_id', 'item_value', 'created_at'
+        )
+        row_of = {}
+        for row, (item_id, title, category_id, location_id, item_value, created_at) in enumerate(
+            items.iterator(chunk_size=5000)
+        ):
+            row_of[item_id] = row
+            self.ids.append(item_id)
+            self.titles.append(title)
+            self.category_ids.append(category_id)
+            self.location_ids.append(location_id)
+            self.item_values.append(float(item_value))
+            self.created_at.append(created_at.timestamp())
+            rows_by_category[category_id].append(row)
+            rows_by_location[location_id].append(row)
+
+        # Lowest active daily price per item (NaN when the item has no prices)
+        self.min_prices = array('d', [math.nan]) * len(self.ids)
+        prices = ItemPrice.objects.filter(is_active=True, item__status__in=LISTED_STATUSES).values_list(
+            'item_id', 'price', 'duration_days'
+        )
+        for item_id, price, duration_days in prices.iterator(chunk_size=5000):
+            row = row_of.get(item_id)
+            if row is None or not duration_days:
+                continue
+            daily_price = float(price / duration_days)
+            current = self.min_prices[row]
+            if math.isnan(current) or daily_price < current:
+                self.min_prices[row] = daily_price
+
+        # Same choice as Item.primary_image: first primary image, else first image
+        self.image_names = [None] * len(self.ids)
+        has_primary = set()
+        images = ItemImage.objects.filter(item__status__in=LISTED_STATUSES).order_by('order', '-is_primary').values_list(
+            'item_id', 'image', 'is_primary'
+        )
+        for item_id, image, is_primary in images.iterator(chunk_size=5000):
+            row = row_of.get(item_id)
+            if row is None or row in has_primary:
+                continue
+            if is_primary:
+                has_primary.add(row)
+                self.image_names[row] = image
+            elif self.image_names[row] is None:
+                self.image_names[row] = image
+
+        self.category_names = dict(Category.objects.values_list('id', 'name'))
+        self.category_ids_by_name = {name: pk for pk, name in self.category_names.items()}
+        self.location_slugs = dict(Location.objects.values_list('id', 'slug'))
+        self.location_ids_by_slug = {slug: pk for pk, slug in self.location_slugs.items()}
+        self.rows_by_category = dict(rows_by_category)
+        self.rows_by_location = dict(rows_by_location)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def select(self, category=None, location=None, sort=''):
+        """
+        Row numbers of items matching ``category`` and ``location``, in ``sort`` order.
+
+        ``category`` is a category id or name and ``location`` a location id or
+        slug, as accepted by ItemFilter; empty or ``'all'`` means no filter.
+        """
+        category_id = self._resolve(category, self.category_ids_by_name)
+        location_id = self._resolve(location, self.location_ids_by_slug)
+        if category_id is False or location_id is False:
+            return []
+
+        if category_id is not None and location_id is not None:
+            # Walk the shorter list and check the other column
+            by_category = self.rows_by_category.get(category_id, ())
+            by_location = self.rows_by_location.get(location_id, ())
+            if len(by_category) <= len(by_location):
+                rows = [row for row in by_category if self.location_ids[row] == location_id]
+            else:
+                rows = [row for row in by_location if self.category_ids[row] == category_id]
+        elif category_id is not None:
+            rows = list(self.rows_by_category.get(category_id, ()))
+        elif location_id is not None:
+            rows = list(self.rows_by_location.get(location_id, ()))
+        else:
+            rows = list(range(len(self.ids)))
+
+        # Rows are stored newest first
+        field = sort.lstrip('-')
+        descending = sort.startswith('-')
+        if field == 'created_at' and not descending:
+            rows.reverse()
+        elif field == 'item_value':
+            rows.sort(key=self.item_values.__getitem__, reverse=descending)
+        return rows
+
+    def card(self, row):
+        """Product card fields for one row"""
+        min_price = self.min_prices[row]
+        image_name = self.image_names[row]
+        return {
+            'id': self.ids[row],
+            'title': self.titles[row],
+            'category_name': self.category_names.get(self.category_ids[row]),
+            'location_slug': self.location_slugs.get(self.location_ids[row]),
+            # Resolved per card rather than at build time; most rows are never shown
+            'image_url': default_storage.url(image_name) if image_name else None,
+            'min_daily_price': None if math.isnan(min_price) else min_price,
+        }
+
+    def cards(self, rows):
+        """Product card fields for several rows"""
+        return [self.card(row) for row in rows]
+
+    @staticmethod
+    def _resolve(value, ids_by_name):
+        """Id for a filter value: None for no filter, False for an unknown name"""
+        if value in (None, '', 'all'):
+            return None
+        if isinstance(value, int):
+            return value
+        if value.isdigit():
+            return int(value)
+        return ids_by_name.get(value, False)
+
+
+class Catalogue:
+    """Holds the current snapshot and rebuilds it when the shared version stamp moves"""
+
+    def __init__(self):
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._rebuild_lock = threading.Lock()
+
+    def get(self):
+        """Return a snapshot no more than CATALOGUE_POLL_INTERVAL seconds behind the database"""
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if snapshot is not None and now - self._checked_at < settings.CATALOGUE_POLL_INTERVAL:
+            return snapshot
+
+        version = cache.get(CATALOGUE_VERSION_KEY, 0)
+        self._checked_at = now
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        if snapshot is None:
+            # Nothing to serve yet, so wait for whichever thread is building it
+            with self._rebuild_lock:
+                if self._snapshot is None:
+                    self._snapshot = CatalogueSnapshot(version)
+                return self._snapshot
+
+        # Keep serving the previous snapshot while one thread rebuilds
+        if self._rebuild_lock.acquire(blocking=False):
+            try:
+                self._snapshot = CatalogueSnapshot(version)
+            finally:
+                self._rebuild_lock.release()
+        return self._snapshot
+
+    def invalidate(self):
+        """Make every process rebuild its snapshot at its next poll"""
+        bump_version(CATALOGUE_VERSION_KEY)
+
+
+catalogue = Catalogue()
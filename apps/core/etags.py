@@ -0,0 +1,64 @@
+"""Weak ETags and If-None-Match handling for the item API"""
+
+import hashlib
+
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+
+
+def make_etag(*parts):
+    """Weak ETag over ``parts``; weak because renderers may format the same data differently"""
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return 'W/' + quote_etag(digest)
+
+
+def response_format(request):
+    """Negotiated DRF renderer format; plain (async) Django views always answer JSON"""
+    renderer = getattr(request, 'accepted_renderer', None)
+    return renderer.format if renderer is not None else 'json'
+
+
+def item_etag(request, item_id, updated_at):
+    """
+    ETag for one item's detail representation.
+
+    ``Item.updated_at`` is touched whenever the item's images or prices, or
+    the owner, category or location fields it embeds, change (see
+    ``signals.item_card_changed``, ``user_saved``, ``category_changed`` and
+    ``location_changed``). ``view_count`` is deliberately left out so that
+    counting a view does not invalidate every client's copy.
+    """
+    return make_etag('item', item_id, updated_at.isoformat(), response_format(request))
+
+
+def item_page_etag(request, total, rows):
+    """ETag for a page of items from the total count and each row's ``(id, updated_at)``"""
+    return make_etag(
+        'items', request.get_full_path(), request.user.pk, response_format(request),
+        total, [(item_id, updated_at.isoformat()) for item_id, updated_at in rows],
+    )
+
+
+def etag_matches(request, etag):
+    """True when If-None-Match names ``etag`` (weak comparison, as for GET)"""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    etags = parse_etags(header)
+    if '*' in etags:
+        return True
+    target = etag.removeprefix('W/')
+    return any(candidate.removeprefix('W/') == target for candidate in etags)
+
+
+def with_etag(response, etag):
+    """Attach ``etag`` and ask clients to revalidate rather than reuse their copy unchecked"""
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def not_modified(etag):
+    """Empty 304 response carrying ``etag``"""
+    return with_etag(HttpResponseNotModified(), etag)
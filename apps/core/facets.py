@@ -0,0 +1,96 @@
+"""Facet counts for item search results"""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, Value, When
+
+from config.db_routers import read_from_primary
+
+from .cache import item_facets_key
+from .models import Item
+
+# (value, label, upper bound on item_value); the last band has no upper bound
+PRICE_BANDS = [
+    ('under_100', 'Under £100', 100),
+    ('100_300', '£100 - £300', 300),
+    ('300_600', '£300 - £600', 600),
+    ('600_plus', '£600+', None),
+]
+
+FACET_FIELDS = ['category', 'location', 'condition', 'area_tag', 'price_band']
+
+
+def price_band_expression():
+    """SQL CASE expression assigning each item its PRICE_BANDS value"""
+    bounded = [band for band in PRICE_BANDS if band[2] is not None]
+    return Case(
+        *[When(item_value__lt=upper, then=Value(value)) for value, _, upper in bounded],
+        default=Value(PRICE_BANDS[-1][0]),
+        output_field=CharField(),
+    )
+
+
+def compute_facets(queryset):
+    """
+    Count items per category, location, condition, area tag and price band.
+
+    Uses one GROUP BY over all facet columns together and sums the groups per
+    facet in Python, instead of one COUNT query per facet.
+    """
+    groups = (
+        queryset.order_by()
+        .annotate(price_band=price_band_expression())
+        .values(
+            'category_id', 'category__display_name',
+            'location_id', 'location__name',
+            'condition', 'area_tag', 'price_band',
+        )
+        .annotate(count=Count('id'))
+    )
+
+    counts = {name: defaultdict(int) for name in FACET_FIELDS}
+    labels = {'category': {}, 'location': {}}
+    for group in groups:
+        count = group['count']
+        counts['category'][group['category_id']] += count
+        labels['category'][group['category_id']] = group['category__display_name']
+        counts['location'][group['location_id']] += count
+        labels['location'][group['location_id']] = group['location__name']
+        counts['condition'][group['condition']] += count
+        if group['area_tag']:
+            counts['area_tag'][group['area_tag']] += count
+        counts['price_band'][group['price_band']] += count
+
+    labels['condition'] = dict(Item.CONDITION_CHOICES)
+    labels['price_band'] = {value: label for value, label, _ in PRICE_BANDS}
+    band_order = {value: index for index, (value, _, _) in enumerate(PRICE_BANDS)}
+
+    facets = {}
+    for name in FACET_FIELDS:
+        entries = [
+            {'value': value, 'label': labels.get(name, {}).get(value, value), 'count': count}
+            for value, count in counts[name].items()
+        ]
+        if name == 'price_band':
+            entries.sort(key=lambda entry: band_order[entry['value']])
+        else:
+            entries.sort(key=lambda entry: (-entry['count'], str(entry['label'])))
+        facets[name] = entries
+    return facets
+
+
+def search_facets(item_filter):
+    """Facets for a bound ``ItemFilter``, cached briefly per normalized filter set"""
+    filters = {
+        name: value for name, value in item_filter.form.cleaned_data.items()
+        if name != 'sort' and value not in (None, '', [])
+    }
+    cache_key = item_facets_key(filters)
+    facets = cache.get(cache_key)
+    if facets is None:
+        with read_from_primary():
+            facets = compute_facets(item_filter.qs)
+        cache.set(cache_key, facets, settings.ITEM_FACETS_CACHE_TIMEOUT)
+    return facets
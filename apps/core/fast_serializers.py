@@ -0,0 +1,113 @@
+"""
+Read-only fast path for ``ItemListSerializer`` output
+
+List endpoints fetch ``.values()`` rows with the owner, category and
+location columns joined in, plus the page's images and prices, and build the
+response dicts directly instead of running DRF's field machinery for every
+nested serializer. Output is identical to ``ItemListSerializer``;
+``python -m benchmarks.serializers`` checks that. Toggled by
+``ITEM_LIST_FAST_SERIALIZER``.
+"""
+from collections import defaultdict
+from functools import lru_cache
+
+from django.core.files.storage import default_storage
+
+from .models import ItemImage, ItemPrice
+from .serializers import ItemListSerializer
+
+# Columns read per item; ``updated_at`` is only used for ETags
+ITEM_LIST_VALUES = (
+    'id', 'title', 'status', 'condition', 'item_value', 'address', 'location_tag', 'area_tag',
+    'created_at', 'updated_at', 'view_count', 'booking_count',
+    'owner_id', 'owner__username', 'owner__email', 'owner__phone', 'owner__avatar', 'owner__is_verified',
+    'category_id', 'category__name', 'category__display_name', 'category__description',
+    'category__icon', 'category__is_active',
+    'location_id', 'location__name', 'location__slug', 'location__description', 'location__is_active',
+)
+
+
+@lru_cache(maxsize=None)
+def _field_formatters():
+    """DRF's own formatting for the fields whose output depends on settings"""
+    fields = ItemListSerializer().fields
+    return fields['item_value'].to_representation, fields['created_at'].to_representation
+
+
+def item_list_rows(queryset):
+    """``queryset`` as the ``.values()`` rows ``serialize_item_rows`` reads"""
+    return queryset.select_related(None).prefetch_related(None).values(*ITEM_LIST_VALUES)
+
+
+def serialize_item_rows(rows, request=None):
+    """``ItemListSerializer(many=True).data`` for rows from ``item_list_rows``"""
+    rows = list(rows)
+    item_ids = [row['id'] for row in rows]
+    format_value, format_datetime = _field_formatters()
+
+    # Same choice as Item.primary_image: first primary image in Meta order, else the first image
+    images = {}
+    for image in ItemImage.objects.filter(item_id__in=item_ids).values('id', 'item_id', 'image', 'alt_text', 'is_primary'):
+        current = images.get(image['item_id'])
+        if current is None or (image['is_primary'] and not current['is_primary']):
+            images[image['item_id']] = image
+
+    # Same arithmetic as ItemPrice.daily_price, so the Decimal renders identically
+    daily_prices = defaultdict(list)
+    for item_id, price, duration_days in ItemPrice.objects.filter(
+        item_id__in=item_ids, is_active=True
+    ).order_by().values_list('item_id', 'price', 'duration_days'):
+        daily_prices[item_id].append(price / duration_days)
+
+    data = []
+    for row in rows:
+        image = images.get(row['id'])
+        avatar = row['owner__avatar']
+        if avatar:
+            avatar = default_storage.url(avatar)
+            if request is not None:
+                avatar = request.build_absolute_uri(avatar)
+        prices = daily_prices.get(row['id'])
+        data.append({
+            'id': str(row['id']),
+            'title': row['title'],
+            'category': {
+                'id': row['category_id'],
+                'name': row['category__name'],
+                'display_name': row['category__display_name'],
+                'description': row['category__description'],
+                'icon': row['category__icon'],
+                'is_active': row['category__is_active'],
+            },
+            'owner': {
+                'id': str(row['owner_id']),
+                'username': row['owner__username'],
+                'email': row['owner__email'],
+                'phone': row['owner__phone'],
+                'avatar': avatar or None,
+                'is_verified': row['owner__is_verified'],
+            },
+            'location': {
+                'id': row['location_id'],
+                'name': row['location__name'],
+                'slug': row['location__slug'],
+                'description': row['location__description'],
+                'is_active': row['location__is_active'],
+            },
+            'status': row['status'],
+            'condition': row['condition'],
+            'item_value': None if row['item_value'] is None else format_value(row['item_value']),
+            'address': row['address'],
+            'location_tag': row['location_tag'],
+            'area_tag': row['area_tag'],
+            'created_at': None if row['created_at'] is None else format_datetime(row['created_at']),
+            'view_count': row['view_count'],
+            'booking_count': row['booking_count'],
+            'min_daily_price': min(prices) if prices else None,
+            'primary_image': {
+                'id': image['id'],
+                'image': default_storage.url(image['image']) if image['image'] else None,
+                'alt_text': image['alt_text'],
+            } if image else None,
+        })
+    return data
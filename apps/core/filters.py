@@ -0,0 +1,69 @@
+"""Item filters shared by the browse page and the search API"""
+
+import django_filters
+from django.db.models import Q
+
+from .facets import PRICE_BANDS
+from .models import Item
+
+
+class ItemFilter(django_filters.FilterSet):
+    """Keyword, category, location, condition, price and sort filtering for items"""
+    q = django_filters.CharFilter(method='filter_keyword')
+    category = django_filters.CharFilter(method='filter_category')
+    location = django_filters.CharFilter(method='filter_location')
+    condition = django_filters.ChoiceFilter(choices=Item.CONDITION_CHOICES)
+    min_price = django_filters.NumberFilter(field_name='item_value', lookup_expr='gte')
+    max_price = django_filters.NumberFilter(field_name='item_value', lookup_expr='lte')
+    area_tag = django_filters.CharFilter()
+    location_tag = django_filters.CharFilter()
+    price_band = django_filters.ChoiceFilter(
+        choices=[(value, label) for value, label, _ in PRICE_BANDS], method='filter_price_band'
+    )
+    sort = django_filters.OrderingFilter(
+        fields=['created_at', 'item_value', 'view_count'],
+    )
+
+    class Meta:
+        model = Item
+        fields = [
+            'q', 'category', 'location', 'condition', 'min_price', 'max_price',
+            'area_tag', 'location_tag', 'price_band',
+        ]
+
+    def filter_keyword(self, queryset, name, value):
+        """Match the keyword against title, description and address"""
+        return queryset.filter(
+            Q(title__icontains=value) |
+            Q(description__icontains=value) |
+            Q(address__icontains=value)
+        )
+
+    def filter_category(self, queryset, name, value):
+        """Accept a category id (API) or category name (browse page)"""
+        if value == 'all':
+            return queryset
+        if value.isdigit():
+            return queryset.filter(category_id=value)
+        return queryset.filter(category__name=value)
+
+    def filter_location(self, queryset, name, value):
+        """Accept a location id (API) or location slug (browse page)"""
+        if value == 'all':
+            return queryset
+        if value.isdigit():
+            return queryset.filter(location_id=value)
+        return queryset.filter(location__slug=value)
+
+    def filter_price_band(self, queryset, name, value):
+        """Keep items whose value falls in the chosen PRICE_BANDS band"""
+        lower = None
+        for band, _, upper in PRICE_BANDS:
+            if band == value:
+                if lower is not None:
+                    queryset = queryset.filter(item_value__gte=lower)
+                if upper is not None:
+                    queryset = queryset.filter(item_value__lt=upper)
+                return queryset
+            lower = upper
+        return queryset
@@ -0,0 +1,169 @@
+"""Geohash encoding and distance helpers for location-based item search"""
+
+import heapq
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; distances fall back to pure Python
+    np = None
+
+GEOHASH_PRECISION = 9  # ~5m cells, stored on Item.geohash
+EARTH_RADIUS_KM = 6371.0088
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Encode a coordinate as a geohash string of ``precision`` characters"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    latitude, longitude = float(latitude), float(longitude)
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # Geohash interleaves bits starting with longitude
+    while len(chars) < precision:
+        value, bounds = (longitude, lng_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            bounds[0] = mid
+        else:
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def geohash_cell_size(precision):
+    """Return the (latitude, longitude) size in degrees of a geohash cell"""
+    total_bits = 5 * precision
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def bounding_boxes(latitude, longitude, radius_km):
+    """
+    ``(min_lat, min_lng, max_lat, max_lng)`` boxes that together enclose a circle of ``radius_km``.
+
+    A circle crossing the antimeridian is split into one box per side, as the
+    clusters endpoint splits viewports; one reaching a pole spans every longitude.
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    lat_delta = math.degrees(angle)
+    min_lat, max_lat = latitude - lat_delta, latitude + lat_delta
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return [(max(-90.0, min_lat), -180.0, min(90.0, max_lat), 180.0)]
+
+    # Widest longitude offset of the circle (at the latitude where its edge runs north-south)
+    lng_delta = math.degrees(math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(latitude)))))
+    west, east = longitude - lng_delta, longitude + lng_delta
+    if west < -180.0:
+        return [(min_lat, west + 360.0, max_lat, 180.0), (min_lat, -180.0, max_lat, east)]
+    if east > 180.0:
+        return [(min_lat, west, max_lat, 180.0), (min_lat, -180.0, max_lat, east - 360.0)]
+    return [(min_lat, west, max_lat, east)]
+
+
+def covering_prefixes(bbox):
+    """
+    Geohash prefixes whose cells together cover ``bbox``.
+
+    Uses the longest prefix whose cells are at least as large as the box, so
+    the box spans at most two cells per axis and the cells holding its four
+    corners cover it. Returns an empty list when the box is too large for any
+    prefix to narrow the search.
+    """
+    min_lat, min_lng, max_lat, max_lng = bbox
+    precision = 0
+    while precision < GEOHASH_PRECISION:
+        lat_size, lng_size = geohash_cell_size(precision + 1)
+        if lat_size < max_lat - min_lat or lng_size < max_lng - min_lng:
+            break
+        precision += 1
+    if precision == 0:
+        return []
+    corners = [(min_lat, min_lng), (min_lat, max_lng), (max_lat, min_lng), (max_lat, max_lng)]
+    return sorted({encode_geohash(lat, lng, precision) for lat, lng in corners})
+
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """Great-circle distances in km from one point to sequences of points"""
+    if np is not None:
+        lat1 = np.radians(latitude)
+        lat2 = np.radians(np.asarray(latitudes, dtype=float))
+        d_lat = lat2 - lat1
+        d_lng = np.radians(np.asarray(longitudes, dtype=float) - longitude)
+        a = np.sin(d_lat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(d_lng / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+    lat1 = math.radians(latitude)
+    cos_lat1 = math.cos(lat1)
+    distances = []
+    for lat, lng in zip(latitudes, longitudes):
+        lat2 = math.radians(lat)
+        a = (math.sin((lat2 - lat1) / 2) ** 2
+             + cos_lat1 * math.cos(lat2) * math.sin(math.radians(lng - longitude) / 2) ** 2)
+        distances.append(2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a)))
+    return distances
+
+
+def rank_by_distance(latitude, longitude, rows, radius_km, limit):
+    """
+    Rank ``(id, latitude, longitude)`` rows by distance from a point.
+
+    Returns up to ``limit`` ``(id, distance_km)`` pairs within ``radius_km``,
+    nearest first.
+    """
+    if not rows:
+        return []
+    ids, latitudes, longitudes = zip(*rows)
+    distances = haversine_km(latitude, longitude, [float(v) for v in latitudes], [float(v) for v in longitudes])
+
+    if np is not None:
+        within = np.flatnonzero(distances <= radius_km)
+        if len(within) > limit:
+            # Partial selection avoids sorting every candidate
+            within = within[np.argpartition(distances[within], limit - 1)[:limit]]
+        order = within[np.argsort(distances[within], kind='stable')]
+        return [(ids[i], float(distances[i])) for i in order]
+
+    ranked = heapq.nsmallest(
+        limit, ((distance, index) for index, distance in enumerate(distances) if distance <= radius_km)
+    )
+    return [(ids[index], distance) for distance, index in ranked]
+
+
+def cluster_precision(zoom):
+    """Geohash precision for map clusters at a web-map zoom level (about four cells per 256px tile)"""
+    for precision in range(1, GEOHASH_PRECISION):
+        lng_bits = (5 * precision + 1) // 2
+        if lng_bits >= zoom + 2:
+            return precision
+    return GEOHASH_PRECISION - 1
+
+
+def snap_bbox(bbox, precision):
+    """Grow ``bbox`` outwards to whole geohash cells so clusters are never split at its edges"""
+    min_lat, min_lng, max_lat, max_lng = bbox
+    lat_size, lng_size = geohash_cell_size(precision)
+    return (
+        max(-90.0, math.floor((min_lat + 90.0) / lat_size) * lat_size - 90.0),
+        max(-180.0, math.floor((min_lng + 180.0) / lng_size) * lng_size - 180.0),
+        min(90.0, math.ceil((max_lat + 90.0) / lat_size) * lat_size - 90.0),
+        min(180.0, math.ceil((max_lng + 180.0) / lng_size) * lng_size - 180.0),
+    )
+
+
+def cell_count(bbox, precision):
+    """Number of geohash cells of ``precision`` in a grid-snapped ``bbox``"""
+    min_lat, min_lng, max_lat, max_lng = bbox
+    lat_size, lng_size = geohash_cell_size(precision)
+    return round((max_lat - min_lat) / lat_size) * round((max_lng - min_lng) / lng_size)
@@ -0,0 +1,355 @@
+"""
+Management command to generate a large, deterministic synthetic dataset
+
+Example:
+    python manage.py generate_fixture_data --items 100000 --users 20000 \
+        --orders 1000000 --images-per-item 5 --seed 42
+"""
+import io
+import math
+import random
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, time as dt_time, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.core.geo import encode_geohash
+from apps.core.models import Category, Item, ItemImage, ItemPrice, Location, User
+from apps.rental.models import RentalOrder
+
+TITLE_NOUNS = {
+    'tools': ['Drill', 'Circular Saw', 'Angle Grinder', 'Jigsaw', 'Impact Driver', 'Sander', 'Tile Cutter'],
+    'electronics': ['Projector', 'Speaker System', 'Camera', 'Drone', 'Microphone', 'Monitor', 'Gimbal'],
+    'garden': ['Lawn Mower', 'Hedge Trimmer', 'Leaf Blower', 'Pressure Washer', 'Chainsaw', 'Rotavator'],
+    'sports': ['Kayak', 'Tent', 'Mountain Bike', 'Paddle Board', 'Ski Set', 'Golf Clubs', 'Climbing Kit'],
+    'automotive': ['Car Jack', 'Compressor', 'Jump Starter', 'Roof Box', 'Polisher', 'Torque Wrench'],
+    'home': ['Steam Cleaner', 'Ladder', 'Carpet Cleaner', 'Wallpaper Stripper', 'Dehumidifier', 'Vacuum'],
+}
+# For categories without their own nouns, e.g. ones added in the admin
+GENERIC_NOUNS = ['Toolkit', 'Equipment Set', 'Kit', 'Work Light', 'Trolley', 'Storage Case']
+TITLE_ADJECTIVES = ['Cordless', 'Heavy Duty', 'Compact', 'Professional', 'Electric', 'Folding', 'Portable', 'Petrol']
+
+# (name, weight, item value range, 1-day price range)
+PRICE_TIERS = [
+    ('budget', 50, (20, 150), (3, 12)),
+    ('standard', 35, (150, 600), (10, 35)),
+    ('premium', 15, (600, 3000), (30, 120)),
+]
+# Multi-day prices as a fraction of (1-day price * days)
+DURATION_DISCOUNTS = {1: Decimal('1.00'), 3: Decimal('0.90'), 7: Decimal('0.75'), 30: Decimal('0.55')}
+
+ITEM_STATUS_WEIGHTS = [('active', 90), ('draft', 4), ('maintenance', 3), ('inactive', 3)]
+CONDITION_WEIGHTS = [('new', 10), ('excellent', 30), ('good', 40), ('fair', 15), ('poor', 5)]
+RENTAL_DAY_WEIGHTS = [(1, 30), (2, 20), (3, 20), (7, 20), (14, 7), (30, 3)]
+PAYMENT_METHODS = ['credit_card', 'debit_card', 'paypal', 'bank_transfer']
+
+# Relative booking demand per month (Jan..Dec) by category
+SEASONALITY = {
+    'garden': [2, 2, 5, 8, 10, 10, 10, 9, 6, 4, 2, 2],
+    'sports': [4, 3, 4, 6, 8, 10, 10, 10, 6, 4, 3, 5],
+    'automotive': [4, 4, 6, 8, 7, 6, 6, 6, 7, 8, 6, 5],
+    'home': [7, 6, 9, 10, 8, 6, 5, 5, 7, 8, 7, 6],
+    'electronics': [5, 4, 4, 5, 6, 7, 7, 7, 5, 5, 8, 10],
+    'tools': [6, 6, 8, 9, 9, 8, 7, 7, 8, 8, 7, 5],
+}
+GLASGOW_CENTRE = (55.8642, -4.2518)
+POPULARITY_EXPONENT = 1.1
+FIXTURE_IMAGE_DIR = 'items/fixtures'
+BUNDLED_IMAGES = [
+    'images/sample_tool1.png', 'images/sample_tool2.png', 'images/sample_tool3.png',
+    'images/extendable_ladder.png', 'images/speaker_system.png', 'images/vacuum_cleaner.png',
+]
+
+
+class Command(BaseCommand):
+    help = 'Generate a deterministic synthetic dataset (users, items, prices, images, rental orders)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=1000, help='Number of items')
+        parser.add_argument('--users', type=int, default=200, help='Number of users')
+        parser.add_argument('--orders', type=int, default=5000, help='Number of rental orders')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; same seed, same data')
+        parser.add_argument('--images-per-item', type=int, default=1, help='Image rows per item')
+        parser.add_argument('--placeholder-images', action='store_true',
+                            help='Write placeholder image files instead of reusing bundled samples')
+        parser.add_argument('--history-days', type=int, default=730,
+                            help='How far back rental start dates go')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per bulk_create')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.prefix = f"fx{options['seed']}"
+
+        if User.objects.filter(username__startswith=f'{self.prefix}_').exists():
+            raise CommandError(
+                f'Fixture data for seed {options["seed"]} already exists; use another --seed'
+            )
+
+        self.stdout.write('🚀 Generating synthetic ShareTools data...')
+        started = time.perf_counter()
+
+        if not Category.objects.exists() or not Location.objects.exists():
+            call_command('init_data', stdout=io.StringIO())
+
+        self.categories = list(Category.objects.values_list('id', 'name'))
+        self.locations = list(Location.objects.values_list('id', 'name'))
+        self.image_names = self.prepare_images(options['placeholder_images'])
+
+        user_ids = self.timed('users', self.create_users, options['users'])
+        items = self.timed('items', self.create_items, options['items'], user_ids)
+        self.timed('prices', self.create_prices, items)
+        self.timed('images', self.create_images, items, options['images_per_item'])
+        self.timed('rental orders', self.create_orders, options['orders'], items, user_ids,
+                   options['history_days'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Fixture data generated in {time.perf_counter() - started:.1f}s'
+        ))
+
+    def timed(self, label, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        self.stdout.write(f'  ✓ {label} ({time.perf_counter() - started:.1f}s)')
+        return result
+
+    def new_uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def weighted(self, pairs):
+        values, weights = zip(*pairs)
+        return self.rng.choices(values, weights=weights)[0]
+
+    def bulk_insert(self, model, rows):
+        """bulk_create an iterable of unsaved instances in fixed-size batches"""
+        batch, total = [], 0
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                model.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_create(batch)
+            total += len(batch)
+        return total
+
+    def prepare_images(self, placeholder):
+        """Image names used for ItemImage rows"""
+        if not placeholder:
+            return BUNDLED_IMAGES
+
+        from PIL import Image
+
+        directory = Path(settings.MEDIA_ROOT) / FIXTURE_IMAGE_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        names = []
+        for n in range(8):
+            name = f'{FIXTURE_IMAGE_DIR}/placeholder_{n}.png'
+            path = Path(settings.MEDIA_ROOT) / name
+            if not path.exists():
+                # Separate generator so existing files don't shift the main sequence
+                colour_rng = random.Random(n)
+                colour = tuple(colour_rng.randint(60, 220) for _ in range(3))
+                Image.new('RGB', (400, 300), colour).save(path)
+            names.append(name)
+        return names
+
+    def create_users(self, count):
+        """Create users sharing one pre-hashed password"""
+        password = make_password(f'{self.prefix}-password')
+        user_ids = [self.new_uuid() for _ in range(count)]
+
+        def rows():
+            for n, user_id in enumerate(user_ids):
+                yield User(
+                    id=user_id,
+                    username=f'{self.prefix}_user{n}',
+                    email=f'{self.prefix}_user{n}@example.com',
+                    password=password,
+                    is_verified=n % 3 == 0,
+                )
+
+        self.bulk_insert(User, rows())
+        return user_ids
+
+    def create_items(self, count, user_ids):
+        """
+        Create items across price tiers and return compact per-item tuples
+        ``(id, owner_id, category_name, day_price, item_value, popularity)``.
+        """
+        if not user_ids:
+            raise CommandError('At least one user is required to own items')
+
+        now = timezone.now()
+        location_centres = {
+            location_id: (
+                GLASGOW_CENTRE[0] + self.rng.uniform(-0.06, 0.06),
+                GLASGOW_CENTRE[1] + self.rng.uniform(-0.12, 0.12),
+            )
+            for location_id, _ in self.locations
+        }
+        tiers = [(tier, tier[1]) for tier in PRICE_TIERS]
+        items = []
+
+        def rows():
+            for n in range(count):
+                category_id, category_name = self.rng.choice(self.categories)
+                location_id, location_name = self.rng.choice(self.locations)
+                _, _, value_range, price_range = self.weighted(tiers)
+                item_value = Decimal(self.rng.randint(*value_range))
+                day_price = Decimal(self.rng.randint(*price_range))
+                title = f'{self.rng.choice(TITLE_ADJECTIVES)} {self.rng.choice(TITLE_NOUNS.get(category_name, GENERIC_NOUNS))}'
+                lat_centre, lng_centre = location_centres[location_id]
+                status = self.weighted(ITEM_STATUS_WEIGHTS)
+                item = Item(
+                    id=self.new_uuid(),
+                    title=title,
+                    description=f'{title} in {location_name}, available for short term hire.',
+                    category_id=category_id,
+                    owner_id=self.rng.choice(user_ids),
+                    location_id=location_id,
+                    status=status,
+                    condition=self.weighted(CONDITION_WEIGHTS),
+                    item_value=item_value,
+                    address=f'{self.rng.randint(1, 400)} {location_name} Road, Glasgow',
+                    location_tag=location_name,
+                    area_tag=f'{location_name} {self.rng.choice(["North", "South", "Central"])}',
+                    latitude=Decimal(f'{lat_centre + self.rng.gauss(0, 0.008):.6f}'),
+                    longitude=Decimal(f'{lng_centre + self.rng.gauss(0, 0.015):.6f}'),
+                    published_at=now if status == 'active' else None,
+                )
+                # bulk_create skips Item.save(), which normally sets the geohash
+                item.geohash = encode_geohash(item.latitude, item.longitude)
+                # Popularity follows a Zipf-like curve over a shuffled rank
+                items.append([item.id, item.owner_id, category_name, day_price, item_value, 0.0])
+                yield item
+
+        self.bulk_insert(Item, rows())
+
+        ranks = list(range(len(items)))
+        self.rng.shuffle(ranks)
+        for item, rank in zip(items, ranks):
+            item[5] = 1.0 / math.pow(rank + 1, POPULARITY_EXPONENT)
+        return items
+
+    def create_prices(self, items):
+        def rows():
+            for item_id, _, _, day_price, item_value, _ in items:
+                durations = (1, 3, 7, 30) if item_value >= 600 else (1, 3, 7)
+                for days in durations:
+                    yield ItemPrice(
+                        item_id=item_id,
+                        duration_days=days,
+                        price=(day_price * days * DURATION_DISCOUNTS[days]).quantize(Decimal('0.01')),
+                    )
+
+        return self.bulk_insert(ItemPrice, rows())
+
+    def create_images(self, items, per_item):
+        def rows():
+            for item_id, *_ in items:
+                for order in range(per_item):
+                    yield ItemImage(
+                        item_id=item_id,
+                        image=self.rng.choice(self.image_names),
+                        alt_text=f'Image {order + 1}',
+                        order=order,
+                        is_primary=order == 0,
+                    )
+
+        return self.bulk_insert(ItemImage, rows())
+
+    def start_date_sampler(self, history_days):
+        """Sample start dates clustered by each category's seasonal demand"""
+        today = timezone.now().date()
+        first_day = today - timedelta(days=history_days)
+        span = history_days + 60  # a few weeks of upcoming bookings
+
+        def sample(category_name):
+            weights = SEASONALITY.get(category_name, [1] * 12)
+            peak = max(weights)
+            while True:
+                day = first_day + timedelta(days=self.rng.randrange(span))
+                # Weekend starts are more common
+                boost = 1.0 if day.weekday() >= 4 else 0.7
+                if self.rng.random() * peak <= weights[day.month - 1] * boost:
+                    return day
+
+        return sample
+
+    def create_orders(self, count, items, user_ids, history_days):
+        """Create rental orders, biased towards popular items and busy seasons"""
+        if not items or len(user_ids) < 2:
+            return 0
+
+        today = timezone.now().date()
+        now = timezone.now()
+        cum_weights, total = [], 0.0
+        for item in items:
+            total += item[5]
+            cum_weights.append(total)
+        sample_start = self.start_date_sampler(history_days)
+        booking_counts = Counter()
+        service_rate, service_minimum = Decimal('0.05'), Decimal('2.00')
+
+        def rows():
+            for _ in range(count):
+                item_id, owner_id, category_name, day_price, item_value, _ = self.rng.choices(
+                    items, cum_weights=cum_weights
+                )[0]
+                renter_id = self.rng.choice(user_ids)
+                while renter_id == owner_id:
+                    renter_id = self.rng.choice(user_ids)
+
+                days = self.weighted(RENTAL_DAY_WEIGHTS)
+                start = sample_start(category_name)
+                end = start + timedelta(days=days - 1)
+                subtotal = day_price * days
+                service_fee = max((subtotal * service_rate).quantize(Decimal('0.01')), service_minimum)
+                completed = end < today
+                booking_counts[item_id] += 1
+                yield RentalOrder(
+                    id=self.new_uuid(),
+                    item_id=item_id,
+                    renter_id=renter_id,
+                    owner_id=owner_id,
+                    start_date=start,
+                    end_date=end,
+                    duration_days=days,
+                    daily_rate=day_price,
+                    total_amount=subtotal + service_fee,
+                    security_deposit=item_value,
+                    service_fee=service_fee,
+                    payment_method=self.rng.choice(PAYMENT_METHODS),
+                    payment_date=now,
+                    transaction_id=f'TXN_{self.rng.getrandbits(32):08X}',
+                    status='completed' if completed else 'active',
+                    completed_at=self.end_of_day(end) if completed else None,
+                )
+
+        created = self.bulk_insert(RentalOrder, rows())
+
+        # Roll booking counts up onto items
+        updates = (Item(id=item_id, booking_count=n) for item_id, n in booking_counts.items())
+        batch = []
+        for item in updates:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                Item.objects.bulk_update(batch, ['booking_count'])
+                batch = []
+        if batch:
+            Item.objects.bulk_update(batch, ['booking_count'])
+        return created
+
+    @staticmethod
+    def end_of_day(day):
+        return timezone.make_aware(datetime.combine(day, dt_time(18, 0)))
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:53
+
+from django.db import migrations, models
+
+from apps.core.geo import encode_geohash
+
+
+def backfill_geohash(apps, schema_editor):
+    """Compute geohashes for items that already have coordinates"""
+    Item = apps.get_model('core', 'Item')
+    items = Item.objects.filter(latitude__isnull=False, longitude__isnull=False).only('id', 'latitude', 'longitude')
+    batch = []
+    for item in items.iterator(chunk_size=2000):
+        item.geohash = encode_geohash(item.latitude, item.longitude)
+        batch.append(item)
+        if len(batch) >= 2000:
+            Item.objects.bulk_update(batch, ['geohash'])
+            batch = []
+    if batch:
+        Item.objects.bulk_update(batch, ['geohash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_item_area_tag_item_location_tag'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='geohash',
+            field=models.CharField(blank=True, editable=False, max_length=12, verbose_name='Geohash'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['status', 'geohash'], name='core_item_status_62abff_idx'),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
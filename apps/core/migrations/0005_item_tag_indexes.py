@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:58
+
+from django.db import migrations, models
+
+
+def normalize_tags(apps, schema_editor):
+    """Collapse whitespace in existing area/location tags so facets group them together"""
+    Item = apps.get_model('core', 'Item')
+    batch = []
+    for item in Item.objects.only('id', 'area_tag', 'location_tag').iterator(chunk_size=2000):
+        area_tag = ' '.join(item.area_tag.split())
+        location_tag = ' '.join(item.location_tag.split())
+        if (area_tag, location_tag) != (item.area_tag, item.location_tag):
+            item.area_tag, item.location_tag = area_tag, location_tag
+            batch.append(item)
+        if len(batch) >= 2000:
+            Item.objects.bulk_update(batch, ['area_tag', 'location_tag'])
+            batch = []
+    if batch:
+        Item.objects.bulk_update(batch, ['area_tag', 'location_tag'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_item_geohash'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_tags, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['area_tag'], name='core_item_area_ta_915d5f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['location_tag'], name='core_item_locatio_b5830e_idx'),
+        ),
+    ]
@@ -4,10 +4,18 @@ ShareTools Core Application Data Models
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from decimal import Decimal
 import uuid
 
+from .geo import bounding_boxes, covering_prefixes, encode_geohash, rank_by_distance
+
+# Item.objects.nearest() searches at most NEAREST_WIDEN_STEPS boxes, starting at
+# radius / 4**(steps - 1) and widening 4x each time
+NEAREST_WIDEN_FACTOR = 4
+NEAREST_WIDEN_STEPS = 3
+
 
 class User(AbstractUser):
     """Extended User Model"""
@@ -74,6 +82,62 @@ class Category(models.Model):
         return self.display_name
 
 
+def normalize_tag(value):
+    """Trim and collapse whitespace in a free-text tag"""
+    return ' '.join(value.split()) if value else ''
+
+
+# Published items: available today, or rented today but bookable for other dates
+LISTED_STATUSES = ('active', 'rented')
+
+
+class ItemQuerySet(models.QuerySet):
+    """Item QuerySet"""
+
+    def active(self):
+        """Items that are published and available to browse"""
+        return self.filter(status__in=LISTED_STATUSES)
+
+    def for_listing(self):
+        """Load everything item cards and list serializers read, in a fixed number of queries"""
+        return self.select_related('owner', 'category', 'location').prefetch_related('images', 'prices')
+
+    def in_bbox(self, bbox):
+        """Items inside ``(min_lat, min_lng, max_lat, max_lng)``, narrowed by geohash prefix first"""
+        min_lat, min_lng, max_lat, max_lng = bbox
+        queryset = self.filter(
+            latitude__range=(min_lat, max_lat),
+            longitude__range=(min_lng, max_lng),
+        )
+        prefixes = covering_prefixes(bbox)
+        if prefixes:
+            prefix_filter = models.Q()
+            for prefix in prefixes:
+                prefix_filter |= models.Q(geohash__startswith=prefix)
+            queryset = queryset.filter(prefix_filter)
+        return queryset
+
+    def nearest(self, latitude, longitude, radius_km, limit):
+        """
+        Up to ``limit`` ``(id, distance_km)`` pairs within ``radius_km``, nearest first.
+
+        Searches a small box first and widens it only while it holds fewer than
+        ``limit`` matches; anything outside a box is farther than everything
+        found inside it, so dense areas never scan the whole radius.
+        """
+        search_radius = radius_km / (NEAREST_WIDEN_FACTOR ** (NEAREST_WIDEN_STEPS - 1))
+        while True:
+            boxes = bounding_boxes(latitude, longitude, search_radius)
+            candidates = self.in_bbox(boxes[0])
+            for bbox in boxes[1:]:
+                candidates |= self.in_bbox(bbox)
+            rows = list(candidates.values_list('id', 'latitude', 'longitude'))
+            ranked = rank_by_distance(latitude, longitude, rows, search_radius, limit)
+            if len(ranked) >= limit or search_radius >= radius_km:
+                return ranked
+            search_radius = min(search_radius * NEAREST_WIDEN_FACTOR, radius_km)
+
+
 class Item(models.Model):
     """Item Model"""
     STATUS_CHOICES = [
@@ -112,6 +176,7 @@ class Item(models.Model):
     area_tag = models.CharField(max_length=100, blank=True, verbose_name="Area Tag")
     latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True, verbose_name="Latitude")
     longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True, verbose_name="Longitude")
+    geohash = models.CharField(max_length=12, blank=True, editable=False, verbose_name="Geohash")
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created At")
@@ -122,6 +187,8 @@ class Item(models.Model):
     view_count = models.PositiveIntegerField(default=0, verbose_name="View Count")
     booking_count = models.PositiveIntegerField(default=0, verbose_name="Booking Count")
 
+    objects = ItemQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Item"
         verbose_name_plural = "Items"
@@ -130,11 +197,28 @@ class Item(models.Model):
             models.Index(fields=['status', 'category']),
             models.Index(fields=['location', 'status']),
             models.Index(fields=['-created_at']),
+            models.Index(fields=['status', 'geohash']),
+            models.Index(fields=['area_tag']),
+            models.Index(fields=['location_tag']),
         ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """Normalize tags and keep the geohash in step with the coordinates"""
+        # Collapse stray whitespace so tag facets don't split on it
+        self.area_tag = normalize_tag(self.area_tag)
+        self.location_tag = normalize_tag(self.location_tag)
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = encode_geohash(self.latitude, self.longitude)
+        else:
+            self.geohash = ''
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'geohash'}
+        super().save(*args, **kwargs)
+
     def publish(self):
         """Publish the item"""
         self.status = 'active'
@@ -147,10 +231,9 @@ class Item(models.Model):
 
     def get_min_daily_price(self):
         """Get the minimum daily price"""
-        prices = self.prices.filter(is_active=True)
-        if prices.exists():
-            return min(price.daily_price for price in prices)
-        return None
+        # Filter in Python so a prefetch_related('prices') cache is reused
+        daily_prices = [price.daily_price for price in self.prices.all() if price.is_active]
+        return min(daily_prices) if daily_prices else None
     
     @property
     def min_daily_price(self):
@@ -160,12 +243,15 @@ class Item(models.Model):
     @property
     def primary_image(self):
         """Get the primary image for this item"""
+        # Iterate images.all() so a prefetch_related('images') cache is reused;
+        # without one this is a single query instead of two
+        images = list(self.images.all())
         # First try to get the primary image
-        primary = self.images.filter(is_primary=True).first()
-        if primary:
-            return primary
+        for image in images:
+            if image.is_primary:
+                return image
         # If no primary image, return the first image
-        return self.images.first()
+        return images[0] if images else None
 
 
 class ItemImage(models.Model):
@@ -321,12 +407,29 @@ class Review(models.Model):
         return f"{self.reviewer.username} reviewed {self.item.title} - {self.rating} stars"
 
 
+class CartQuerySet(models.QuerySet):
+    """Cart QuerySet"""
+
+    def with_totals(self):
+        """Annotate ``items_count`` and ``total_price``, computed in SQL in the same query"""
+        return self.annotate(
+            items_count=models.Count('items'),
+            total_price=Coalesce(
+                models.Sum(models.F('items__daily_price') * models.F('items__duration_days')),
+                models.Value(Decimal('0.00')),
+                output_field=models.DecimalField(max_digits=12, decimal_places=2),
+            ),
+        )
+
+
 class Cart(models.Model):
     """Shopping Cart Model"""
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='cart', verbose_name="User")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created At")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Updated At")
 
+    objects = CartQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Cart"
         verbose_name_plural = "Carts"
@@ -335,12 +438,18 @@ class Cart(models.Model):
         return f"{self.user.username}'s Cart"
 
     def get_total_price(self):
-        """Get total price of cart"""
-        return sum(item.get_total_price() for item in self.items.all())
+        """Get total price of cart (from the with_totals() annotation when present)"""
+        if hasattr(self, 'total_price'):
+            return self.total_price
+        if 'items' in getattr(self, '_prefetched_objects_cache', {}):
+            return sum((item.get_total_price() for item in self.items.all()), Decimal('0.00'))
+        return Cart.objects.filter(pk=self.pk).with_totals().values_list('total_price', flat=True).get()
 
     def get_items_count(self):
-        """Get number of items in cart"""
-        return self.items.count()
+        """Get number of items in cart (from the with_totals() annotation when present)"""
+        if hasattr(self, 'items_count'):
+            return self.items_count
+        return len(self.items.all()) if 'items' in getattr(self, '_prefetched_objects_cache', {}) else self.items.count()
 
 
 class CartItem(models.Model):
@@ -1,7 +1,8 @@
 """ShareTools Core Application Serializers"""
 
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Item, ItemImage, ItemPrice, Category, Location, User
+from .models import Cart, CartItem, Item, ItemImage, ItemPrice, Category, Location, User
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -138,14 +139,10 @@ class ItemSerializer(serializers.ModelSerializer):
         return obj.is_available()
     
     def get_primary_image(self, obj):
-        """Get primary image"""
-        primary_image = obj.images.filter(is_primary=True).first()
+        """Get primary image, falling back to the first image"""
+        primary_image = obj.primary_image
         if primary_image:
             return ItemImageSerializer(primary_image).data
-        # If no primary image, return the first image
-        first_image = obj.images.first()
-        if first_image:
-            return ItemImageSerializer(first_image).data
         return None
     
     def create(self, validated_data):
@@ -184,22 +181,14 @@ class ItemListSerializer(serializers.ModelSerializer):
         return obj.get_min_daily_price()
     
     def get_primary_image(self, obj):
-        """Get primary image"""
-        primary_image = obj.images.filter(is_primary=True).first()
+        """Get primary image, falling back to the first image"""
+        primary_image = obj.primary_image
         if primary_image:
             return {
                 'id': primary_image.id,
                 'image': primary_image.image.url if primary_image.image else None,
                 'alt_text': primary_image.alt_text
             }
-        # If no primary image, return the first image
-        first_image = obj.images.first()
-        if first_image:
-            return {
-                'id': first_image.id,
-                'image': first_image.image.url if first_image.image else None,
-                'alt_text': first_image.alt_text
-            }
         return None
 
 
@@ -231,4 +220,45 @@ class ItemCreateUpdateSerializer(serializers.ModelSerializer):
         """Update item"""
         if instance.owner != self.context['request'].user:
             raise serializers.ValidationError("You can only edit your own items")
-        return super().update(instance, validated_data)
\ No newline at end of file
+        return super().update(instance, validated_data)
+
+
+class CartItemSerializer(serializers.ModelSerializer):
+    """Cart Item Serializer"""
+    item_title = serializers.CharField(source='item.title', read_only=True)
+    total_price = serializers.DecimalField(max_digits=12, decimal_places=2, source='get_total_price', read_only=True)
+
+    class Meta:
+        model = CartItem
+        fields = [
+            'id', 'item', 'item_title', 'start_date', 'end_date',
+            'duration_days', 'daily_price', 'total_price', 'added_at'
+        ]
+        read_only_fields = fields
+
+
+class CartItemWriteSerializer(serializers.Serializer):
+    """One item to add to a cart, or new dates for an item already in it"""
+    item = serializers.UUIDField()
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+
+    def validate(self, data):
+        """Validate data"""
+        if data['end_date'] < data['start_date']:
+            raise serializers.ValidationError("End date cannot be earlier than start date")
+        if data['start_date'] < timezone.localdate():
+            raise serializers.ValidationError("Start date cannot be in the past")
+        return data
+
+
+class CartSerializer(serializers.ModelSerializer):
+    """Cart Serializer (expects a Cart.objects.with_totals() instance)"""
+    items = CartItemSerializer(many=True, read_only=True)
+    items_count = serializers.IntegerField(read_only=True)
+    total_price = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = Cart
+        fields = ['id', 'items', 'items_count', 'total_price', 'updated_at']
+        read_only_fields = fields
@@ -0,0 +1,123 @@
+"""Cache invalidation for the core application"""
+
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import invalidate_item_aggregates, invalidate_location_map, invalidate_location_pages
+from .catalogue import catalogue
+from .models import LISTED_STATUSES, Category, Item, ItemImage, ItemPrice, Location, User
+from .suggest import suggestion_index
+
+
+# User fields embedded as ``owner`` in item payloads (UserSerializer, fast_serializers)
+OWNER_FIELDS = ('username', 'email', 'phone', 'avatar', 'is_verified')
+
+
+def touch_items(items):
+    """Move ``updated_at`` on ``items`` so their API ETags change with the related rows they embed"""
+    return items.update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def location_changed(sender, instance, **kwargs):
+    """Rebuild the slug map, drop the location's cached page and refresh suggestions"""
+    if kwargs.get('created') is False:
+        touch_items(Item.objects.filter(location_id=instance.pk))
+    invalidate_location_map()
+    invalidate_location_pages([instance.pk])
+    suggestion_index.invalidate()
+    catalogue.invalidate()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, instance, **kwargs):
+    """Category names appear in suggestions and the catalogue snapshot"""
+    if kwargs.get('created') is False:
+        touch_items(Item.objects.filter(category_id=instance.pk))
+    suggestion_index.invalidate()
+    catalogue.invalidate()
+
+
+def owner_values(user):
+    """The loaded OWNER_FIELDS of ``user``, read without fetching deferred fields"""
+    return tuple(str(user.__dict__.get(name)) for name in OWNER_FIELDS)
+
+
+@receiver(post_init, sender=User)
+def remember_loaded_user(sender, instance, **kwargs):
+    instance._loaded_owner_values = owner_values(instance)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    """Refresh the user's items when a field shown as their owner changes (not on login)"""
+    if created or (update_fields is not None and not set(update_fields) & set(OWNER_FIELDS)):
+        return
+    values = owner_values(instance)
+    if values == getattr(instance, '_loaded_owner_values', None):
+        return
+    instance._loaded_owner_values = values
+    items = Item.objects.filter(owner_id=instance.pk)
+    location_ids = set(items.values_list('location_id', flat=True))
+    if location_ids:
+        touch_items(items)
+        invalidate_location_pages(location_ids)
+        catalogue.invalidate()
+
+
+def suggestion_entry(item):
+    """What an item contributes to the suggestion index, or None unless it is listed"""
+    if item.__dict__.get('status') not in LISTED_STATUSES:
+        return None
+    return item.__dict__.get('title'), item.__dict__.get('category_id'), item.__dict__.get('location_id')
+
+
+@receiver(post_init, sender=Item)
+def remember_loaded_item(sender, instance, **kwargs):
+    """Keep the loaded location and suggestion entry so changes can undo the old values"""
+    # Read __dict__ directly so deferred fields are not fetched one query per instance
+    instance._loaded_location_id = instance.__dict__.get('location_id')
+    instance._loaded_suggestion = suggestion_entry(instance)
+
+
+@receiver(post_save, sender=Item)
+def item_saved(sender, instance, created, **kwargs):
+    """Refresh caches and the suggestion index for the item's old and new values"""
+    invalidate_location_pages([instance.location_id, getattr(instance, '_loaded_location_id', None)])
+    invalidate_item_aggregates()
+    catalogue.invalidate()
+    if 'title' in instance.__dict__ and 'status' in instance.__dict__:
+        suggestion = suggestion_entry(instance)
+        # A new instance "loaded" its constructor values, which were never in the index
+        loaded = None if created else getattr(instance, '_loaded_suggestion', None)
+        suggestion_index.update_item(loaded, suggestion)
+        instance._loaded_suggestion = suggestion
+    else:
+        # Saved with deferred fields, so the new values are unknown here
+        suggestion_index.invalidate()
+    instance._loaded_location_id = instance.location_id
+
+
+@receiver(post_delete, sender=Item)
+def item_deleted(sender, instance, **kwargs):
+    """Drop the item from cached pages, aggregates and the suggestion index"""
+    invalidate_location_pages([instance.location_id, getattr(instance, '_loaded_location_id', None)])
+    invalidate_item_aggregates()
+    catalogue.invalidate()
+    suggestion_index.update_item(getattr(instance, '_loaded_suggestion', None), None)
+
+
+@receiver(post_save, sender=ItemImage)
+@receiver(post_delete, sender=ItemImage)
+@receiver(post_save, sender=ItemPrice)
+@receiver(post_delete, sender=ItemPrice)
+def item_card_changed(sender, instance, **kwargs):
+    """Images and prices appear on item cards and details, so refresh every copy of the item"""
+    # Touch updated_at so the item's API ETag changes too
+    Item.objects.filter(pk=instance.item_id).update(updated_at=timezone.now())
+    location_id = Item.objects.filter(pk=instance.item_id).values_list('location_id', flat=True).first()
+    invalidate_location_pages([location_id])
+    catalogue.invalidate()
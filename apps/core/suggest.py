@@ -0,0 +1,215 @@
+"""In-memory prefix index behind /api/items/suggest/"""
+
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+
+from config.db_routers import read_from_primary
+
+from .cache import bump_version
+
+SUGGEST_VERSION_KEY = 'core:suggest_version'
+SUGGEST_SHORT_PREFIX = 2  # Rankings for prefixes up to this long are kept until the index changes
+SUGGEST_TOP_KEPT = 20  # Phrases kept per short prefix (async_views.SUGGEST_MAX_LIMIT)
+SUGGEST_REBUILD_INTERVAL = 30  # Seconds between rebuilds triggered by other processes' changes
+PREFIX_END = chr(0x10FFFF)  # Sorts after any character a key can continue with
+
+
+def normalize(text):
+    """Lower-case and collapse whitespace for matching"""
+    return ' '.join(text.lower().split())
+
+
+class SuggestionIndex:
+    """
+    Sorted-array prefix index of item titles, category names and location names.
+
+    Each phrase is indexed under every word start ("heavy duty drill",
+    "duty drill", "drill") so typing any word matches it. Weights are the
+    number of active items with that title, category or location. Changes
+    made in this process are applied incrementally; changes made elsewhere
+    are picked up by rebuilding when the shared version stamp moves.
+
+    A lookup ranks every key in the prefix range, so heavy phrases are found
+    however many lighter keys sort before them. One- and two-character
+    prefixes have the widest ranges and are ranked once per index change.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = []  # Sorted (key, kind, phrase) tuples
+        self._weights = Counter()  # (kind, phrase) -> active item count
+        self._labels = {}  # (kind, phrase) -> display text
+        self._category_names = {}
+        self._location_names = {}
+        self._short_rankings = {}  # prefix -> top SUGGEST_TOP_KEPT (weight key, weight) pairs
+        self.version = None
+        self.built_at = 0.0
+
+    # ===== Building =====
+    @read_from_primary()
+    def rebuild(self):
+        """Load every active item title, category and location from the database"""
+        from .models import Category, Item, Location
+
+        version = cache.get(SUGGEST_VERSION_KEY, 0)
+        category_names = dict(Category.objects.filter(is_active=True).values_list('id', 'display_name'))
+        location_names = dict(Location.objects.filter(is_active=True).values_list('id', 'name'))
+
+        weights = Counter()
+        labels = {}
+        for title, category_id, location_id in Item.objects.active().values_list(
+            'title', 'category_id', 'location_id'
+        ).order_by().iterator(chunk_size=5000):
+            for entry in self._entries(title, category_id, location_id, category_names, location_names):
+                weights[entry[:2]] += 1
+                labels.setdefault(entry[:2], entry[2])
+
+        keys = sorted(
+            (key, kind, phrase)
+            for kind, phrase in weights
+            for key in self._word_starts(phrase)
+        )
+        with self._lock:
+            self._keys = keys
+            self._weights = weights
+            self._labels = labels
+            self._category_names = category_names
+            self._location_names = location_names
+            self._short_rankings = {}
+            self.version = version
+            self.built_at = time.monotonic()
+
+    def ensure_fresh(self):
+        """Build on first use, and rebuild (rate-limited) after changes made by other processes"""
+        if self.version is None:
+            self.rebuild()
+            return
+        if time.monotonic() - self.built_at < SUGGEST_REBUILD_INTERVAL:
+            return
+        if cache.get(SUGGEST_VERSION_KEY, 0) != self.version:
+            self.rebuild()
+
+    async def aensure_fresh(self):
+        """``ensure_fresh`` for async views: the rebuild itself runs in a worker thread"""
+        if self.version is None:
+            await sync_to_async(self.rebuild)()
+            return
+        if time.monotonic() - self.built_at < SUGGEST_REBUILD_INTERVAL:
+            return
+        if await cache.aget(SUGGEST_VERSION_KEY, 0) != self.version:
+            await sync_to_async(self.rebuild)()
+
+    def invalidate(self):
+        """Force a rebuild on next use in every process (category or location names changed)"""
+        bump_version(SUGGEST_VERSION_KEY)
+        self.version = None
+
+    # ===== Incremental updates =====
+    def update_item(self, old, new):
+        """
+        Move one item's contribution from ``old`` to ``new``.
+
+        Each is a ``(title, category_id, location_id)`` tuple, or None when the
+        item was not (or is no longer) active.
+        """
+        if old == new:
+            return
+        version = bump_version(SUGGEST_VERSION_KEY)
+        if self.version is None:
+            return
+        with self._lock:
+            if old is not None:
+                for entry in self._entries(*old, self._category_names, self._location_names):
+                    self._remove(entry)
+            if new is not None:
+                for entry in self._entries(*new, self._category_names, self._location_names):
+                    self._add(entry)
+            self._short_rankings = {}
+            # Our own change is applied; if nobody else changed anything meanwhile
+            # the index is current at the new version and needs no rebuild
+            if self.version is not None and version == self.version + 1:
+                self.version = version
+
+    def _add(self, entry):
+        weight_key = entry[:2]
+        if self._weights[weight_key] == 0:
+            self._labels[weight_key] = entry[2]
+            for key in self._word_starts(entry[1]):
+                insort(self._keys, (key, *weight_key))
+        self._weights[weight_key] += 1
+
+    def _remove(self, entry):
+        weight_key = entry[:2]
+        if self._weights[weight_key] <= 0:
+            return
+        self._weights[weight_key] -= 1
+        if self._weights[weight_key] == 0:
+            del self._weights[weight_key]
+            self._labels.pop(weight_key, None)
+            for key in self._word_starts(entry[1]):
+                position = bisect_left(self._keys, (key, *weight_key))
+                if position < len(self._keys) and self._keys[position] == (key, *weight_key):
+                    del self._keys[position]
+
+    # ===== Lookup =====
+    def suggest(self, query, limit):
+        """Top ``limit`` phrases with a word starting with ``query``, most items first"""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        labels = self._labels
+
+        if len(prefix) <= SUGGEST_SHORT_PREFIX and limit <= SUGGEST_TOP_KEPT:
+            rankings = self._short_rankings
+            ranked = rankings.get(prefix)
+            if ranked is None:
+                ranked = rankings[prefix] = self._rank(prefix, SUGGEST_TOP_KEPT)
+            ranked = ranked[:limit]
+        else:
+            ranked = self._rank(prefix, limit)
+        return [
+            {'text': labels.get(weight_key, weight_key[1]), 'type': weight_key[0], 'count': weight}
+            for weight_key, weight in ranked
+        ]
+
+    def _rank(self, prefix, limit):
+        """Top ``limit`` ``(weight key, weight)`` pairs over every key starting with ``prefix``"""
+        keys = self._keys
+        weights = self._weights
+
+        matches = {}
+        start = bisect_left(keys, (prefix,))
+        end = bisect_left(keys, (prefix + PREFIX_END,), start)
+        for key, kind, phrase in keys[start:end]:
+            weight = weights.get((kind, phrase), 0)
+            if weight:
+                matches[(kind, phrase)] = weight
+
+        # Ties are broken alphabetically, as in the sorted key array
+        return heapq.nsmallest(limit, matches.items(), key=lambda match: (-match[1], match[0][1]))
+
+    # ===== Helpers =====
+    @staticmethod
+    def _entries(title, category_id, location_id, category_names, location_names):
+        """(kind, normalized phrase, display text) tuples contributed by one item"""
+        entries = [('item', normalize(title), title.strip())] if title.strip() else []
+        if category_id in category_names:
+            entries.append(('category', normalize(category_names[category_id]), category_names[category_id]))
+        if location_id in location_names:
+            entries.append(('location', normalize(location_names[location_id]), location_names[location_id]))
+        return entries
+
+    @staticmethod
+    def _word_starts(phrase):
+        """Every suffix of ``phrase`` that starts at a word boundary"""
+        words = phrase.split(' ')
+        return {' '.join(words[index:]) for index in range(len(words))}
+
+
+suggestion_index = SuggestionIndex()
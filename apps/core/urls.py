@@ -1,8 +1,8 @@
 """Core application URL configuration"""
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from . import views
-from .viewsets import ItemViewSet, CategoryViewSet, LocationViewSet, ItemImageViewSet, ItemPriceViewSet
+from . import async_views, views
+from .viewsets import ItemViewSet, CategoryViewSet, LocationViewSet, ItemImageViewSet, ItemPriceViewSet, CartViewSet
 
 # Create DRF router for API endpoints
 router = DefaultRouter()
@@ -13,6 +13,7 @@ router.register(r'categories', CategoryViewSet, basename='category')
 router.register(r'locations', LocationViewSet, basename='location')
 router.register(r'item-images', ItemImageViewSet, basename='itemimage')
 router.register(r'item-prices', ItemPriceViewSet, basename='itemprice')
+router.register(r'cart', CartViewSet, basename='cart')
 
 urlpatterns = [
     # ==================== Page Routes ==================== #
@@ -37,16 +38,16 @@ urlpatterns = [
     path('about.html', views.about_view, name='about_html'),  # Direct .html access compatibility
     path('view-orders/', views.view_orders, name='view_orders'),  # View orders page
     path('view-orders.html', views.view_orders, name='view_orders_html'),  # Direct .html access compatibility
-    path('product/<uuid:product_id>/', views.product_detail_view, name='product_detail'),  # Product detail page
-    path('product-detail/', views.product_detail_view, name='product_detail_demo'),  # Product detail demo page
-    path('product-detail.html', views.product_detail_view, name='product_detail_html'),  # Direct .html access compatibility
+    path('product/<uuid:product_id>/', async_views.product_detail_view, name='product_detail'),  # Product detail page
+    path('product-detail/', async_views.product_detail_view, name='product_detail_demo'),  # Product detail demo page
+    path('product-detail.html', async_views.product_detail_view, name='product_detail_html'),  # Direct .html access compatibility
     path('test-api/', views.test_api_view, name='test_api'),  # API test page
     path('test-images/', views.test_images_view, name='test_images'),  # Image test page
     path('test-image-display/', views.test_image_display_view, name='test_image_display'),  # Image display test page
     path('test-image-upload/', views.test_image_upload_view, name='test_image_upload'),  # Image upload test page
     path('new-image-upload/', views.new_image_upload_view, name='new_image_upload'),  # New image upload page
-    path('upload-navigation/', views.upload_navigation_view, name='upload_navigation'),
-    path('location/<str:location_name>/', views.browse_things_view, name='location_things'),  # Upload navigation page
+    path('upload-navigation/', views.upload_navigation_view, name='upload_navigation'),  # Upload navigation page
+    path('location/<str:location_name>/', views.location_things_view, name='location_things'),  # Items in one location
     
     # ==================== Authentication API Routes ==================== #
     path('api/auth/register/', views.register_api, name='register_api'),  # User registration API
@@ -61,6 +62,15 @@ urlpatterns = [
     path('api/validate/form/', views.validate_form_data, name='validate_form_data'),  # Form validation API
     path('api/suggestions/prices/', views.get_price_suggestions, name='get_price_suggestions'),  # Price suggestions API
     
+    # ==================== Async API Routes ==================== #
+    # Read-only endpoints served natively under ASGI; listed before the router so they take precedence
+    path('api/items/suggest/', async_views.item_suggest_api, name='item_suggest_api'),  # Typeahead suggestions API
+    path('api/items/<uuid:pk>/', async_views.item_detail_api, name='item_detail_api'),  # Item detail API (writes go to ItemViewSet)
+    path('api/categories/', async_views.category_list_api, name='category_list_api'),  # Category list API
+    path('api/categories/<int:pk>/', async_views.category_detail_api, name='category_detail_api'),  # Category detail API
+    path('api/locations/', async_views.location_list_api, name='location_list_api'),  # Location list API
+    path('api/locations/<int:pk>/', async_views.location_detail_api, name='location_detail_api'),  # Location detail API
+    
     # ==================== DRF API Routes ==================== #
     path('api/', include(router.urls)),  # Django REST Framework API routes
 ]
\ No newline at end of file
@@ -5,16 +5,27 @@ from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils.decorators import method_decorator
 from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage, Paginator
 from django.contrib.auth.password_validation import validate_password
 import json
+from contextlib import nullcontext
+
+from config.db_routers import read_from_primary
+from .cache import location_page_key, resolve_location
+from .catalogue import CATALOGUE_SORTS, catalogue, item_card
 from .models import User
 from .validators import PriceValidator
 
+BROWSE_PAGE_SIZE = 24  # Product cards per browse page / infinite scroll batch
+CATALOGUE_PARAMS = {'category', 'location', 'sort', 'page', 'partial'}  # Browse params the catalogue can serve
+
 
 def home(request):
     """Render home page"""
@@ -53,22 +64,97 @@ def edit_profile_view(request):
     return render(request, 'edit_profile.html')
 
 
+def render_browse_page(request, queryset, location=None, use_snapshot=True):
+    """
+    Render one page of product cards from ``queryset``, or just the cards for infinite scroll.
+
+    ``use_snapshot=False`` always reads from SQL; the catalogue snapshot can lag
+    the database by CATALOGUE_POLL_INTERVAL, so pages that get cached must not use it.
+    """
+    from .filters import ItemFilter
+
+    params = request.GET
+    if (use_snapshot and settings.CATALOGUE_SNAPSHOT_ENABLED and set(params) <= CATALOGUE_PARAMS
+            and params.get('sort', '') in CATALOGUE_SORTS):
+        # Category/location/sort only: served from the in-memory catalogue
+        snapshot = catalogue.get()
+        rows = snapshot.select(
+            category=params.get('category'),
+            location=location['id'] if location else params.get('location'),
+            sort=params.get('sort', ''),
+        )
+        to_cards = snapshot.cards
+    else:
+        # Same filters and preloaded queryset as /api/items/search/
+        rows = ItemFilter(params, queryset=queryset.for_listing()).qs
+        to_cards = item_cards
+
+    paginator = Paginator(rows, BROWSE_PAGE_SIZE)
+    partial = bool(params.get('partial'))
+    if partial:
+        # Infinite scroll must not get the last page again for an out-of-range page
+        try:
+            page = paginator.page(params.get('page') or 1)
+        except InvalidPage:
+            return HttpResponse('')
+    else:
+        page = paginator.get_page(params.get('page'))
+
+    context = {
+        'cards': to_cards(page.object_list),
+        'page': page,
+        'location': location,
+        'is_filtered': location is not None or any(
+            params.get(name) for name in ItemFilter.base_filters if name != 'sort'
+        ),
+        'active_filter': (
+            location['slug'] if location else params.get('location') or params.get('category') or 'all'
+        ),
+        'search_query': params.get('q', ''),
+    }
+
+    if partial:
+        return render(request, 'partials/product_cards.html', context)
+    return render(request, 'browse_things.html', context)
+
+
+def item_cards(items):
+    """Product card fields for a page of Item instances"""
+    return [item_card(item) for item in items]
+
+
 def browse_things_view(request):
     """Render items browsing page"""
     from .models import Item
 
-    # Get all active items, preload related data for performance
-    items = Item.objects.filter(status='active').select_related(
-        'owner', 'category', 'location'
-    ).prefetch_related(
-        'images'  # Preload image relationships to ensure primary_image property works correctly
-    ).order_by('-created_at')
+    return render_browse_page(request, Item.objects.active())
 
-    context = {
-        'items': items,
-    }
 
-    return render(request, 'browse_things.html', context)
+def location_things_view(request, location_name):
+    """Render items browsing page for one location; the unfiltered first page is cached"""
+    from .models import Item
+
+    location = resolve_location(location_name)
+    if location is None:
+        raise Http404('Location not found')
+
+    # Only the plain landing page is cached; filtered and later pages vary too much
+    cache_key = location_page_key(location['id']) if not request.GET else None
+    if cache_key:
+        html = cache.get(cache_key)
+        if html is not None:
+            return HttpResponse(html)
+
+    # A page about to be cached is rendered from SQL on the primary (using the
+    # (location, status) index), so it is never older than its cache key version
+    with read_from_primary() if cache_key else nullcontext():
+        response = render_browse_page(
+            request, Item.objects.filter(location_id=location['id']).active(), location=location,
+            use_snapshot=cache_key is None,
+        )
+    if cache_key:
+        cache.set(cache_key, response.content.decode(), settings.LOCATION_PAGE_CACHE_TIMEOUT)
+    return response
 
 
 def locations_view(request):
@@ -95,109 +181,6 @@ def view_orders(request):
     return render(request, 'view_orders.html')
 
 
-def product_detail_view(request, product_id=None):
-    """Render product detail page"""
-    from .models import Item
-    from django.shortcuts import get_object_or_404
-    import json
-    from decimal import Decimal
-
-    # Get product information from database based on product_id
-    if product_id:
-        try:
-            # Preload related data for performance and to avoid query errors
-            item = Item.objects.select_related(
-                'owner', 'category', 'location'
-            ).prefetch_related(
-                'images', 'prices'
-            ).get(id=product_id)
-
-            # Increase view count (avoid incrementing when item owner views their own item)
-            if request.user.is_authenticated and request.user != item.owner:
-                Item.objects.filter(pk=item.pk).update(view_count=item.view_count + 1)
-                # Reload data while maintaining preloaded relationships
-                item = Item.objects.select_related(
-                    'owner', 'category', 'location'
-                ).prefetch_related(
-                    'images', 'prices'
-                ).get(id=product_id)
-
-            # Prepare product data JSON, fix price display logic
-            product_data = {
-                'id': str(item.id),
-                'title': item.title,
-                'itemValue': float(item.item_value) if item.item_value else 500,
-                'minDailyPrice': None,  # Will be calculated below
-                'prices': []
-            }
-
-            # Add price information, ensure prices are sorted by rental period
-            active_prices = item.prices.filter(is_active=True).order_by('duration_days')
-            if active_prices.exists():
-                for price in active_prices:
-                    product_data['prices'].append({
-                        'duration': price.duration_days,
-                        'totalPrice': float(price.price),
-                        'dailyPrice': float(price.daily_price)
-                    })
-                
-                # Calculate minimum daily rental price
-                min_daily_price = min(price.daily_price for price in active_prices)
-                product_data['minDailyPrice'] = float(min_daily_price)
-            else:
-                # If no price data, use default prices
-                product_data['prices'] = [
-                    {'duration': 1, 'totalPrice': 20, 'dailyPrice': 20},
-                    {'duration': 3, 'totalPrice': 54, 'dailyPrice': 18},
-                    {'duration': 7, 'totalPrice': 105, 'dailyPrice': 15},
-                    {'duration': 30, 'totalPrice': 360, 'dailyPrice': 12}
-                ]
-                product_data['minDailyPrice'] = 12.0  # Daily price for 30-day rental
-
-            context = {
-                'item': item,
-                'product_id': product_id,
-                'product_data_json': product_data,
-            }
-        except Item.DoesNotExist:
-            # If product doesn't exist, return 404 page or redirect to product list
-            context = {
-                'error': 'Product not found',
-                'product_id': product_id,
-                'item': None,
-                'product_data_json': {
-                    'id': None,
-                    'title': 'Product Not Found',
-                    'itemValue': 500,
-                    'minDailyPrice': 20,
-                    'prices': [
-                        {'duration': 1, 'totalPrice': 20, 'dailyPrice': 20}
-                    ]
-                },
-            }
-    else:
-        # If no product_id provided, show demo page
-        context = {
-            'product_id': None,
-            'demo_mode': True,
-            'item': None,
-            'product_data_json': {
-                'id': None,
-                'title': 'Demo Product',
-                'itemValue': 500,
-                'minDailyPrice': 12,
-                'prices': [
-                    {'duration': 1, 'totalPrice': 20, 'dailyPrice': 20},
-                    {'duration': 3, 'totalPrice': 54, 'dailyPrice': 18},
-                    {'duration': 7, 'totalPrice': 105, 'dailyPrice': 15},
-                    {'duration': 30, 'totalPrice': 360, 'dailyPrice': 12}
-                ]
-            },
-        }
-
-    return render(request, 'product_detail.html', context)
-
-
 def test_api_view(request):
     """API test page"""
     return render(request, 'test_api.html')
@@ -1,21 +1,45 @@
 """ViewSets for ShareTools core application"""
 
-from rest_framework import viewsets, status, filters
+from rest_framework import serializers, viewsets, status, filters
+from rest_framework.authentication import SessionAuthentication
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Avg, Count, F, Min, Prefetch, Q
+from django.db.models.functions import Substr
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 
-from .models import Item, ItemImage, ItemPrice, Category, Location
+from config.db_routers import read_from_primary
+from config.metrics import timed
+
+from .cache import item_clusters_key
+from .etags import etag_matches, item_etag, item_page_etag, not_modified, with_etag
+from .facets import search_facets
+from .fast_serializers import item_list_rows, serialize_item_rows
+from .filters import ItemFilter
+from .geo import cell_count, cluster_precision, snap_bbox
+from .models import LISTED_STATUSES, Cart, CartItem, Item, ItemImage, ItemPrice, Category, Location
 from .serializers import (
     ItemSerializer, ItemListSerializer, ItemCreateUpdateSerializer,
-    ItemImageSerializer, ItemPriceSerializer, CategorySerializer, LocationSerializer
+    ItemImageSerializer, ItemPriceSerializer, CategorySerializer, LocationSerializer,
+    CartSerializer, CartItemWriteSerializer
 )
 
+NEARBY_DEFAULT_RADIUS_KM = 5
+NEARBY_MAX_RADIUS_KM = 50
+NEARBY_DEFAULT_LIMIT = 20
+NEARBY_MAX_LIMIT = 100
+CLUSTERS_DEFAULT_ZOOM = 12
+CLUSTERS_MAX_CELLS = 4096
+MAX_CART_BATCH = 100
+
 
 @method_decorator(csrf_exempt, name='dispatch')
 class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
@@ -36,13 +60,17 @@ class LocationViewSet(viewsets.ReadOnlyModelViewSet):
 @method_decorator(csrf_exempt, name='dispatch')
 class ItemViewSet(viewsets.ModelViewSet):
     """Item ViewSet"""
-    queryset = Item.objects.select_related('owner', 'category', 'location').prefetch_related('images', 'prices')
+    queryset = Item.objects.for_listing()
     permission_classes = []  # Temporarily remove permission restrictions for testing
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['category', 'location', 'status', 'condition']
     search_fields = ['title', 'description', 'address']
     ordering_fields = ['created_at', 'updated_at', 'item_value', 'view_count', 'booking_count']
     ordering = ['-created_at']
+    query_budgets = {
+        'nearby': 6,  # Up to 3 candidate queries, then items, images and prices
+        'clusters': 4,  # Two per side when the viewport crosses the antimeridian
+    }
     
     def get_serializer_class(self):
         """Select serializer based on action"""
@@ -60,15 +88,59 @@ class ItemViewSet(viewsets.ModelViewSet):
         if self.action == 'list':
             # Non-owners can only see published items
             if not self.request.user.is_authenticated:
-                queryset = queryset.filter(status='active')
+                queryset = queryset.filter(status__in=LISTED_STATUSES)
             else:
                 # Authenticated users can see all published items + their own items
                 queryset = queryset.filter(
-                    Q(status='active') | Q(owner=self.request.user)
+                    Q(status__in=LISTED_STATUSES) | Q(owner=self.request.user)
                 )
         
         return queryset
     
+    def list(self, request, *args, **kwargs):
+        """List items, answering If-None-Match with 304 when the page is unchanged"""
+        queryset = self.filter_queryset(self.get_queryset())
+
+        if request.headers.get('If-None-Match'):
+            # Same page of bare (id, updated_at) rows: no joins, prefetches or serialization
+            rows = queryset.values_list('id', 'updated_at')
+            page = self.paginate_queryset(rows)
+            total = self.paginator.page.paginator.count if page is not None else None
+            etag = item_page_etag(request, total, page if page is not None else rows)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+
+        page = self.paginate_queryset(self.list_queryset(queryset))
+        if page is not None:
+            data = self.serialize_items(page)
+            etag = item_page_etag(request, self.paginator.page.paginator.count, self.item_versions(page))
+            return with_etag(self.get_paginated_response(data), etag)
+
+        items = list(self.list_queryset(queryset))
+        data = self.serialize_items(items)
+        return with_etag(Response(data), item_page_etag(request, None, self.item_versions(items)))
+
+    def list_queryset(self, queryset):
+        """What list endpoints paginate: ``.values()`` rows when the fast serializer is on"""
+        if settings.ITEM_LIST_FAST_SERIALIZER:
+            return item_list_rows(queryset)
+        return queryset
+
+    def serialize_items(self, items):
+        """ItemListSerializer output for a page from ``list_queryset``"""
+        with timed('serializer'):
+            if settings.ITEM_LIST_FAST_SERIALIZER:
+                return serialize_item_rows(items, self.request)
+            return ItemListSerializer(items, many=True, context=self.get_serializer_context()).data
+
+    @staticmethod
+    def item_versions(items):
+        """(id, updated_at) of each item, whether model instances or ``.values()`` rows"""
+        return [
+            (item['id'], item['updated_at']) if isinstance(item, dict) else (item.id, item.updated_at)
+            for item in items
+        ]
+    
     def create(self, request, *args, **kwargs):
         """Create item and return complete information"""
         serializer = self.get_serializer(data=request.data)
@@ -136,15 +208,32 @@ class ItemViewSet(viewsets.ModelViewSet):
         instance.delete()
     
     def retrieve(self, request, *args, **kwargs):
-        """Increase view count when retrieving item details"""
+        """Increase view count when retrieving item details; 304 when the client's copy is current"""
+        if request.headers.get('If-None-Match'):
+            try:
+                current = self.get_queryset().filter(pk=kwargs['pk']).values_list(
+                    'id', 'updated_at', 'owner_id'
+                ).first()
+            except (TypeError, ValueError, DjangoValidationError):
+                current = None  # get_object() below turns a malformed pk into a 404
+            if current is not None:
+                item_id, updated_at, owner_id = current
+                etag = item_etag(request, item_id, updated_at)
+                if etag_matches(request, etag):
+                    if request.user.pk != owner_id:
+                        Item.objects.filter(pk=item_id).update(view_count=F('view_count') + 1)
+                    return not_modified(etag)
+
         instance = self.get_object()
         # Increase view count (avoid counting when owner views their own item)
         if request.user != instance.owner:
-            Item.objects.filter(pk=instance.pk).update(view_count=instance.view_count + 1)
-            instance.refresh_from_db()
+            Item.objects.filter(pk=instance.pk).update(view_count=F('view_count') + 1)
+            instance.view_count += 1
         
         serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        with timed('serializer'):
+            data = serializer.data
+        return with_etag(Response(data), item_etag(request, instance.pk, instance.updated_at))
     
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def publish(self, request, pk=None):
@@ -173,77 +262,140 @@ class ItemViewSet(viewsets.ModelViewSet):
         queryset = self.get_queryset().filter(owner=request.user)
         
         # Apply filtering and search
-        queryset = self.filter_queryset(queryset)
+        queryset = self.list_queryset(self.filter_queryset(queryset))
         
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = ItemListSerializer(page, many=True, context={'request': request})
-            return self.get_paginated_response(serializer.data)
+            return self.get_paginated_response(self.serialize_items(page))
         
-        serializer = ItemListSerializer(queryset, many=True, context={'request': request})
-        return Response(serializer.data)
+        return Response(self.serialize_items(queryset))
     
     @action(detail=False, methods=['get'])
     def featured(self, request):
         """Get featured items"""
         # Get items with high views and good ratings
-        queryset = self.get_queryset().filter(
-            status='active'
-        ).order_by('-view_count', '-booking_count')[:10]
+        queryset = self.list_queryset(self.get_queryset().active().order_by('-view_count', '-booking_count'))[:10]
         
-        serializer = ItemListSerializer(queryset, many=True, context={'request': request})
-        return Response(serializer.data)
+        return Response(self.serialize_items(queryset))
     
     @action(detail=False, methods=['get'])
     def search(self, request):
         """Advanced search"""
-        queryset = self.get_queryset().filter(status='active')
-        
-        # Keyword search
-        q = request.query_params.get('q')
-        if q:
-            queryset = queryset.filter(
-                Q(title__icontains=q) | 
-                Q(description__icontains=q) |
-                Q(address__icontains=q)
-            )
+        item_filter = ItemFilter(request.query_params, queryset=self.get_queryset().active())
+        queryset = self.list_queryset(item_filter.qs)
         
-        # Price range
-        min_price = request.query_params.get('min_price')
-        max_price = request.query_params.get('max_price')
-        if min_price:
-            queryset = queryset.filter(item_value__gte=min_price)
-        if max_price:
-            queryset = queryset.filter(item_value__lte=max_price)
+        # Pagination
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            response = self.get_paginated_response(self.serialize_items(page))
+            # Optional facet counts for the same filters (?facets=1)
+            if request.query_params.get('facets'):
+                response.data['facets'] = search_facets(item_filter)
+            return response
         
-        # Category filter
-        category = request.query_params.get('category')
-        if category:
-            queryset = queryset.filter(category_id=category)
+        return Response(self.serialize_items(queryset))
+    
+    @action(detail=False, methods=['get'])
+    def nearby(self, request):
+        """Active items within ``radius`` km of ``lat``/``lng``, nearest first"""
+        try:
+            lat = float(request.query_params['lat'])
+            lng = float(request.query_params['lng'])
+            radius = float(request.query_params.get('radius', NEARBY_DEFAULT_RADIUS_KM))
+            limit = int(request.query_params.get('limit', NEARBY_DEFAULT_LIMIT))
+        except KeyError:
+            return Response({'error': 'lat and lng are required'}, status=status.HTTP_400_BAD_REQUEST)
+        except ValueError:
+            return Response({'error': 'lat, lng, radius and limit must be numbers'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            return Response({'error': 'lat/lng out of range'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 < radius <= NEARBY_MAX_RADIUS_KM:
+            return Response({'error': f'radius must be between 0 and {NEARBY_MAX_RADIUS_KM} km'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, NEARBY_MAX_LIMIT))
         
-        # Location filter
-        location = request.query_params.get('location')
-        if location:
-            queryset = queryset.filter(location_id=location)
+        # Bounding-box candidates from SQL, exact distances computed in Python
+        ranked = Item.objects.active().nearest(lat, lng, radius, limit)
+        items = Item.objects.for_listing().active().in_bulk([item_id for item_id, _ in ranked])
+        # Skip items deleted or deactivated since they were ranked
+        found = [(items[item_id], distance) for item_id, distance in ranked if item_id in items]
         
-        # Condition filter
-        condition = request.query_params.get('condition')
-        if condition:
-            queryset = queryset.filter(condition=condition)
+        serializer = ItemListSerializer([item for item, _ in found], many=True, context={'request': request})
+        with timed('serializer'):
+            data = serializer.data
+        for row, (_, distance) in zip(data, found):
+            row['distance_km'] = round(distance, 3)
+        return Response(data)
+
+    @action(detail=False, methods=['get'])
+    def clusters(self, request):
+        """
+        Active items grouped into geohash cells for a map viewport.
+
+        A viewport crossing the antimeridian (``west > east``) is split into
+        its two sides, each snapped, cached and clustered separately.
+        """
+        try:
+            west, south, east, north = (float(value) for value in request.query_params['bbox'].split(','))
+            zoom = int(request.query_params.get('zoom', CLUSTERS_DEFAULT_ZOOM))
+        except KeyError:
+            return Response({'error': 'bbox is required (west,south,east,north)'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        except ValueError:
+            return Response({'error': 'bbox must be four numbers (west,south,east,north) and zoom an integer'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not (-90 <= south < north <= 90 and -180 <= west <= 180 and -180 <= east <= 180 and west != east):
+            return Response({'error': 'bbox out of range'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Sorting
-        sort_by = request.query_params.get('sort', '-created_at')
-        if sort_by in ['created_at', '-created_at', 'item_value', '-item_value', 'view_count', '-view_count']:
-            queryset = queryset.order_by(sort_by)
+        precision = cluster_precision(max(0, zoom))
+        if west < east:
+            ranges = [(south, west, north, east)]
+        else:
+            ranges = [(south, west, north, 180.0), (south, -180.0, north, east)]
+        bboxes = [snap_bbox(bbox, precision) for bbox in ranges]
+        if sum(cell_count(bbox, precision) for bbox in bboxes) > CLUSTERS_MAX_CELLS:
+            return Response({'error': 'bbox is too large for this zoom level'},
+                            status=status.HTTP_400_BAD_REQUEST)
         
-        # Pagination
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = ItemListSerializer(page, many=True, context={'request': request})
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = ItemListSerializer(queryset, many=True, context={'request': request})
-        return Response(serializer.data)
+        clusters = []
+        for bbox in bboxes:
+            cache_key = item_clusters_key(precision, bbox)
+            data = cache.get(cache_key)
+            if data is None:
+                with read_from_primary():
+                    data = {'precision': precision, 'clusters': self.build_clusters(bbox, precision)}
+                cache.set(cache_key, data, settings.ITEM_CLUSTERS_CACHE_TIMEOUT)
+            clusters.extend(data['clusters'])
+        return Response({'precision': precision, 'clusters': clusters})
+    
+    def build_clusters(self, bbox, precision):
+        """Count, centroid and one sample item per geohash cell, in one GROUP BY plus a title lookup"""
+        cells = list(
+            Item.objects.active().in_bbox(bbox)
+            .annotate(cell=Substr('geohash', 1, precision))
+            .values('cell')
+            .annotate(
+                count=Count('id'),
+                latitude=Avg('latitude'),
+                longitude=Avg('longitude'),
+                sample_id=Min('id'),
+            )
+            .order_by('cell')
+        )
+        titles = dict(
+            Item.objects.filter(pk__in=[cell['sample_id'] for cell in cells]).values_list('id', 'title')
+        )
+        return [
+            {
+                'geohash': cell['cell'],
+                'count': cell['count'],
+                'latitude': round(float(cell['latitude']), 6),
+                'longitude': round(float(cell['longitude']), 6),
+                'sample': {'id': str(cell['sample_id']), 'title': titles.get(cell['sample_id'])},
+            }
+            for cell in cells
+        ]
 
 
 @method_decorator(csrf_exempt, name='dispatch')
@@ -361,4 +513,174 @@ class ItemPriceViewSet(viewsets.ModelViewSet):
         """Check permissions when deleting price"""
         if instance.item.owner != self.request.user:
             raise PermissionError("You can only delete prices of your own items")
-        instance.delete()
\ No newline at end of file
+        instance.delete()
+
+
+class CartViewSet(viewsets.GenericViewSet):
+    """
+    The current user's cart.
+
+    ``GET /api/cart/`` returns it with ``items_count`` and ``total_price``
+    computed in SQL. ``POST /api/cart/`` adds or re-dates items in bulk
+    (``{"items": [{"item", "start_date", "end_date"}, ...]}``) and
+    ``POST /api/cart/remove/`` removes them (``{"items": [item ids]}``);
+    ``PATCH``/``DELETE /api/cart/<item id>/`` change one item and
+    ``POST /api/cart/clear/`` empties the cart. Every call responds with the
+    updated cart.
+    """
+    authentication_classes = [SessionAuthentication]
+    permission_classes = [IsAuthenticated]
+    serializer_class = CartSerializer
+    lookup_field = 'item'
+    query_budgets = {
+        'list': 4,  # Session and user, then cart with totals and its items
+        'create': 14,  # Plus items, prices, their bookings, rental settings, cart (created on first add) and upsert
+        'partial_update': 12,
+        'remove': 7,
+        'clear': 7,
+        'destroy': 8,
+    }
+
+    def get_queryset(self):
+        """Items in the current user's cart"""
+        return CartItem.objects.filter(cart__user=self.request.user)
+
+    def cart_response(self, status_code=status.HTTP_200_OK):
+        """The current user's cart with its items and totals, in two queries"""
+        items = CartItem.objects.select_related('item').order_by('added_at', 'id')
+        cart = Cart.objects.with_totals().prefetch_related(Prefetch('items', items)).filter(
+            user=self.request.user
+        ).first()
+        if cart is None:
+            return Response({'id': None, 'items': [], 'items_count': 0, 'total_price': '0.00', 'updated_at': None},
+                            status=status_code)
+        with timed('serializer'):
+            data = CartSerializer(cart).data
+        return Response(data, status=status_code)
+
+    def priced_items(self, entries):
+        """
+        ``(cart items, errors)`` for validated ``entries``, priced as a rental
+        order would be; ``errors`` has one entry (or None) per input entry.
+        """
+        from apps.rental.fees import get_daily_rate_for_duration
+        from apps.rental.lifecycle import BOOKABLE_STATUSES, active_bookings, dates_overlap
+
+        items = Item.objects.filter(pk__in={entry['item'] for entry in entries}).only(
+            'id', 'status', 'owner_id'
+        ).prefetch_related('prices').in_bulk()
+        # Same date check as a rental order, for every item (the status says nothing about future bookings)
+        bookings = active_bookings(list(items)) if items else {}
+        priced = {}  # item id -> CartItem; a repeated item keeps its last dates
+        errors = []
+        for entry in entries:
+            item = items.get(entry['item'])
+            if item is None:
+                errors.append({'item': str(entry['item']), 'error': 'Item not found'})
+            elif item.status not in BOOKABLE_STATUSES:
+                errors.append({'item': str(entry['item']), 'error': 'This item is currently unavailable'})
+            elif dates_overlap(bookings.get(item.pk, ()), entry['start_date'], entry['end_date']):
+                errors.append({'item': str(entry['item']), 'error': 'Selected dates conflict with existing rentals'})
+            elif item.owner_id == self.request.user.pk:
+                errors.append({'item': str(entry['item']), 'error': 'You cannot add your own item to your cart'})
+            else:
+                errors.append(None)
+                duration_days = (entry['end_date'] - entry['start_date']).days + 1
+                priced[item.pk] = CartItem(
+                    item=item, start_date=entry['start_date'], end_date=entry['end_date'],
+                    duration_days=duration_days, daily_price=get_daily_rate_for_duration(item, duration_days),
+                )
+        return list(priced.values()), errors
+
+    def list(self, request):
+        """Get the current user's cart"""
+        return self.cart_response()
+
+    def create(self, request):
+        """Add items to the cart; items already in it take the new dates"""
+        entries = request.data.get('items') if isinstance(request.data, dict) else None
+        if not isinstance(entries, list) or not entries:
+            return Response({'error': 'items must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(entries) > MAX_CART_BATCH:
+            return Response({'error': f'At most {MAX_CART_BATCH} items can be added at once'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = CartItemWriteSerializer(data=entries, many=True)
+        if not serializer.is_valid():
+            return Response({'error': 'Invalid items', 'items': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        cart_items, errors = self.priced_items(serializer.validated_data)
+        if any(errors):
+            return Response({'error': 'Invalid items', 'items': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            cart, created = Cart.objects.get_or_create(user=request.user)
+            for cart_item in cart_items:
+                cart_item.cart = cart
+            # One upsert for the batch; MySQL infers the conflict target from the unique key
+            unique_fields = ['cart', 'item'] if connection.features.supports_update_conflicts_with_target else None
+            CartItem.objects.bulk_create(
+                cart_items, update_conflicts=True, unique_fields=unique_fields,
+                update_fields=['start_date', 'end_date', 'duration_days', 'daily_price'],
+            )
+            if not created:
+                Cart.objects.filter(pk=cart.pk).update(updated_at=timezone.now())
+        return self.cart_response(status.HTTP_201_CREATED)
+
+    def partial_update(self, request, item=None):
+        """Change the dates of one item in the cart"""
+        cart_item = self.get_object()
+        serializer = CartItemWriteSerializer(data={
+            'item': cart_item.item_id,
+            'start_date': request.data.get('start_date', cart_item.start_date),
+            'end_date': request.data.get('end_date', cart_item.end_date),
+        })
+        if not serializer.is_valid():
+            return Response({'error': 'Invalid dates', 'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        cart_items, errors = self.priced_items([serializer.validated_data])
+        if errors[0]:
+            return Response(errors[0], status=status.HTTP_400_BAD_REQUEST)
+
+        priced = cart_items[0]
+        with transaction.atomic():
+            CartItem.objects.filter(pk=cart_item.pk).update(
+                start_date=priced.start_date, end_date=priced.end_date,
+                duration_days=priced.duration_days, daily_price=priced.daily_price,
+            )
+            Cart.objects.filter(pk=cart_item.cart_id).update(updated_at=timezone.now())
+        return self.cart_response()
+
+    def destroy(self, request, item=None):
+        """Remove one item from the cart"""
+        cart_item = self.get_object()
+        with transaction.atomic():
+            cart_item.delete()
+            Cart.objects.filter(pk=cart_item.cart_id).update(updated_at=timezone.now())
+        return self.cart_response()
+
+    @action(detail=False, methods=['post'])
+    def remove(self, request):
+        """Remove items from the cart by item id"""
+        item_ids = request.data.get('items') if isinstance(request.data, dict) else None
+        if not isinstance(item_ids, list) or not item_ids:
+            return Response({'error': 'items must be a non-empty list of item ids'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(item_ids) > MAX_CART_BATCH:
+            return Response({'error': f'At most {MAX_CART_BATCH} items can be removed at once'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        field = serializers.ListField(child=serializers.UUIDField())
+        try:
+            item_ids = field.run_validation(item_ids)
+        except serializers.ValidationError as e:
+            return Response({'error': 'Invalid item ids', 'items': e.detail}, status=status.HTTP_400_BAD_REQUEST)
+        return self.remove_items(self.get_queryset().filter(item_id__in=item_ids))
+
+    @action(detail=False, methods=['post'])
+    def clear(self, request):
+        """Remove every item from the cart"""
+        return self.remove_items(self.get_queryset())
+
+    def remove_items(self, cart_items):
+        with transaction.atomic():
+            removed, _ = cart_items.delete()
+            if removed:
+                Cart.objects.filter(user=self.request.user).update(updated_at=timezone.now())
+        return self.cart_response()
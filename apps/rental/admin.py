@@ -5,7 +5,8 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
-from .models import RentalOrder, RentalSettings
+from .lifecycle import complete_orders
+from .models import RentalOrder, RentalOrderArchive, RentalSettings
 
 
 @admin.register(RentalOrder)
@@ -28,6 +29,7 @@ class RentalOrderAdmin(admin.ModelAdmin):
     ]
     date_hierarchy = 'created_at'
     ordering = ['-created_at']
+    list_select_related = ['item', 'renter', 'owner']
     
     fieldsets = (
         ('Basic Information', {
@@ -84,11 +86,32 @@ class RentalOrderAdmin(admin.ModelAdmin):
     
     def mark_as_completed(self, request, queryset):
         """Mark as completed"""
-        updated = queryset.update(status='completed')
+        # Same bulk path as the complete_expired_rentals job: sets completed_at and frees the items
+        updated, _, _ = complete_orders(list(queryset.values_list('id', flat=True)))
         self.message_user(request, f'Successfully marked {updated} orders as completed')
     mark_as_completed.short_description = 'Mark as Completed'
 
 
+@admin.register(RentalOrderArchive)
+class RentalOrderArchiveAdmin(admin.ModelAdmin):
+    """Archived Rental Orders (read only; written by the archive_rental_orders command)"""
+    list_display = [
+        'id', 'item', 'renter', 'owner', 'start_date', 'end_date',
+        'total_amount', 'completed_at', 'archived_at'
+    ]
+    list_filter = ['payment_method', 'start_date', 'archived_at']
+    search_fields = ['id', 'item__title', 'renter__username', 'owner__username']
+    date_hierarchy = 'start_date'
+    ordering = ['-created_at']
+    list_select_related = ['item', 'renter', 'owner']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(RentalSettings)
 class RentalSettingsAdmin(admin.ModelAdmin):
     """Rental Settings Management"""
@@ -6,3 +6,6 @@ class RentalConfig(AppConfig):
     name = 'apps.rental'
     verbose_name = 'Rental Management'
 
+    def ready(self):
+        """Connect cache invalidation signals"""
+        from . import signals  # noqa: F401
@@ -0,0 +1,99 @@
+"""
+Archival of old completed orders into RentalOrderArchive
+
+Completed orders that ended more than RENTAL_ARCHIVE_AFTER_DAYS ago are
+copied to the archive table and deleted from RentalOrder, one batch per
+transaction. A batch is either fully moved or not at all, so an
+interrupted run loses nothing and the next run carries on from the first
+order still in the live table; that table is the checkpoint.
+"""
+import heapq
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
+
+from .models import RentalOrder, RentalOrderArchive
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Columns copied from RentalOrder; the archive has the same names plus archived_at
+ARCHIVED_FIELDS = tuple(field.attname for field in RentalOrder._meta.concrete_fields)
+
+
+def archivable_orders(before):
+    """Completed orders that ended before ``before``, oldest first"""
+    # start_date <= end_date, so the start_date bound lets the (status, start_date) index narrow the scan
+    return RentalOrder.objects.filter(
+        status='completed', start_date__lt=before, end_date__lt=before
+    ).order_by('start_date', 'pk')
+
+
+def archive_batch(before, batch_size):
+    """Move up to ``batch_size`` archivable orders; returns how many were moved"""
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(archivable_orders(before).select_for_update().values(*ARCHIVED_FIELDS)[:batch_size])
+        if not rows:
+            return 0
+        RentalOrderArchive.objects.bulk_create(
+            [RentalOrderArchive(archived_at=now, **row) for row in rows], ignore_conflicts=True
+        )
+        RentalOrder.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+    return len(rows)
+
+
+def archive_completed_orders(after_days, batch_size=DEFAULT_BATCH_SIZE, max_batches=None, progress=None):
+    """
+    Archive completed orders that ended more than ``after_days`` days ago.
+
+    Stops after ``max_batches`` batches if given, so a large backlog can be
+    worked through over several runs. ``progress(batches, moved)`` is called
+    after each batch. Returns ``{'orders', 'batches', 'before'}``.
+    """
+    before = timezone.localdate() - timedelta(days=after_days)
+    moved = batches = 0
+    while max_batches is None or batches < max_batches:
+        count = archive_batch(before, batch_size)
+        if not count:
+            break
+        moved += count
+        batches += 1
+        if progress is not None:
+            progress(batches, moved)
+    return {'orders': moved, 'batches': batches, 'before': before}
+
+
+class OrderHistory:
+    """
+    Live and archived orders as one sequence for cursor pagination.
+
+    Supports what ``CursorPagination`` uses (``order_by``, ``filter`` and
+    slicing) by applying each call to both querysets and merging the two
+    ordered slices, so a page costs one query per table plus one for item
+    images.
+    """
+
+    def __init__(self, *querysets):
+        self.querysets = [queryset.prefetch_related(None) for queryset in querysets]
+
+    def order_by(self, *ordering):
+        return OrderHistory(*(queryset.order_by(*ordering) for queryset in self.querysets))
+
+    def filter(self, *args, **kwargs):
+        return OrderHistory(*(queryset.filter(*args, **kwargs) for queryset in self.querysets))
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice) or index.step is not None or index.stop is None:
+            raise TypeError('OrderHistory only supports bounded slices')
+        start = index.start or 0
+        ordering = self.querysets[0].query.order_by[0]
+        field = ordering.lstrip('-')
+        rows = heapq.merge(
+            *(queryset[:index.stop] for queryset in self.querysets),
+            key=lambda order: getattr(order, field), reverse=ordering.startswith('-'),
+        )
+        page = list(rows)[start:index.stop]
+        prefetch_related_objects(page, 'item__images')
+        return page
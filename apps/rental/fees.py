@@ -0,0 +1,187 @@
+"""
+Rental pricing: daily rate, service fee and security deposit
+
+Fee and deposit rules are configured in RentalSettings. The base rule comes
+from the ``service_fee_rate``, ``service_fee_minimum``, ``deposit_rate`` and
+``deposit_minimum`` settings; tiers come from ``fee_rules`` (type ``json``),
+a list tried in order where the first match wins:
+
+    [{"category": "electronics", "min_days": 7, "max_item_value": "1000",
+      "service_fee_rate": "0.04", "deposit_rate": "0.5", "deposit_minimum": "50"}]
+
+Conditions (``category`` name, ``min_days``/``max_days``,
+``min_item_value``/``max_item_value``, all inclusive) and outcomes that a
+rule leaves out fall back to the base rule. The rules are compiled once per
+settings snapshot, so quoting is a few comparisons per order.
+"""
+import logging
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+from .settings_registry import RENTAL_SETTING_DEFAULTS, rental_settings
+
+logger = logging.getLogger(__name__)
+
+CENT = Decimal('0.01')
+FEE_RULES_SETTING = 'fee_rules'
+
+
+def to_cents(amount):
+    return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+class FeeRule:
+    """One compiled tier: inclusive bounds (None for unbounded) and its fee and deposit terms"""
+    __slots__ = (
+        'min_days', 'max_days', 'min_item_value', 'max_item_value',
+        'service_fee_rate', 'service_fee_minimum', 'deposit_rate', 'deposit_minimum',
+    )
+
+    def __init__(self, base=None, **terms):
+        for name in self.__slots__:
+            value = terms.get(name)
+            if value is None and base is not None and name in FEE_TERMS:
+                value = getattr(base, name)
+            setattr(self, name, value)
+
+    def matches(self, duration_days, item_value):
+        return (
+            (self.min_days is None or duration_days >= self.min_days)
+            and (self.max_days is None or duration_days <= self.max_days)
+            and (self.min_item_value is None or item_value >= self.min_item_value)
+            and (self.max_item_value is None or item_value <= self.max_item_value)
+        )
+
+
+# Rule fields parsed as day counts, as amounts, and the terms inherited from the base rule
+DAY_BOUNDS = ('min_days', 'max_days')
+AMOUNT_FIELDS = (
+    'min_item_value', 'max_item_value',
+    'service_fee_rate', 'service_fee_minimum', 'deposit_rate', 'deposit_minimum',
+)
+FEE_TERMS = ('service_fee_rate', 'service_fee_minimum', 'deposit_rate', 'deposit_minimum')
+
+
+class FeeSchedule:
+    """Fee rules compiled from one RentalSettings snapshot, indexed by category id"""
+
+    def __init__(self, values):
+        self.base_rule = FeeRule(**{name: self.base_term(values, name) for name in FEE_TERMS})
+        specs = values.get(FEE_RULES_SETTING) or []
+
+        category_ids = {}
+        if any(isinstance(spec, dict) and spec.get('category') for spec in specs):
+            from apps.core.models import Category
+
+            category_ids = dict(Category.objects.values_list('name', 'id'))
+
+        general = []
+        by_category = {}  # category id -> rules for that category, in configured order
+        for index, spec in enumerate(specs):
+            try:
+                rule = self.compile_rule(spec)
+                category = spec.get('category')
+                category_id = None if category in (None, '') else category_ids[category]
+            except (AttributeError, KeyError, TypeError, ValueError, InvalidOperation):
+                logger.warning('Ignoring fee rule %d: %r', index, spec)
+                continue
+            if category_id is None:
+                general.append(rule)
+                for rules in by_category.values():
+                    rules.append(rule)
+            else:
+                by_category.setdefault(category_id, list(general)).append(rule)
+
+        self.general_rules = tuple(general)
+        self.rules_by_category = {category_id: tuple(rules) for category_id, rules in by_category.items()}
+
+    @staticmethod
+    def base_term(values, name):
+        """Base rule setting ``name`` as a Decimal, or its default if the setting is not a number"""
+        try:
+            return Decimal(str(values[name]))
+        except KeyError:
+            pass
+        except (ValueError, InvalidOperation):
+            logger.warning('Ignoring rental setting %s: %r is not a number', name, values[name])
+        return RENTAL_SETTING_DEFAULTS[name]
+
+    def compile_rule(self, spec):
+        terms = {name: int(spec[name]) for name in DAY_BOUNDS if spec.get(name) is not None}
+        terms.update({name: Decimal(str(spec[name])) for name in AMOUNT_FIELDS if spec.get(name) is not None})
+        return FeeRule(self.base_rule, **terms)
+
+    def rule_for(self, category_id, duration_days, item_value):
+        """First configured rule matching the order, else the base rule"""
+        for rule in self.rules_by_category.get(category_id, self.general_rules):
+            if rule.matches(duration_days, item_value):
+                return rule
+        return self.base_rule
+
+
+_compiled = (None, None)  # (settings snapshot, FeeSchedule compiled from it)
+
+
+def fee_schedule():
+    """The FeeSchedule for the current settings snapshot, recompiled only when a setting changes"""
+    global _compiled
+    values = rental_settings.values()
+    compiled_from, schedule = _compiled
+    if compiled_from is not values:
+        schedule = FeeSchedule(values)
+        _compiled = (values, schedule)
+    return schedule
+
+
+def get_daily_rate_for_duration(item, duration_days):
+    """Get daily rate based on duration"""
+    # Find the most matching rental period price (one query; reuses a prefetch_related('prices') cache)
+    prices = sorted((price for price in item.prices.all() if price.is_active), key=lambda price: price.duration_days)
+
+    if prices:
+        # Find the closest rental period price
+        for price in prices:
+            if price.duration_days >= duration_days:
+                return price.daily_price
+        # If no suitable price found, use the price for the longest rental period
+        return prices[-1].daily_price
+
+    # Default price
+    return rental_settings.get('default_daily_rate')
+
+
+class RentalQuote:
+    """Price of renting one item for ``duration_days``"""
+    __slots__ = ('duration_days', 'daily_rate', 'rental_amount', 'service_fee', 'security_deposit')
+
+    def __init__(self, duration_days, daily_rate, rental_amount, service_fee, security_deposit):
+        self.duration_days = duration_days
+        self.daily_rate = daily_rate
+        self.rental_amount = rental_amount
+        self.service_fee = service_fee
+        self.security_deposit = security_deposit
+
+    @property
+    def total_amount(self):
+        """Rental plus service fee, as stored on RentalOrder"""
+        return to_cents(self.rental_amount + self.service_fee)
+
+    @property
+    def total_with_deposit(self):
+        return self.total_amount + self.security_deposit
+
+
+def quote_rental(item, duration_days, schedule=None):
+    """Daily rate, service fee and deposit for renting ``item`` for ``duration_days``"""
+    schedule = schedule or fee_schedule()
+    item_value = item.item_value or Decimal('0.00')
+    rule = schedule.rule_for(item.category_id, duration_days, item_value)
+
+    daily_rate = get_daily_rate_for_duration(item, duration_days)
+    rental_amount = daily_rate * duration_days
+    return RentalQuote(
+        duration_days=duration_days,
+        daily_rate=daily_rate,
+        rental_amount=rental_amount,
+        service_fee=to_cents(max(rental_amount * rule.service_fee_rate, rule.service_fee_minimum)),
+        security_deposit=to_cents(max(item_value * rule.deposit_rate, rule.deposit_minimum)),
+    )
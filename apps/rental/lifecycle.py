@@ -0,0 +1,205 @@
+"""
+Bulk rental lifecycle jobs
+
+Orders are completed once their end date passes, and items are ``rented``
+while one of their rentals is running and ``active`` otherwise, so
+``Item.is_available()`` answers "is it free today" without querying orders.
+Both statuses stay listed, and either can be booked for dates that miss its
+active orders (``is_bookable``); the status alone says nothing about future
+bookings.
+
+These run as management commands (for cron or another scheduler) and use
+set-based UPDATEs in fixed-size batches, so a backlog of thousands of
+orders costs a few queries per batch rather than a save() per row.
+``QuerySet.update`` sends no signals, so the caches that ``post_save``
+receivers would have refreshed are invalidated here explicitly.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef
+from django.utils import timezone
+
+from apps.core.cache import invalidate_item_aggregates, invalidate_location_pages
+from apps.core.catalogue import catalogue
+from apps.core.models import LISTED_STATUSES, Item
+from apps.core.suggest import suggestion_index
+
+from .models import RentalOrder, RentalOrderArchive
+
+DEFAULT_BATCH_SIZE = 1000
+BOOKABLE_STATUSES = LISTED_STATUSES
+
+
+def items_changed(location_ids):
+    """Refresh everything that shows item status, as ``core.signals.item_saved`` does for one item"""
+    invalidate_location_pages(location_ids)
+    invalidate_item_aggregates()
+    catalogue.invalidate()
+    suggestion_index.invalidate()
+
+
+def running_rentals(today):
+    """Active orders in progress on ``today`` (served by the ``(status, start_date)`` index)"""
+    return RentalOrder.objects.filter(status='active', start_date__lte=today, end_date__gte=today)
+
+
+def overlapping_rentals(item, start_date, end_date):
+    """Active orders of ``item`` whose dates overlap ``start_date``..``end_date`` (both days inclusive)"""
+    return RentalOrder.objects.filter(
+        item=item, status='active', start_date__lte=end_date, end_date__gte=start_date
+    )
+
+
+def active_bookings(item_ids):
+    """``{item id: [(start_date, end_date), ...]}`` of the active orders for ``item_ids``, in one query"""
+    bookings = {}
+    for item_id, start_date, end_date in RentalOrder.objects.filter(
+        item_id__in=item_ids, status='active'
+    ).values_list('item_id', 'start_date', 'end_date'):
+        bookings.setdefault(item_id, []).append((start_date, end_date))
+    return bookings
+
+
+def dates_overlap(bookings, start_date, end_date):
+    """Same rule as ``overlapping_rentals``, over ``(start_date, end_date)`` pairs"""
+    return any(booked_start <= end_date and booked_end >= start_date for booked_start, booked_end in bookings)
+
+
+def is_bookable(item, start_date, end_date):
+    """
+    True if ``item`` can be booked for ``start_date``..``end_date``.
+
+    The status only says whether a rental is running today, so the dates are
+    always checked against the item's active orders.
+    """
+    if item.status not in BOOKABLE_STATUSES:
+        return False
+    return not overlapping_rentals(item, start_date, end_date).exists()
+
+
+def set_items_status(items, status, now):
+    """Set ``status`` on every item in ``items``; returns ``(count, location ids)``"""
+    location_ids = set(items.values_list('location_id', flat=True))
+    changed = items.update(status=status, updated_at=now) if location_ids else 0
+    return changed, location_ids
+
+
+def release_items(item_ids, today, now):
+    """Set ``rented`` items with no rental running ``today`` back to ``active``; returns ``(count, location ids)``"""
+    running = running_rentals(today).filter(item=OuterRef('pk'))
+    items = Item.objects.filter(pk__in=item_ids, status='rented').filter(~Exists(running))
+    return set_items_status(items, 'active', now)
+
+
+def mark_items_rented(item_ids, today=None):
+    """Set ``active`` items among ``item_ids`` with a rental running ``today`` to ``rented``"""
+    now = timezone.now()
+    today = today or timezone.localdate(now)
+    running = running_rentals(today).filter(item=OuterRef('pk'))
+    items = Item.objects.filter(pk__in=item_ids, status='active').filter(Exists(running))
+    rented, location_ids = set_items_status(items, 'rented', now)
+    if location_ids:
+        transaction.on_commit(lambda: items_changed(location_ids))
+    return rented
+
+
+def refresh_booking_counts(item_ids, now):
+    """Recount ``Item.booking_count`` from live and archived orders for ``item_ids``; returns how many items changed"""
+    counts = Counter()
+    for model in (RentalOrder, RentalOrderArchive):
+        counts.update(dict(
+            model.objects.filter(item_id__in=item_ids).values('item_id')
+            .annotate(total=Count('id')).values_list('item_id', 'total').order_by()
+        ))
+    stale = [
+        Item(pk=item_id, booking_count=counts[item_id], updated_at=now)
+        for item_id, booking_count in Item.objects.filter(pk__in=item_ids).values_list('id', 'booking_count')
+        if booking_count != counts[item_id]
+    ]
+    Item.objects.bulk_update(stale, ['booking_count', 'updated_at'])
+    return len(stale)
+
+
+def complete_orders(order_ids, today=None):
+    """
+    Mark the still-active orders among ``order_ids`` completed, then bring
+    their items up to date.
+
+    Returns ``(orders completed, items released, booking counts corrected)``.
+    """
+    now = timezone.now()
+    today = today or timezone.localdate(now)
+    with transaction.atomic():
+        orders = RentalOrder.objects.filter(pk__in=order_ids, status='active')
+        item_ids = set(orders.values_list('item_id', flat=True))
+        completed = orders.update(status='completed', completed_at=now, updated_at=now)
+        released, location_ids = release_items(item_ids, today, now)
+        recounted = refresh_booking_counts(item_ids, now) if item_ids else 0
+    if location_ids:
+        transaction.on_commit(lambda: items_changed(location_ids))
+    elif recounted:
+        # Booking counts feed list ordering and cached aggregates only
+        transaction.on_commit(lambda: (invalidate_item_aggregates(), catalogue.invalidate()))
+    return completed, released, recounted
+
+
+def complete_expired_rentals(today=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Complete every active order whose ``end_date`` is before ``today``, one
+    batch of ``batch_size`` orders per transaction.
+
+    Returns ``{'orders', 'released', 'recounted', 'batches'}`` counts.
+    """
+    today = today or timezone.localdate()
+    overdue = RentalOrder.objects.filter(status='active', end_date__lt=today).order_by('end_date', 'pk')
+    totals = Counter()
+    while True:
+        order_ids = list(overdue.values_list('id', flat=True)[:batch_size])
+        if not order_ids:
+            return {name: totals[name] for name in ('orders', 'released', 'recounted', 'batches')}
+        completed, released, recounted = complete_orders(order_ids, today)
+        totals.update(orders=completed, released=released, recounted=recounted, batches=1)
+
+
+def sync_item_statuses(today=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Flip items to ``rented`` while a rental runs and back to ``active`` once
+    none does, ``batch_size`` items per UPDATE.
+
+    Only items that need to change are read: starts are found from running
+    orders whose item is still ``active``, returns from the (few) ``rented``
+    items. Returns ``{'rented', 'released', 'batches'}`` counts.
+    """
+    now = timezone.now()
+    today = today or timezone.localdate(now)
+    totals = Counter()
+    location_ids = set()
+
+    starting = running_rentals(today).filter(item__status='active').values_list('item_id', flat=True)
+    while True:
+        item_ids = list(starting.order_by().distinct()[:batch_size])
+        if not item_ids:
+            break
+        rented, locations = set_items_status(Item.objects.filter(pk__in=item_ids, status='active'), 'rented', now)
+        totals.update(rented=rented, batches=1)
+        location_ids |= locations
+        if not rented:  # Changed under us; the next run picks up what is left
+            break
+
+    ended = Item.objects.filter(status='rented').filter(
+        ~Exists(running_rentals(today).filter(item=OuterRef('pk')))
+    ).values_list('id', flat=True).order_by()
+    while True:
+        item_ids = list(ended[:batch_size])
+        if not item_ids:
+            break
+        released, locations = release_items(item_ids, today, now)
+        totals.update(released=released, batches=1)
+        location_ids |= locations
+        if not released:
+            break
+
+    if location_ids:
+        items_changed(location_ids)
+    return {name: totals[name] for name in ('rented', 'released', 'batches')}
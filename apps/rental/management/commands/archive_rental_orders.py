@@ -0,0 +1,53 @@
+"""
+Management command to move old completed rental orders to the order archive
+
+Meant to run nightly, after complete_expired_rentals:
+    python manage.py archive_rental_orders --batch-size 1000
+
+Each batch commits on its own, so the command can be stopped at any point
+(or capped with --max-batches) and the next run resumes where it left off.
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.rental.archive import DEFAULT_BATCH_SIZE, archive_completed_orders
+
+
+class Command(BaseCommand):
+    help = 'Move completed rental orders older than RENTAL_ARCHIVE_AFTER_DAYS to the archive table, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--after-days', type=int, default=None,
+                            help='Archive orders that ended more than this many days ago '
+                                 '(default: RENTAL_ARCHIVE_AFTER_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Orders per transaction')
+        parser.add_argument('--max-batches', type=int, default=None, help='Stop after this many batches')
+
+    def handle(self, *args, **options):
+        after_days = options['after_days']
+        if after_days is None:
+            after_days = settings.RENTAL_ARCHIVE_AFTER_DAYS
+        if after_days < 0:
+            raise CommandError('--after-days must not be negative')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        if options['max_batches'] is not None and options['max_batches'] < 1:
+            raise CommandError('--max-batches must be at least 1')
+
+        started = time.perf_counter()
+
+        def progress(batches, moved):
+            if options['verbosity'] > 1:
+                self.stdout.write(f'  batch {batches}: {moved} orders archived ({time.perf_counter() - started:.2f}s)')
+
+        totals = archive_completed_orders(
+            after_days, batch_size=options['batch_size'],
+            max_batches=options['max_batches'], progress=progress,
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Archived {totals['orders']} orders that ended before {totals['before']} "
+            f"in {totals['batches']} batches in {elapsed:.2f}s"
+        ))
@@ -0,0 +1,51 @@
+"""
+Management command to advance rentals through their lifecycle
+
+Completes orders whose end date has passed, then marks items ``rented``
+while a rental runs and ``active`` again afterwards. Run it from cron
+shortly after midnight, or keep it running:
+    python manage.py rental_lifecycle --interval 900
+"""
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.rental.lifecycle import DEFAULT_BATCH_SIZE, complete_expired_rentals, sync_item_statuses
+
+
+class Command(BaseCommand):
+    help = 'Complete ended rentals and flip items between active and rented, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rows per UPDATE')
+        parser.add_argument('--date', help='Treat this day (YYYY-MM-DD) as today')
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Repeat every this many seconds until interrupted (default: run once)')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        today = None
+        if options['date']:
+            try:
+                today = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError('--date must be in YYYY-MM-DD format')
+
+        while True:
+            self.run_once(today, options['batch_size'])
+            if options['interval'] <= 0:
+                return
+            time.sleep(options['interval'])
+
+    def run_once(self, today, batch_size):
+        started = time.perf_counter()
+        completed = complete_expired_rentals(today=today, batch_size=batch_size)
+        statuses = sync_item_statuses(today=today, batch_size=batch_size)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Completed {completed['orders']} orders, {statuses['rented']} items rented, "
+            f"{completed['released'] + statuses['released']} items available again "
+            f"({completed['batches'] + statuses['batches']} batches) in {elapsed:.2f}s"
+        ))
@@ -0,0 +1,55 @@
+# Written by hand: only adds the archive table, leaving the unrelated
+# differences between earlier migrations and the models untouched.
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_item_tag_indexes'),
+        ('rental', '0005_auto_20250817_0428'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RentalOrderArchive',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('start_date', models.DateField(verbose_name='Start Date')),
+                ('end_date', models.DateField(verbose_name='End Date')),
+                ('duration_days', models.PositiveSmallIntegerField(verbose_name='Rental Days')),
+                ('daily_rate', models.DecimalField(decimal_places=2, max_digits=8, verbose_name='Daily Rate')),
+                ('total_amount', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Total Amount')),
+                ('security_deposit', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10, verbose_name='Security Deposit')),
+                ('service_fee', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=8, verbose_name='Service Fee')),
+                ('payment_method', models.CharField(blank=True, choices=[('credit_card', 'Credit Card'), ('debit_card', 'Debit Card'), ('paypal', 'PayPal'), ('bank_transfer', 'Bank Transfer')], max_length=20, null=True, verbose_name='Payment Method')),
+                ('payment_date', models.DateTimeField(blank=True, null=True, verbose_name='Payment Date')),
+                ('transaction_id', models.CharField(blank=True, max_length=255, verbose_name='Transaction ID')),
+                ('status', models.CharField(choices=[('active', 'Active'), ('completed', 'Completed')], default='completed', max_length=20, verbose_name='Order Status')),
+                ('created_at', models.DateTimeField(verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(verbose_name='Updated At')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='Completed At')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Archived At')),
+                ('renter_notes', models.TextField(blank=True, verbose_name='Renter Notes')),
+                ('owner_notes', models.TextField(blank=True, verbose_name='Owner Notes')),
+                ('admin_notes', models.TextField(blank=True, verbose_name='Admin Notes')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_rental_orders', to='core.item', verbose_name='Rental Item')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_owned_rentals', to=settings.AUTH_USER_MODEL, verbose_name='Item Owner')),
+                ('renter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_rentals', to=settings.AUTH_USER_MODEL, verbose_name='Renter')),
+            ],
+            options={
+                'verbose_name': 'Archived Rental Order',
+                'verbose_name_plural': 'Archived Rental Orders',
+                'ordering': ['-created_at'],
+                'indexes': [
+                    models.Index(fields=['renter', 'created_at'], name='rental_rent_renter__e64c1c_idx'),
+                    models.Index(fields=['owner', 'created_at'], name='rental_rent_owner_i_4b9bd5_idx'),
+                ],
+            },
+        ),
+    ]
@@ -2,6 +2,7 @@
 Rental Application Models for ShareTools
 """
 from django.db import models
+from django.db.models import Prefetch
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator
 from django.utils import timezone
@@ -11,6 +12,22 @@ import uuid
 User = get_user_model()
 
 
+# Free-text columns that order lists never show
+ORDER_NOTE_FIELDS = ('renter_notes', 'owner_notes', 'admin_notes')
+
+
+class RentalOrderQuerySet(models.QuerySet):
+    """Rental Order QuerySet (also used for archived orders)"""
+
+    def for_listing(self, notes=False):
+        """Load everything order serializers touch in a constant number of queries"""
+        queryset = self.select_related('item', 'renter', 'owner').prefetch_related(
+            Prefetch('item__images')
+        )
+        # Notes can be long and only the detail serializer shows them
+        return queryset if notes else queryset.defer(*ORDER_NOTE_FIELDS)
+
+
 class RentalOrder(models.Model):
     """Rental Order Model"""
     STATUS_CHOICES = [
@@ -66,6 +83,10 @@ class RentalOrder(models.Model):
     owner_notes = models.TextField(blank=True, verbose_name="Owner Notes")
     admin_notes = models.TextField(blank=True, verbose_name="Admin Notes")
 
+    objects = RentalOrderQuerySet.as_manager()
+
+    is_archived = False
+
     class Meta:
         verbose_name = "Rental Order"
         verbose_name_plural = "Rental Orders"
@@ -120,6 +141,79 @@ class RentalOrder(models.Model):
         super().save(*args, **kwargs)
 
 
+class RentalOrderArchive(models.Model):
+    """
+    Completed rental order moved out of the live table (see rental/archive.py).
+
+    Same columns as RentalOrder at the time it was archived, plus
+    ``archived_at``; timestamps are copied rather than auto-set.
+    """
+    STATUS_CHOICES = RentalOrder.STATUS_CHOICES
+    PAYMENT_METHOD_CHOICES = RentalOrder.PAYMENT_METHOD_CHOICES
+
+    id = models.UUIDField(primary_key=True, editable=False)
+
+    # Related Information
+    item = models.ForeignKey('core.Item', on_delete=models.CASCADE, related_name='archived_rental_orders',
+                             verbose_name="Rental Item")
+    renter = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_rentals', verbose_name="Renter")
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_owned_rentals',
+                              verbose_name="Item Owner")
+
+    # Rental Information
+    start_date = models.DateField(verbose_name="Start Date")
+    end_date = models.DateField(verbose_name="End Date")
+    duration_days = models.PositiveSmallIntegerField(verbose_name="Rental Days")
+
+    # Price Information
+    daily_rate = models.DecimalField(max_digits=8, decimal_places=2, verbose_name="Daily Rate")
+    total_amount = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Total Amount")
+    security_deposit = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'),
+                                           verbose_name="Security Deposit")
+    service_fee = models.DecimalField(max_digits=8, decimal_places=2, default=Decimal('0.00'),
+                                      verbose_name="Service Fee")
+
+    # Payment Information
+    payment_method = models.CharField(max_length=20, choices=PAYMENT_METHOD_CHOICES, blank=True, null=True,
+                                      verbose_name="Payment Method")
+    payment_date = models.DateTimeField(blank=True, null=True, verbose_name="Payment Date")
+    transaction_id = models.CharField(max_length=255, blank=True, verbose_name="Transaction ID")
+
+    # Status Information
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='completed', verbose_name="Order Status")
+
+    # Timestamps
+    created_at = models.DateTimeField(verbose_name="Created At")
+    updated_at = models.DateTimeField(verbose_name="Updated At")
+    completed_at = models.DateTimeField(blank=True, null=True, verbose_name="Completed At")
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="Archived At")
+
+    # Notes
+    renter_notes = models.TextField(blank=True, verbose_name="Renter Notes")
+    owner_notes = models.TextField(blank=True, verbose_name="Owner Notes")
+    admin_notes = models.TextField(blank=True, verbose_name="Admin Notes")
+
+    objects = RentalOrderQuerySet.as_manager()
+
+    is_archived = True
+
+    class Meta:
+        verbose_name = "Archived Rental Order"
+        verbose_name_plural = "Archived Rental Orders"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['renter', 'created_at']),
+            models.Index(fields=['owner', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.renter.username} rented {self.item.title} (archived)"
+
+    def get_total_with_deposit(self):
+        """Get total amount including deposit"""
+        return self.total_amount + self.security_deposit
+
+
 class RentalSettings(models.Model):
     """Rental Settings Model"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -146,12 +240,10 @@ class RentalSettings(models.Model):
 
     @classmethod
     def get_setting(cls, key, default=None):
-        """Get setting value"""
-        try:
-            setting = cls.objects.get(setting_key=key)
-            return setting.setting_value
-        except cls.DoesNotExist:
-            return default
+        """Get setting value, coerced by its setting_type (served from the in-process snapshot)"""
+        from .settings_registry import rental_settings
+
+        return rental_settings.get(key, default)
 
     @classmethod
     def set_setting(cls, key, value, description=""):
@@ -0,0 +1,12 @@
+"""
+Rental Application Pagination Classes for ShareTools
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class RentalOrderCursorPagination(CursorPagination):
+    """Cursor pagination for order lists, newest first"""
+    ordering = '-created_at'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
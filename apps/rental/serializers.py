@@ -2,6 +2,7 @@
 Rental Application Serializers for ShareTools
 """
 from rest_framework import serializers
+from .lifecycle import BOOKABLE_STATUSES, is_bookable, overlapping_rentals
 from .models import RentalOrder, RentalSettings
 from apps.core.models import Item, User
 
@@ -33,11 +34,10 @@ class RentalOrderSerializer(serializers.ModelSerializer):
         ]
 
     def get_item_image(self, obj):
-        """Get item primary image"""
-        if obj.item.primary_image:
-            return obj.item.primary_image.image.url
-        elif obj.item.images.exists():
-            return obj.item.images.first().image.url
+        """Get item primary image (served from item__images when prefetched)"""
+        image = obj.item.primary_image
+        if image:
+            return image.image.url
         return None
 
     def get_total_with_deposit(self, obj):
@@ -57,14 +57,44 @@ class RentalOrderSerializer(serializers.ModelSerializer):
             if data['start_date'] < today:
                 raise serializers.ValidationError("Start date cannot be in the past")
 
-        # Check if item is available
+        # Check if item is available (listed, and free on the requested dates)
         if data.get('item'):
-            if not data['item'].is_available():
+            if data['item'].status not in BOOKABLE_STATUSES:
                 raise serializers.ValidationError("This item is currently unavailable")
+            if data.get('start_date') and data.get('end_date') and not is_bookable(
+                data['item'], data['start_date'], data['end_date']
+            ):
+                raise serializers.ValidationError("Selected dates conflict with existing rentals")
 
         return data
 
 
+class RentalOrderListSerializer(serializers.ModelSerializer):
+    """Rental Order List Serializer (Slim version for paginated order lists)"""
+    item_title = serializers.CharField(source='item.title', read_only=True)
+    item_image = serializers.SerializerMethodField()
+    renter_name = serializers.CharField(source='renter.username', read_only=True)
+    owner_name = serializers.CharField(source='owner.username', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    archived = serializers.BooleanField(source='is_archived', read_only=True)
+
+    class Meta:
+        model = RentalOrder
+        fields = [
+            'id', 'item', 'item_title', 'item_image', 'renter_name', 'owner_name',
+            'start_date', 'end_date', 'duration_days', 'daily_rate', 'total_amount',
+            'status', 'status_display', 'created_at', 'archived'
+        ]
+        read_only_fields = fields
+
+    def get_item_image(self, obj):
+        """Get item primary image (served from item__images when prefetched)"""
+        image = obj.item.primary_image
+        if image:
+            return image.image.url
+        return None
+
+
 class RentalOrderCreateSerializer(serializers.ModelSerializer):
     """Create Rental Order Serializer"""
 
@@ -77,9 +107,9 @@ class RentalOrderCreateSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         """Validate data"""
-        # Check if item is available
+        # Check if item is available; the overlap check below covers the dates
         item = data.get('item')
-        if item and not item.is_available():
+        if item and item.status not in BOOKABLE_STATUSES:
             raise serializers.ValidationError("This item is currently unavailable")
 
         # Check dates
@@ -98,18 +128,39 @@ class RentalOrderCreateSerializer(serializers.ModelSerializer):
 
             # Check for conflicting rentals
             if item:
-                conflicting_rentals = RentalOrder.objects.filter(
-                    item=item,
-                    status__in=['active'],
-                    start_date__lt=end_date,
-                    end_date__gt=start_date
-                )
-                if conflicting_rentals.exists():
+                if overlapping_rentals(item, start_date, end_date).exists():
                     raise serializers.ValidationError("Selected dates conflict with existing rentals")
 
         return data
 
 
+class RentalQuoteRequestSerializer(serializers.Serializer):
+    """One prospective order in a batch quote request"""
+    item = serializers.UUIDField()
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+
+    def validate(self, data):
+        """Validate data"""
+        if data['end_date'] < data['start_date']:
+            raise serializers.ValidationError("End date cannot be earlier than start date")
+        return data
+
+
+class RentalQuoteSerializer(serializers.Serializer):
+    """Price of one prospective order (``{'item', 'start_date', 'end_date', 'quote'}``)"""
+    item = serializers.UUIDField()
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    duration_days = serializers.IntegerField(source='quote.duration_days')
+    daily_rate = serializers.DecimalField(max_digits=10, decimal_places=2, source='quote.daily_rate')
+    rental_amount = serializers.DecimalField(max_digits=12, decimal_places=2, source='quote.rental_amount')
+    service_fee = serializers.DecimalField(max_digits=10, decimal_places=2, source='quote.service_fee')
+    total_amount = serializers.DecimalField(max_digits=12, decimal_places=2, source='quote.total_amount')
+    security_deposit = serializers.DecimalField(max_digits=12, decimal_places=2, source='quote.security_deposit')
+    total_with_deposit = serializers.DecimalField(max_digits=12, decimal_places=2, source='quote.total_with_deposit')
+
+
 class RentalSettingsSerializer(serializers.ModelSerializer):
     """Rental Settings Serializer"""
 
@@ -0,0 +1,118 @@
+"""Process-local, typed snapshot of RentalSettings for the booking hot path"""
+
+import json
+import logging
+import threading
+import time
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.cache import bump_version
+from config.db_routers import read_from_primary
+
+logger = logging.getLogger(__name__)
+
+RENTAL_SETTINGS_VERSION_KEY = 'rental:settings_version'
+
+# Values used until a RentalSettings row with the same key overrides them
+RENTAL_SETTING_DEFAULTS = {
+    'service_fee_rate': Decimal('0.05'),
+    'service_fee_minimum': Decimal('2.00'),
+    'deposit_rate': Decimal('1'),  # Share of the item value held as security deposit
+    'deposit_minimum': Decimal('0.00'),
+    'default_daily_rate': Decimal('20.00'),
+}
+
+
+def parse_boolean(value):
+    normalized = value.strip().lower()
+    if normalized in ('1', 'true', 'yes', 'on'):
+        return True
+    if normalized in ('0', 'false', 'no', 'off', ''):
+        return False
+    raise ValueError(f'not a boolean: {value!r}')
+
+
+# RentalSettings.setting_type -> parser for setting_value
+SETTING_PARSERS = {
+    'string': str,
+    'integer': int,
+    'int': int,
+    'decimal': Decimal,
+    'float': float,
+    'boolean': parse_boolean,
+    'bool': parse_boolean,
+    'json': json.loads,
+}
+
+
+def coerce_setting(value, setting_type):
+    """``value`` parsed according to ``setting_type``; unknown types stay strings"""
+    parser = SETTING_PARSERS.get((setting_type or 'string').lower(), str)
+    return parser(value)
+
+
+class RentalSettingsRegistry:
+    """
+    Every RentalSettings row as a ``{setting_key: typed value}`` dict.
+
+    Loaded with one query and reused until a setting changes: saves in this
+    process drop the snapshot at once, and other processes reload when the
+    shared version stamp moves (checked every RENTAL_SETTINGS_POLL_INTERVAL
+    seconds).
+    """
+
+    def __init__(self):
+        self._values = None
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @read_from_primary()
+    def load(self, version):
+        """Read and coerce all settings; rows that fail to parse are logged and skipped"""
+        from .models import RentalSettings
+
+        values = {}
+        for key, value, setting_type in RentalSettings.objects.values_list(
+            'setting_key', 'setting_value', 'setting_type'
+        ):
+            try:
+                values[key] = coerce_setting(value, setting_type)
+            except (ValueError, TypeError, InvalidOperation):
+                logger.warning('Ignoring rental setting %s: %r is not a valid %s', key, value, setting_type)
+        with self._lock:
+            self._values = values
+            self._version = version
+        return values
+
+    def values(self):
+        """The current snapshot, reloaded if another process changed a setting"""
+        values = self._values
+        now = time.monotonic()
+        if values is not None and now - self._checked_at < settings.RENTAL_SETTINGS_POLL_INTERVAL:
+            return values
+
+        version = cache.get(RENTAL_SETTINGS_VERSION_KEY, 0)
+        self._checked_at = now
+        if values is not None and self._version == version:
+            return values
+        return self.load(version)
+
+    def get(self, key, default=None):
+        """Typed value of ``key``, else its entry in RENTAL_SETTING_DEFAULTS, else ``default``"""
+        values = self.values()
+        if key in values:
+            return values[key]
+        return RENTAL_SETTING_DEFAULTS.get(key, default)
+
+    def invalidate(self):
+        """Reload here on next use and make other processes reload at their next poll"""
+        bump_version(RENTAL_SETTINGS_VERSION_KEY)
+        with self._lock:
+            self._values = None
+
+
+rental_settings = RentalSettingsRegistry()
@@ -0,0 +1,15 @@
+"""Cache invalidation for the rental application"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import RentalSettings
+from .settings_registry import rental_settings
+
+
+@receiver(post_save, sender=RentalSettings)
+@receiver(post_delete, sender=RentalSettings)
+def rental_setting_changed(sender, instance, **kwargs):
+    """Reload the settings snapshot once the change is committed and visible to other connections"""
+    transaction.on_commit(rental_settings.invalidate)
@@ -15,6 +15,9 @@ urlpatterns = [
 
     # API 路由
     path('api/create/', views.create_rental_api, name='create_rental_api'),
+    path('api/quotes/', views.rental_quotes_api, name='rental_quotes_api'),
     path('api/summary/', views.rental_summary_api, name='rental_summary_api'),
+    path('api/my-rentals/', views.my_rentals_api, name='my_rentals_api'),
+    path('api/owner-rentals/', views.owner_rentals_api, name='owner_rentals_api'),
     path('api/availability/<uuid:item_id>/', views.item_availability_api, name='item_availability_api'),
 ]
@@ -8,21 +8,32 @@ import uuid
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.db import transaction
+from django.db.models import Count, Q, Sum
 from django.shortcuts import render, get_object_or_404, redirect
 from django.utils import timezone
+from django.views.decorators.http import require_safe
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from apps.core.models import Item, User
-from .models import RentalOrder
+from config.metrics import query_budget, timed
+from config.renderers import json_response
+from .fees import fee_schedule, quote_rental
+from .archive import OrderHistory
+from .lifecycle import BOOKABLE_STATUSES, active_bookings, dates_overlap, is_bookable, mark_items_rented
+from .models import RentalOrder, RentalOrderArchive
+from .pagination import RentalOrderCursorPagination
 from .serializers import (
-    RentalOrderSerializer, RentalOrderCreateSerializer,
-    RentalSummarySerializer,
+    RentalOrderSerializer, RentalOrderCreateSerializer, RentalOrderListSerializer,
+    RentalQuoteRequestSerializer, RentalQuoteSerializer, RentalSummarySerializer,
     ItemAvailabilitySerializer
 )
 
+MAX_QUOTE_BATCH = 100  # Orders priced by one /rental/api/quotes/ request at most
+
 
 def rental_home(request):
     """Rental Home Page"""
@@ -32,31 +43,16 @@ def rental_home(request):
 @login_required
 def my_rentals(request):
     """My Rental Orders"""
-    # Get user's rental orders
-    user_rentals = RentalOrder.objects.filter(
-        renter=request.user
-    ).select_related('item', 'owner').prefetch_related('item__images').order_by('-created_at')
-
-    # Group by status
-    active_rentals = user_rentals.filter(status='active')
-    completed_rentals = user_rentals.filter(status='completed')
-
-    context = {
-        'active_rentals': active_rentals,
-        'completed_rentals': completed_rentals,
-        'total_rentals': user_rentals.count(),
-    }
-
+    # Only the counts are rendered here; the order lists are loaded page by
+    # page from my_rentals_api
+    context = rental_counts(renter=request.user)
     return render(request, 'rental/my_rentals.html', context)
 
 
 @login_required
 def rental_detail(request, rental_id):
     """Rental Order Details"""
-    rental = get_object_or_404(
-        RentalOrder.objects.select_related('item', 'owner', 'renter'),
-        id=rental_id
-    )
+    rental = get_object_or_404(RentalOrder.objects.for_listing(notes=True), id=rental_id)
 
     # Check permissions
     if rental.renter != request.user and rental.owner != request.user:
@@ -77,8 +73,8 @@ def create_rental(request, item_id):
     """Create Rental Order - Complete flow including payment and confirmation"""
     item = get_object_or_404(Item, id=item_id)
 
-    # Check if item is available
-    if not item.is_available():
+    # Check if item is listed; is_bookable below checks the dates
+    if item.status not in BOOKABLE_STATUSES:
         messages.error(request, "This item is currently unavailable")
         return redirect('product_detail', product_id=item_id)
 
@@ -100,17 +96,15 @@ def create_rental(request, item_id):
                 messages.error(request, "Please select a payment method")
                 return redirect('rental:create_rental', item_id=item_id)
 
+            if not is_bookable(item, start_date, end_date):
+                messages.error(request, "Selected dates conflict with existing rentals")
+                return redirect('rental:create_rental', item_id=item_id)
+
             # Calculate rental days
             duration_days = (end_date - start_date).days + 1
 
-            # Get daily rate (choose best price based on duration)
-            daily_rate = get_daily_rate_for_duration(item, duration_days)
-
-            # Calculate total amount with two decimal places
-            total_amount = daily_rate * duration_days
-            service_fee = calculate_service_fee(total_amount)
-            security_deposit = item.item_value or Decimal('0.00')
-            total_with_deposit = total_amount + service_fee + security_deposit
+            # Daily rate (best price for the duration), service fee and deposit
+            quote = quote_rental(item, duration_days)
 
             # Simulate payment processing
             if simulate_payment_processing(payment_method):
@@ -123,19 +117,21 @@ def create_rental(request, item_id):
                         start_date=start_date,
                         end_date=end_date,
                         duration_days=duration_days,
-                        daily_rate=daily_rate,
-                        total_amount=total_amount,
-                        security_deposit=security_deposit,
-                        service_fee=service_fee,
+                        daily_rate=quote.daily_rate,
+                        total_amount=quote.total_amount,
+                        security_deposit=quote.security_deposit,
+                        service_fee=quote.service_fee,
                         renter_notes=data.get('renter_notes', ''),
                         status='active',  # Order is active since payment is complete
                         payment_method=payment_method,
                         payment_date=timezone.now(),
                         transaction_id=f"TXN_{uuid.uuid4().hex[:8].upper()}"
                     )
+                    if start_date <= timezone.localdate():
+                        mark_items_rented([item.pk])
 
                 messages.success(request,
-                                 f"Rental order created and payment completed successfully! Total amount: £{total_with_deposit:.2f}")
+                                 f"Rental order created and payment completed successfully! Total amount: £{quote.total_with_deposit:.2f}")
                 return redirect('rental:rental_detail', rental_id=rental.id)
             else:
                 # Payment failed
@@ -158,21 +154,9 @@ def create_rental(request, item_id):
 @login_required
 def owner_rentals(request):
     """Owner's Rental Management"""
-    # Get rental orders for items owned by the user
-    owned_rentals = RentalOrder.objects.filter(
-        owner=request.user
-    ).select_related('item', 'renter').prefetch_related('item__images').order_by('-created_at')
-
-    # Group by status
-    active_rentals = owned_rentals.filter(status='active')
-    completed_rentals = owned_rentals.filter(status='completed')
-
-    context = {
-        'active_rentals': active_rentals,
-        'completed_rentals': completed_rentals,
-        'total_rentals': owned_rentals.count(),
-    }
-
+    # Only the counts are rendered here; the order lists are loaded page by
+    # page from owner_rentals_api
+    context = rental_counts(owner=request.user)
     return render(request, 'rental/owner_rentals.html', context)
 
 
@@ -187,19 +171,12 @@ def create_rental_api(request):
             # Get item
             item = serializer.validated_data['item']
 
-            # Check if item is available
-            if not item.is_available():
-                return Response(
-                    {'error': 'This item is currently unavailable'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
             # Calculate rental information
             start_date = serializer.validated_data['start_date']
             end_date = serializer.validated_data['end_date']
+            # The serializer checked the item's status and overlapping rentals
             duration_days = (end_date - start_date).days + 1
-            daily_rate = get_daily_rate_for_duration(item, duration_days)
-            total_amount = daily_rate * duration_days
+            quote = quote_rental(item, duration_days)
 
             # Create rental order
             with transaction.atomic():
@@ -210,21 +187,24 @@ def create_rental_api(request):
                     start_date=start_date,
                     end_date=end_date,
                     duration_days=duration_days,
-                    daily_rate=daily_rate,
-                    total_amount=total_amount,
-                    security_deposit=serializer.validated_data.get('security_deposit',
-                                                                   item.item_value or Decimal('0.00')),
-                    service_fee=calculate_service_fee(total_amount),
+                    daily_rate=quote.daily_rate,
+                    total_amount=quote.total_amount,
+                    security_deposit=serializer.validated_data.get('security_deposit', quote.security_deposit),
+                    service_fee=quote.service_fee,
                     renter_notes=serializer.validated_data.get('renter_notes', ''),
                     status='active',
                     payment_method=serializer.validated_data.get('payment_method', 'credit_card'),
                     payment_date=timezone.now(),
                     transaction_id=f"TXN_{uuid.uuid4().hex[:8].upper()}"
                 )
+                if start_date <= timezone.localdate():
+                    mark_items_rented([item.pk])
 
             # Return created order
             rental_serializer = RentalOrderSerializer(rental)
-            return Response(rental_serializer.data, status=status.HTTP_201_CREATED)
+            with timed('serializer'):
+                data = rental_serializer.data
+            return Response(data, status=status.HTTP_201_CREATED)
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -235,24 +215,102 @@ def create_rental_api(request):
         )
 
 
+@query_budget(5)  # Items and their prices, their bookings, plus settings and category names after a settings change
+@api_view(['POST'])
+def rental_quotes_api(request):
+    """
+    Price many prospective orders at once.
+
+    Takes ``{"orders": [{"item", "start_date", "end_date"}, ...]}`` and returns
+    one quote per order, in order; unknown or unavailable items get an
+    ``error`` entry instead.
+    """
+    orders = request.data.get('orders') if isinstance(request.data, dict) else None
+    if not isinstance(orders, list) or not orders:
+        return Response({'error': 'orders must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(orders) > MAX_QUOTE_BATCH:
+        return Response({'error': f'At most {MAX_QUOTE_BATCH} orders can be quoted at once'},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    serializer = RentalQuoteRequestSerializer(data=orders, many=True)
+    if not serializer.is_valid():
+        return Response({'error': 'Invalid orders', 'orders': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    orders = serializer.validated_data
+    items = Item.objects.filter(pk__in={order['item'] for order in orders}).only(
+        'id', 'status', 'item_value', 'category_id'
+    ).prefetch_related('prices').in_bulk()
+
+    # The status says nothing about future bookings: one query for the bookings of every item
+    bookings = active_bookings(list(items)) if items else {}
+
+    schedule = fee_schedule()
+    results = []
+    for order in orders:
+        item = items.get(order['item'])
+        if item is None:
+            results.append({'item': order['item'], 'error': 'Item not found'})
+        elif item.status not in BOOKABLE_STATUSES:
+            results.append({'item': order['item'], 'error': 'This item is currently unavailable'})
+        elif dates_overlap(bookings.get(item.pk, ()), order['start_date'], order['end_date']):
+            results.append({'item': order['item'], 'error': 'Selected dates conflict with existing rentals'})
+        else:
+            duration_days = (order['end_date'] - order['start_date']).days + 1
+            results.append(dict(order, quote=quote_rental(item, duration_days, schedule)))
+
+    with timed('serializer'):
+        data = [
+            RentalQuoteSerializer(result).data if 'quote' in result else result
+            for result in results
+        ]
+    return Response({'quotes': data})
+
+
+@query_budget(5)  # One more with include_archived
+@api_view(['GET'])
+@authentication_classes([SessionAuthentication])
+@permission_classes([IsAuthenticated])
+def my_rentals_api(request):
+    """Paginated Rental Orders of the Current User (as renter)"""
+    return paginated_rental_orders(request, renter=request.user)
+
+
+@query_budget(5)  # One more with include_archived
+@api_view(['GET'])
+@authentication_classes([SessionAuthentication])
+@permission_classes([IsAuthenticated])
+def owner_rentals_api(request):
+    """Paginated Rental Orders for Items Owned by the Current User"""
+    return paginated_rental_orders(request, owner=request.user)
+
+
+@query_budget(6)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def rental_summary_api(request):
     """Get Rental Summary API"""
     try:
-        # Get user's rental statistics
+        # Get user's rental statistics in a single aggregate query
         user_rentals = RentalOrder.objects.filter(renter=request.user)
-
-        summary = {
-            'total_orders': user_rentals.count(),
-            'active_orders': user_rentals.filter(status='active').count(),
-            'completed_orders': user_rentals.filter(status='completed').count(),
-            'total_revenue': sum(rental.total_amount for rental in user_rentals.filter(status='completed')),
-            'recent_orders': user_rentals.order_by('-created_at')[:5]
-        }
+        summary = user_rentals.aggregate(
+            total_orders=Count('id'),
+            active_orders=Count('id', filter=Q(status='active')),
+            completed_orders=Count('id', filter=Q(status='completed')),
+            total_revenue=Sum('total_amount', filter=Q(status='completed')),
+        )
+        # Archived orders are all completed
+        archived = RentalOrderArchive.objects.filter(renter=request.user).aggregate(
+            orders=Count('id'), revenue=Sum('total_amount'),
+        )
+        summary['total_orders'] += archived['orders']
+        summary['completed_orders'] += archived['orders']
+        summary['total_revenue'] = (summary['total_revenue'] or Decimal('0.00')) + (archived['revenue'] or Decimal('0.00'))
+        summary['recent_orders'] = user_rentals.for_listing(notes=True).order_by('-created_at')[:5]
 
         serializer = RentalSummarySerializer(summary)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        with timed('serializer'):
+            data = serializer.data
+        return Response(data, status=status.HTTP_200_OK)
 
     except Exception as e:
         return Response(
@@ -261,27 +319,30 @@ def rental_summary_api(request):
         )
 
 
-@api_view(['GET'])
-def item_availability_api(request, item_id):
-    """Get Item Availability API"""
+@query_budget(2)
+@require_safe
+async def item_availability_api(request, item_id):
+    """Get Item Availability API (async: runs on the event loop under ASGI)"""
     try:
-        item = get_object_or_404(Item, id=item_id)
+        item_status = await Item.objects.filter(id=item_id).values_list('status', flat=True).afirst()
+        if item_status is None:
+            return json_response({'detail': 'No Item matches the given query.'}, status=404)
 
-        # Check if item is available
-        is_available = item.is_available()
+        # Same rule as Item.is_available: items are 'rented' while a rental runs (see lifecycle.py).
+        # That only answers for today; an active item can still have future bookings
+        is_available = item_status == 'active'
 
         # Get conflicting rental dates
         conflicting_rentals = []
-        if not is_available:
-            active_rentals = RentalOrder.objects.filter(
-                item=item,
-                status='active'
-            )
-            for rental in active_rentals:
-                current_date = rental.start_date
-                while current_date <= rental.end_date:
-                    conflicting_rentals.append(current_date)
-                    current_date += timedelta(days=1)
+        active_rentals = RentalOrder.objects.filter(
+            item_id=item_id,
+            status='active'
+        ).values_list('start_date', 'end_date')
+        async for start_date, end_date in active_rentals:
+            current_date = start_date
+            while current_date <= end_date:
+                conflicting_rentals.append(current_date)
+                current_date += timedelta(days=1)
 
         # Calculate next available date
         next_available_date = None
@@ -302,44 +363,72 @@ def item_availability_api(request, item_id):
         }
 
         serializer = ItemAvailabilitySerializer(availability_data)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        with timed('serializer'):
+            data = serializer.data
+        return json_response(data, status=status.HTTP_200_OK)
 
     except Exception as e:
-        return Response(
+        return json_response(
             {'error': str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
 
 # Helper functions
-def get_daily_rate_for_duration(item, duration_days):
-    """Get daily rate based on duration"""
-    # Find the most matching rental period price
-    prices = item.prices.filter(is_active=True).order_by('duration_days')
-
-    if prices.exists():
-        # Find the closest rental period price
-        best_price = None
-        for price in prices:
-            if price.duration_days >= duration_days:
-                best_price = price
-                break
-
-        if best_price:
-            return best_price.daily_price
-        else:
-            # If no suitable price found, use the price for the longest rental period
-            return prices.last().daily_price
-
-    # Default price
-    return Decimal('20.00')
-
-
-def calculate_service_fee(total_amount):
-    """Calculate service fee"""
-    # Simple service fee calculation: 5% of total amount, minimum £2
-    service_fee = total_amount * Decimal('0.05')
-    return max(service_fee, Decimal('2.00'))
+def rental_counts(**lookups):
+    """Total, active and completed counts of the orders matching ``lookups``, archived ones included"""
+    counts = RentalOrder.objects.filter(**lookups).aggregate(
+        total_rentals=Count('id'),
+        active_count=Count('id', filter=Q(status='active')),
+        completed_count=Count('id', filter=Q(status='completed')),
+    )
+    # Only completed orders are archived
+    archived = RentalOrderArchive.objects.filter(**lookups).count()
+    counts['total_rentals'] += archived
+    counts['completed_count'] += archived
+    return counts
+
+
+def paginated_rental_orders(request, **lookups):
+    """
+    Filter the orders matching ``lookups`` from query parameters and return one cursor page.
+
+    Supported filters: ``status``, ``start_date_after`` and ``start_date_before``
+    (YYYY-MM-DD), and ``include_archived=1`` to page through archived orders
+    too. Combined with the renter/owner filter, ``status`` uses the
+    (renter, status) / (owner, status) indexes.
+    """
+    params = request.query_params
+    filters = dict(lookups)
+
+    status_filter = params.get('status')
+    if status_filter:
+        if status_filter not in dict(RentalOrder.STATUS_CHOICES):
+            return Response({'error': f'Invalid status: {status_filter}'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        filters['status'] = status_filter
+
+    for param, lookup in (('start_date_after', 'start_date__gte'), ('start_date_before', 'start_date__lte')):
+        value = params.get(param)
+        if value:
+            try:
+                parsed = datetime.strptime(value, '%Y-%m-%d').date()
+            except ValueError:
+                return Response({'error': f'{param} must be a date in YYYY-MM-DD format'},
+                                status=status.HTTP_400_BAD_REQUEST)
+            filters[lookup] = parsed
+
+    queryset = RentalOrder.objects.filter(**filters).for_listing()
+    if params.get('include_archived') in ('1', 'true') and status_filter != 'active':
+        # Only completed orders are archived
+        queryset = OrderHistory(queryset, RentalOrderArchive.objects.filter(**filters).for_listing())
+
+    paginator = RentalOrderCursorPagination()
+    page = paginator.paginate_queryset(queryset, request)
+    serializer = RentalOrderListSerializer(page, many=True)
+    with timed('serializer'):
+        data = serializer.data
+    return paginator.get_paginated_response(data)
 
 
 def simulate_payment_processing(payment_method):
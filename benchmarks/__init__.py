@@ -0,0 +1,11 @@
+"""
+ShareTools Load-Test Harness
+
+Drives the browse and rental hot paths through Django's test client at a
+fixed concurrency and reports latency, queries per request and throughput
+as JSON so results can be diffed between commits.
+
+Usage:
+    python -m benchmarks.hot_paths --items 500 --concurrency 8 --output bench.json
+    python -m benchmarks.compare baseline.json bench.json
+"""
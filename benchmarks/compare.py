@@ -0,0 +1,76 @@
+"""
+Compare two benchmark result files
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 10
+
+Prints per-scenario deltas and exits with status 1 when a p95 latency or
+mean query count regresses by more than ``--threshold`` percent.
+"""
+import argparse
+import json
+import sys
+
+METRICS = [
+    ('latency_ms', 'p50'),
+    ('latency_ms', 'p95'),
+    ('latency_ms', 'p99'),
+    ('queries', 'mean'),
+    ('throughput_rps', None),
+]
+GATED = {('latency_ms', 'p95'), ('queries', 'mean')}
+
+
+def metric_value(scenario, group, key):
+    value = scenario.get(group)
+    return value.get(key) if key else value
+
+
+def percent_change(old, new):
+    if not old:
+        return 0.0 if not new else float('inf')
+    return (new - old) / old * 100.0
+
+
+def compare(baseline, candidate, threshold):
+    """Return ``(report_lines, regressions)``"""
+    lines, regressions = [], []
+    for name, new_scenario in sorted(candidate.get('scenarios', {}).items()):
+        old_scenario = baseline.get('scenarios', {}).get(name)
+        if old_scenario is None:
+            lines.append(f'{name}: new scenario')
+            continue
+        lines.append(name)
+        for group, key in METRICS:
+            old = metric_value(old_scenario, group, key)
+            new = metric_value(new_scenario, group, key)
+            change = percent_change(old, new)
+            label = f'{group}.{key}' if key else group
+            lines.append(f'  {label:<20} {old:>10} -> {new:<10} ({change:+.1f}%)')
+            if (group, key) in GATED and change > threshold:
+                regressions.append(f'{name} {label} {change:+.1f}%')
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Diff two benchmark result files')
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Allowed regression in percent for p95 latency and queries')
+    args = parser.parse_args(argv)
+
+    with open(args.baseline, encoding='utf-8') as fh:
+        baseline = json.load(fh)
+    with open(args.candidate, encoding='utf-8') as fh:
+        candidate = json.load(fh)
+
+    lines, regressions = compare(baseline, candidate, args.threshold)
+    print('\n'.join(lines))
+    if regressions:
+        print('\nRegressions:')
+        print('\n'.join(f'  {line}' for line in regressions))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
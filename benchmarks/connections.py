@@ -0,0 +1,132 @@
+"""
+Cold-connect vs persistent connection latency on /api/items/
+
+Runs the same ``/api/items/`` load twice: with ``CONN_MAX_AGE = 0``, so every
+request opens a new database connection, and with persistent connections
+(``--max-age``). Django's test client skips the connection cleanup a real
+server does around each request, so the client here repeats it.
+
+    python -m benchmarks.connections --items 500 --requests 300 --concurrency 4
+
+Run it against the MySQL settings (or a remote database) to see the
+handshake cost; a local SQLite file connects in microseconds.
+"""
+import argparse
+import threading
+
+from .runner import (
+    benchmark_database, environment_info, run_scenario, setup_django, write_results,
+)
+
+
+class ConnectionCounter:
+    """Counts connections opened by requests in flight on any thread"""
+
+    def __init__(self):
+        self.opened = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __call__(self, sender, connection, **kwargs):
+        if getattr(self._local, 'active', False):
+            with self._lock:
+                self.opened += 1
+
+    def track(self):
+        """Count connections opened on this thread until ``untrack``"""
+        self._local.active = True
+
+    def untrack(self):
+        self._local.active = False
+
+
+class LifecycleClient:
+    """
+    Test client wrapper that closes stale connections before and after each
+    request, like the WSGI/ASGI handlers.
+
+    Only connections opened inside a request are counted; the runner's query
+    capture connects before the request starts.
+    """
+
+    def __init__(self, client, counter):
+        self.client = client
+        self.counter = counter
+
+    def get(self, path, data=None, **extra):
+        from django.db import close_old_connections
+
+        self.counter.track()
+        close_old_connections()
+        try:
+            return self.client.get(path, data, **extra)
+        finally:
+            close_old_connections()
+            self.counter.untrack()
+
+
+def run_with_max_age(max_age, args):
+    """Drive /api/items/ with every alias set to ``CONN_MAX_AGE = max_age``"""
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+    from django.test import Client
+
+    connections.close_all()
+    for alias in connections:
+        connections.settings[alias]['CONN_MAX_AGE'] = max_age
+
+    def items_list(index):
+        return 'get', '/api/items/', {'page': index % 5 + 1}
+
+    counter = ConnectionCounter()
+
+    def factory():
+        return LifecycleClient(Client(raise_request_exception=False), counter)
+
+    if args.warmup:
+        run_scenario(items_list, args.warmup, 1, factory)
+    counter.opened = 0
+    connection_created.connect(counter, weak=False)
+    try:
+        result = run_scenario(items_list, args.requests, args.concurrency, factory)
+    finally:
+        connection_created.disconnect(counter)
+    result['connections_opened'] = counter.opened
+    result['connection_reuse_rate'] = round(1 - counter.opened / args.requests, 3)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare cold-connect and persistent DB connection latency')
+    parser.add_argument('--items', type=int, default=500)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--requests', type=int, default=300, help='Requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per scenario')
+    parser.add_argument('--max-age', type=int, default=600, help='CONN_MAX_AGE for the persistent run')
+    parser.add_argument('--output', help='Write JSON results to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from .seed import seed_dataset
+
+    with benchmark_database():
+        seed_dataset(items=args.items, users=args.users, orders=0, seed=args.seed)
+        results = {
+            'environment': environment_info(),
+            'parameters': {
+                'items': args.items, 'requests': args.requests,
+                'concurrency': args.concurrency, 'max_age': args.max_age,
+            },
+            'scenarios': {
+                'cold_connect': run_with_max_age(0, args),
+                'persistent': run_with_max_age(args.max_age, args),
+            },
+        }
+
+    write_results(results, args.output)
+
+
+if __name__ == '__main__':
+    main()
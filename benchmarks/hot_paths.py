@@ -0,0 +1,130 @@
+"""
+Load test for the browse and rental hot paths
+
+Seeds a throwaway database, then drives each endpoint at fixed concurrency
+and prints (or writes) a JSON report with p50/p95/p99 latency, queries per
+request and throughput.
+
+    python -m benchmarks.hot_paths --items 500 --users 100 --orders 1000 \
+        --requests 200 --concurrency 8 --output bench.json
+"""
+import argparse
+import random
+from datetime import timedelta
+
+from .runner import (
+    benchmark_database, environment_info, run_scenario, setup_django, write_results,
+)
+
+SEARCH_TERMS = ['drill', 'ladder', 'washer', 'trimmer', 'portable', 'compact', 'saw']
+
+
+def build_scenarios(dataset, seed):
+    """Return ``{name: (build_request, authenticated)}`` for every hot path"""
+    from django.utils import timezone
+
+    item_ids = dataset['items']
+    page_count = max(1, len(item_ids) // 20)
+    today = timezone.now().date()
+
+    def rng_for(name, index):
+        return random.Random(f'{seed}:{name}:{index}')
+
+    def items_list(index):
+        page = rng_for('items_list', index).randint(1, min(page_count, 5))
+        return 'get', '/api/items/', {'page': page}
+
+    def items_search(index):
+        term = rng_for('items_search', index).choice(SEARCH_TERMS)
+        return 'get', '/api/items/search/', {'q': term}
+
+    def product_detail(index):
+        item_id = rng_for('product_detail', index).choice(item_ids)
+        return 'get', f'/product/{item_id}/', None
+
+    def item_availability(index):
+        item_id = rng_for('item_availability', index).choice(item_ids)
+        return 'get', f'/rental/api/availability/{item_id}/', None
+
+    def rental_create(index):
+        rng = rng_for('rental_create', index)
+        start = today + timedelta(days=rng.randint(90, 900))
+        end = start + timedelta(days=rng.choice([1, 2, 6]))
+        return 'post', '/rental/api/create/', {
+            'item': str(rng.choice(item_ids)),
+            'start_date': start.isoformat(),
+            'end_date': end.isoformat(),
+            'daily_rate': '10.00',
+            'payment_method': 'credit_card',
+        }
+
+    return {
+        'items_list': (items_list, False),
+        'items_search': (items_search, False),
+        'product_detail': (product_detail, True),
+        'item_availability': (item_availability, False),
+        'rental_create': (rental_create, True),
+    }
+
+
+def client_factory_for(user, authenticated):
+    """Build per-thread API clients, logged in where the endpoint needs a user"""
+    from rest_framework.test import APIClient
+
+    def factory():
+        client = APIClient(raise_request_exception=False)
+        if authenticated:
+            client.force_login(user)
+            client.force_authenticate(user=user)
+        return client
+    return factory
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark ShareTools hot paths')
+    parser.add_argument('--items', type=int, default=500)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--orders', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--requests', type=int, default=200, help='Requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per scenario')
+    parser.add_argument('--scenario', action='append', dest='scenarios',
+                        help='Only run the named scenario (repeatable)')
+    parser.add_argument('--keepdb', action='store_true', help='Reuse the benchmark database')
+    parser.add_argument('--output', help='Write JSON results to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from .seed import seed_dataset
+
+    with benchmark_database(keepdb=args.keepdb):
+        dataset = seed_dataset(items=args.items, users=args.users, orders=args.orders, seed=args.seed)
+        from apps.core.models import User
+        user = User.objects.get(id=dataset['users'][0])
+
+        scenarios = build_scenarios(dataset, args.seed)
+        selected = args.scenarios or list(scenarios)
+        results = {
+            'environment': environment_info(),
+            'parameters': {
+                'items': args.items, 'users': args.users, 'orders': args.orders,
+                'seed': args.seed, 'requests': args.requests, 'concurrency': args.concurrency,
+            },
+            'scenarios': {},
+        }
+        for name in selected:
+            build_request, authenticated = scenarios[name]
+            factory = client_factory_for(user, authenticated)
+            if args.warmup:
+                # Past the measured indexes, so warmup bookings do not clash with measured ones
+                run_scenario(build_request, args.warmup, 1, factory, first_index=args.requests)
+            results['scenarios'][name] = run_scenario(
+                build_request, args.requests, args.concurrency, factory
+            )
+
+    write_results(results, args.output)
+
+
+if __name__ == '__main__':
+    main()
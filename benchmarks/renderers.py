@@ -0,0 +1,92 @@
+"""
+Micro-benchmark for DRF JSON rendering of item list pages
+
+Serializes pages of ``ItemListSerializer`` data once, then renders them
+repeatedly with DRF's stock ``JSONRenderer`` and ``config.renderers.FastJSONRenderer``
+and reports per-page render time. Outputs are checked to be byte-identical.
+
+    python -m benchmarks.renderers --items 500 --page-size 20 --page-size 100 --repeat 200
+"""
+import argparse
+import time
+
+from .runner import (
+    benchmark_database, environment_info, percentile, setup_django, write_results,
+)
+
+
+def build_pages(page_size, page_count):
+    """``ItemListSerializer`` data for the first ``page_count`` pages of active items"""
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from apps.core.models import Item
+    from apps.core.serializers import ItemListSerializer
+
+    request = Request(APIRequestFactory().get('/api/items/'))
+    queryset = Item.objects.for_listing().active()
+    pages = []
+    for number in range(page_count):
+        items = queryset[number * page_size:(number + 1) * page_size]
+        pages.append(ItemListSerializer(items, many=True, context={'request': request}).data)
+    return [page for page in pages if page]
+
+
+def time_renderer(renderer, pages, repeat):
+    """Render every page ``repeat`` times; return per-page milliseconds and the outputs"""
+    samples = []
+    outputs = [renderer.render(page) for page in pages]
+    for _ in range(repeat):
+        for page in pages:
+            started = time.perf_counter()
+            renderer.render(page)
+            samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        'p50': round(percentile(samples, 50), 4),
+        'p95': round(percentile(samples, 95), 4),
+        'mean': round(sum(samples) / len(samples), 4),
+    }, outputs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark JSON rendering of item list pages')
+    parser.add_argument('--items', type=int, default=500)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--page-size', type=int, action='append', dest='page_sizes',
+                        help='Items per page (repeatable, default 20 and 100)')
+    parser.add_argument('--pages', type=int, default=5, help='Distinct pages per page size')
+    parser.add_argument('--repeat', type=int, default=200, help='Renders per page')
+    parser.add_argument('--output', help='Write JSON results to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+
+    from config import renderers
+    from .seed import seed_dataset
+
+    with benchmark_database():
+        seed_dataset(items=args.items, users=args.users, orders=0, seed=args.seed)
+        results = {
+            'environment': {**environment_info(), 'orjson': renderers.orjson is not None},
+            'parameters': {'items': args.items, 'pages': args.pages, 'repeat': args.repeat},
+            'scenarios': {},
+        }
+        for page_size in args.page_sizes or [20, 100]:
+            pages = build_pages(page_size, args.pages)
+            baseline, expected = time_renderer(JSONRenderer(), pages, args.repeat)
+            fast, outputs = time_renderer(renderers.FastJSONRenderer(), pages, args.repeat)
+            results['scenarios'][f'item_list_page_{page_size}'] = {
+                'bytes': sum(len(output) for output in expected) // len(expected),
+                'identical': outputs == expected,
+                'render_ms': {'stdlib': baseline, 'fast': fast},
+                'speedup': round(baseline['mean'] / fast['mean'], 2) if fast['mean'] else None,
+            }
+
+    write_results(results, args.output)
+
+
+if __name__ == '__main__':
+    main()
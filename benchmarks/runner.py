@@ -0,0 +1,180 @@
+"""
+Shared benchmark plumbing: Django bootstrap, throwaway database and the
+concurrent request driver
+"""
+import json
+import logging
+import math
+import os
+import platform
+import re
+import subprocess
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# Query count in the db entry of the Server-Timing header set by RequestMetricsMiddleware
+SERVER_TIMING_QUERIES = re.compile(r'(?:^|,)\s*db;[^,]*desc="(\d+) queries"')
+
+
+def setup_django():
+    """Configure Django for a standalone benchmark process"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+    # Failed requests show up in the per-scenario status counts instead
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)
+
+
+@contextmanager
+def benchmark_database(keepdb=False):
+    """
+    Create a throwaway test database so benchmarks never touch real data.
+
+    The schema is created from the current models (``run_syncdb``) rather
+    than by running migrations: the rental migrations lag the models
+    (e.g. ``RentalOrder.payment_method`` and ``completed_at`` are never
+    added), and the benchmarks measure the code as it is.
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    old_migrate = test_settings.get('MIGRATE', True)
+    test_settings['MIGRATE'] = False
+    try:
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+    finally:
+        test_settings['MIGRATE'] = old_migrate
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+        teardown_test_environment()
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not values:
+        return 0.0
+    rank = math.ceil(pct / 100.0 * len(values)) - 1
+    return values[max(0, min(rank, len(values) - 1))]
+
+
+def summarize(latencies, query_counts, statuses, elapsed, concurrency):
+    """Reduce raw samples to the JSON summary of one scenario"""
+    latencies = sorted(latencies)
+    count = len(latencies)
+    return {
+        'requests': count,
+        'concurrency': concurrency,
+        'status': {str(code): n for code, n in sorted(statuses.items())},
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50), 3),
+            'p95': round(percentile(latencies, 95), 3),
+            'p99': round(percentile(latencies, 99), 3),
+            'mean': round(sum(latencies) / count, 3) if count else 0.0,
+            'max': round(latencies[-1], 3) if count else 0.0,
+        },
+        'queries': {
+            'mean': round(sum(query_counts) / count, 2) if count else 0.0,
+            'max': max(query_counts) if query_counts else 0,
+        },
+        'throughput_rps': round(count / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def request_query_count(response, captured):
+    """
+    Queries issued by one request, as ``config.metrics`` counted them.
+
+    The middleware counts queries on every connection that served the
+    request, including ones run by async views on other threads, which a
+    ``CaptureQueriesContext`` on the calling thread misses. ``captured`` is
+    the fallback when the header is absent.
+    """
+    match = SERVER_TIMING_QUERIES.search(response.headers.get('Server-Timing', ''))
+    return int(match.group(1)) if match else captured
+
+
+def run_scenario(build_request, requests, concurrency, client_factory, first_index=0):
+    """
+    Issue ``requests`` calls at fixed ``concurrency``.
+
+    ``build_request(index)`` returns ``(method, path, data)`` for indexes
+    from ``first_index`` on; every worker
+    thread gets its own client from ``client_factory`` and its own database
+    connection. Query counts come from the ``Server-Timing`` header (see
+    ``request_query_count``).
+    """
+    from django.db import connection, connections
+    from django.test.utils import CaptureQueriesContext
+
+    lock = threading.Lock()
+    indexes = iter(range(first_index, first_index + requests))
+    latencies, query_counts, statuses = [], [], Counter()
+
+    def next_index():
+        with lock:
+            return next(indexes, None)
+
+    def worker():
+        client = client_factory()
+        try:
+            index = next_index()
+            while index is not None:
+                method, path, data = build_request(index)
+                with CaptureQueriesContext(connection) as ctx:
+                    started = time.perf_counter()
+                    if method == 'post':
+                        response = client.post(path, data, format='json')
+                    else:
+                        response = client.get(path, data)
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                with lock:
+                    latencies.append(elapsed_ms)
+                    query_counts.append(request_query_count(response, len(ctx.captured_queries)))
+                    statuses[response.status_code] += 1
+                index = next_index()
+        finally:
+            connections.close_all()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    elapsed = time.perf_counter() - started
+    return summarize(latencies, query_counts, statuses, elapsed, concurrency)
+
+
+def environment_info():
+    """Static description of the run, without timestamps so output stays diffable"""
+    import django
+    from django.db import connection
+
+    try:
+        commit = subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+    }
+
+
+def write_results(results, output=None):
+    """Write results as stable, sorted JSON (stdout when no file is given)"""
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if output:
+        with open(output, 'w', encoding='utf-8') as fh:
+            fh.write(text + '\n')
+    else:
+        print(text)
@@ -0,0 +1,22 @@
+"""
+Deterministic synthetic dataset for the benchmark database
+"""
+import io
+
+from django.core.management import call_command
+
+
+def seed_dataset(items=500, users=100, orders=1000, seed=42):
+    """Populate the current database via ``generate_fixture_data`` and return the ids used"""
+    from apps.core.models import Item, User
+
+    call_command(
+        'generate_fixture_data',
+        items=items, users=users, orders=orders, seed=seed,
+        stdout=io.StringIO(),
+    )
+    return {
+        'items': list(Item.objects.filter(status='active').order_by('id').values_list('id', flat=True)),
+        'users': list(User.objects.filter(username__startswith=f'fx{seed}_')
+                      .order_by('username').values_list('id', flat=True)),
+    }
@@ -0,0 +1,110 @@
+"""
+Parity check and micro-benchmark for the item list fast serializer
+
+Builds pages of ``/api/items/`` output with ``ItemListSerializer`` and with
+``apps.core.fast_serializers`` (queries included) and reports per-page time.
+Every page is rendered to JSON both ways and must be byte-identical; the
+process exits with status 1 otherwise.
+
+    python -m benchmarks.serializers --items 500 --page-size 20 --page-size 100 --repeat 20
+"""
+import argparse
+import sys
+import time
+
+from .runner import (
+    benchmark_database, environment_info, percentile, setup_django, write_results,
+)
+
+
+def add_edge_cases():
+    """Cover fields the seed data leaves uniform: avatars, missing images and prices, non-primary images"""
+    from apps.core.models import Item, ItemImage, ItemPrice, User
+
+    user = User.objects.filter(owned_items__status='active').first()
+    User.objects.filter(pk=user.pk).update(avatar='avatars/benchmark.png', phone=None)
+    items = list(Item.objects.active().order_by('-created_at').values_list('id', flat=True)[:3])
+    ItemImage.objects.filter(item_id=items[0]).delete()
+    ItemPrice.objects.filter(item_id=items[1]).update(is_active=False)
+    ItemImage.objects.filter(item_id=items[2]).update(is_primary=False)
+
+
+def time_path(build, pages, repeat):
+    """Run ``build(page_number)`` ``repeat`` times per page; return per-page milliseconds and outputs"""
+    samples = []
+    outputs = [build(number) for number in range(pages)]
+    for _ in range(repeat):
+        for number in range(pages):
+            started = time.perf_counter()
+            build(number)
+            samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        'p50': round(percentile(samples, 50), 3),
+        'p95': round(percentile(samples, 95), 3),
+        'mean': round(sum(samples) / len(samples), 3),
+    }, outputs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare ItemListSerializer with the fast list serializer')
+    parser.add_argument('--items', type=int, default=500)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--page-size', type=int, action='append', dest='page_sizes',
+                        help='Items per page (repeatable, default 20 and 100)')
+    parser.add_argument('--pages', type=int, default=5, help='Distinct pages per page size')
+    parser.add_argument('--repeat', type=int, default=20, help='Builds per page')
+    parser.add_argument('--output', help='Write JSON results to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from apps.core.fast_serializers import item_list_rows, serialize_item_rows
+    from apps.core.models import Item
+    from apps.core.serializers import ItemListSerializer
+    from .seed import seed_dataset
+
+    with benchmark_database():
+        seed_dataset(items=args.items, users=args.users, orders=0, seed=args.seed)
+        add_edge_cases()
+        request = Request(APIRequestFactory().get('/api/items/'))
+        queryset = Item.objects.for_listing().active().order_by('-created_at', 'id')
+        renderer = JSONRenderer()
+
+        results = {
+            'environment': environment_info(),
+            'parameters': {'items': args.items, 'pages': args.pages, 'repeat': args.repeat},
+            'scenarios': {},
+        }
+        mismatches = []
+        for page_size in args.page_sizes or [20, 100]:
+            def drf_page(number):
+                page = queryset[number * page_size:(number + 1) * page_size]
+                return ItemListSerializer(page, many=True, context={'request': request}).data
+
+            def fast_page(number):
+                page = item_list_rows(queryset)[number * page_size:(number + 1) * page_size]
+                return serialize_item_rows(page, request)
+
+            baseline, expected = time_path(drf_page, args.pages, args.repeat)
+            fast, outputs = time_path(fast_page, args.pages, args.repeat)
+            identical = [renderer.render(a) == renderer.render(b) for a, b in zip(expected, outputs)]
+            if not all(identical):
+                mismatches.append(page_size)
+            results['scenarios'][f'item_list_page_{page_size}'] = {
+                'identical': all(identical),
+                'serialize_ms': {'drf': baseline, 'fast': fast},
+                'speedup': round(baseline['mean'] / fast['mean'], 2) if fast['mean'] else None,
+            }
+
+    write_results(results, args.output)
+    if mismatches:
+        sys.exit(f'Fast serializer output differs from ItemListSerializer for page sizes {mismatches}')
+
+
+if __name__ == '__main__':
+    main()
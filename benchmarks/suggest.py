@@ -0,0 +1,99 @@
+"""
+Ranking check and micro-benchmark for the typeahead suggestion index
+
+Adds a heavy category whose name starts with a letter that more than
+``--crowd`` item titles (each on few items) also start with, so its keys
+sort after all of theirs, then checks that a one-letter lookup still ranks
+the category first. Reports lookup time for short and long prefixes; the
+process exits with status 1 if the ranking is wrong.
+
+    python -m benchmarks.suggest --items 500 --crowd 2000 --repeat 200
+"""
+import argparse
+import sys
+import time
+
+from .runner import (
+    benchmark_database, environment_info, percentile, setup_django, write_results,
+)
+
+HEAVY_CATEGORY = 'Zz Heavy Category'
+
+
+def add_crowded_prefix(crowd):
+    """``crowd`` distinct 'Za…' titles on one item each, and a category named 'Zz…' on every item"""
+    from apps.core.models import Category, Item
+
+    category = Category.objects.create(name='zz-heavy', display_name=HEAVY_CATEGORY, is_active=True)
+    Item.objects.active().update(category=category)
+    template = Item.objects.active().first()
+    titles = [f'Za {number:05d} widget' for number in range(crowd)]
+    clones = []
+    for title in titles:
+        template.pk = None
+        template.title = title
+        clones.append(Item(**{
+            field.attname: getattr(template, field.attname)
+            for field in Item._meta.concrete_fields if field.attname != 'id'
+        }))
+    Item.objects.bulk_create(clones)
+
+
+def time_lookups(index, prefixes, repeat):
+    samples = []
+    for _ in range(repeat):
+        for prefix in prefixes:
+            index._short_rankings = {}  # Time the full ranking, not the kept one
+            started = time.perf_counter()
+            index.suggest(prefix, 8)
+            samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        'p50': round(percentile(samples, 50), 4),
+        'p95': round(percentile(samples, 95), 4),
+        'mean': round(sum(samples) / len(samples), 4),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check ranking and time lookups of the suggestion index')
+    parser.add_argument('--items', type=int, default=500)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--crowd', type=int, default=2000, help='Light titles sharing the heavy category\'s first letter')
+    parser.add_argument('--repeat', type=int, default=200, help='Lookups per prefix')
+    parser.add_argument('--output', help='Write JSON results to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from apps.core.suggest import SuggestionIndex
+    from .seed import seed_dataset
+
+    with benchmark_database():
+        seed_dataset(items=args.items, users=args.users, orders=0, seed=args.seed)
+        add_crowded_prefix(args.crowd)
+        index = SuggestionIndex()
+        index.rebuild()
+
+        top = index.suggest('z', 1)
+        ranked_first = bool(top) and top[0]['type'] == 'category' and top[0]['text'] == HEAVY_CATEGORY
+        results = {
+            'environment': environment_info(),
+            'parameters': {'items': args.items, 'crowd': args.crowd, 'repeat': args.repeat},
+            'scenarios': {
+                'crowded_prefix': {'index_keys': len(index._keys), 'top': top, 'heavy_ranked_first': ranked_first},
+                'lookup_ms': {
+                    'short_prefix': time_lookups(index, ['z', 'za'], args.repeat),
+                    'long_prefix': time_lookups(index, ['za 01', 'zz heavy'], args.repeat),
+                },
+            },
+        }
+
+    write_results(results, args.output)
+    if not ranked_first:
+        print(f'{HEAVY_CATEGORY!r} is not the top suggestion for "z"', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,5 +12,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+# Persistent connections are not reused under ASGI: sync code runs on changing
+# threads, each of which would keep its own connection open (see config/db.py)
+os.environ.setdefault("DB_CONN_MAX_AGE", "0")
 
 application = get_asgi_application()
@@ -0,0 +1,74 @@
+"""
+Database connection management settings
+
+Each alias keeps its connection open between requests for ``CONN_MAX_AGE``
+seconds and checks it is still usable before reuse (``CONN_HEALTH_CHECKS``),
+so most requests skip the TCP and authentication handshake. Values come from
+the environment, per alias first and then globally:
+
+    DB_DEFAULT_CONN_MAX_AGE=300   # only the "default" alias
+    DB_CONN_MAX_AGE=60            # every alias; "none" keeps connections forever, 0 disables reuse
+    DB_CONN_HEALTH_CHECKS=1
+    DB_POOL_SIZE=10               # optional pool, needs django-db-connection-pool
+    DB_POOL_MAX_OVERFLOW=10
+    DB_POOL_RECYCLE=3600
+
+Persistent connections are per thread, so a process holds at most one per
+worker thread. A pool instead shares ``DB_POOL_SIZE`` connections between
+all threads of a process.
+
+Under ASGI, Django runs sync code (sync views, ``run_concurrently``) on
+short-lived or changing threads, so persistent connections are never reused
+and pile up until ``CONN_MAX_AGE`` runs out. ``config.asgi`` therefore
+defaults ``DB_CONN_MAX_AGE`` to 0; use ``DB_POOL_SIZE`` there to reuse
+connections.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+DEFAULT_CONN_MAX_AGE = 60
+
+# Pooled drop-in backends from django-db-connection-pool
+POOL_ENGINES = {
+    'django.db.backends.mysql': 'dj_db_conn_pool.backends.mysql',
+    'django.db.backends.postgresql': 'dj_db_conn_pool.backends.postgresql',
+}
+
+
+def env_setting(alias, name, default=None):
+    """``DB_<ALIAS>_<NAME>`` if set, else ``DB_<NAME>``, else ``default``"""
+    value = os.environ.get(f'DB_{alias.upper()}_{name}')
+    if value is None:
+        value = os.environ.get(f'DB_{name}', default)
+    return value
+
+
+def connection_settings(alias, engine):
+    """``CONN_MAX_AGE``, ``CONN_HEALTH_CHECKS`` and optional pool settings for one alias"""
+    max_age = env_setting(alias, 'CONN_MAX_AGE', str(DEFAULT_CONN_MAX_AGE))
+    config = {
+        'ENGINE': engine,
+        'CONN_MAX_AGE': None if max_age.lower() == 'none' else int(max_age),
+        'CONN_HEALTH_CHECKS': env_setting(alias, 'CONN_HEALTH_CHECKS', '1') == '1',
+    }
+
+    pool_size = env_setting(alias, 'POOL_SIZE')
+    if pool_size:
+        if engine not in POOL_ENGINES:
+            raise ImproperlyConfigured(f'DB_POOL_SIZE is not supported for {engine}')
+        try:
+            import dj_db_conn_pool  # noqa: F401
+        except ImportError:
+            raise ImproperlyConfigured('DB_POOL_SIZE requires django-db-connection-pool to be installed')
+        config.update({
+            'ENGINE': POOL_ENGINES[engine],
+            # The pool keeps connections open; Django hands them back after each request
+            'CONN_MAX_AGE': 0,
+            'POOL_OPTIONS': {
+                'POOL_SIZE': int(pool_size),
+                'MAX_OVERFLOW': int(env_setting(alias, 'POOL_MAX_OVERFLOW', '10')),
+                'RECYCLE': int(env_setting(alias, 'POOL_RECYCLE', '3600')),
+            },
+        })
+    return config
@@ -0,0 +1,128 @@
+"""
+Primary/replica database routing
+
+Reads made while serving a GET or HEAD request go to the ``replica`` alias;
+everything else (writes, unsafe requests, transactions, management commands
+and background work) uses ``default``. ``ReplicaRoutingMiddleware`` marks
+which requests may read from the replica.
+
+Read-your-writes: once a request writes, its remaining reads go to the
+primary. A POST/PUT/PATCH/DELETE that wrote also sets a short-lived cookie
+(``REPLICA_PIN_SECONDS``) so the same client's next requests, such as the
+page it is redirected to, read from the primary while the replica catches up.
+
+Without a ``replica`` alias in ``DATABASES``, or while the replica cannot be
+reached, every query goes to the primary.
+
+Data cached under a version stamp (catalogue snapshot, suggestion index,
+rental settings, location pages, facets and clusters) is built inside
+``read_from_primary()``: writes bump the stamp on the primary, so a lagging
+replica could otherwise store stale data under the new version until the
+next write.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+REPLICA_DB_ALIAS = 'replica'
+REPLICA_PIN_COOKIE = 'db_primary_pin'
+REPLICA_RETRY_SECONDS = 30  # How long an unreachable replica is skipped before trying again
+
+_routing_state = ContextVar('sharetools_db_routing', default=None)
+_replica_down_until = 0.0
+
+
+class RoutingState:
+    """
+    Routing decisions for one request.
+
+    Mutated in place rather than replaced so that queries run by
+    ``sync_to_async`` on other threads (which see a copy of the context)
+    share it.
+    """
+    __slots__ = ('use_replica', 'wrote')
+
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+def start_request(use_replica):
+    """Begin routing a request; returns the token for ``end_request``"""
+    state = RoutingState(use_replica)
+    return state, _routing_state.set(state)
+
+
+def end_request(token):
+    _routing_state.reset(token)
+
+
+@contextmanager
+def read_from_primary():
+    """Send this request's reads inside the block to the primary (also usable as a decorator)"""
+    state = _routing_state.get()
+    if state is None or not state.use_replica:
+        yield
+        return
+    state.use_replica = False
+    try:
+        yield
+    finally:
+        # A write inside the block pins the rest of the request to the primary anyway
+        if not state.wrote:
+            state.use_replica = True
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def replica_available():
+    """True unless the replica failed to connect within the last ``REPLICA_RETRY_SECONDS``"""
+    global _replica_down_until
+    if time.monotonic() < _replica_down_until:
+        return False
+    try:
+        connections[REPLICA_DB_ALIAS].ensure_connection()
+    except DatabaseError:
+        logger.warning('Replica database unavailable, reading from primary', exc_info=True)
+        _replica_down_until = time.monotonic() + REPLICA_RETRY_SECONDS
+        return False
+    return True
+
+
+class PrimaryReplicaRouter:
+    """Send request reads to the replica when the request allows it"""
+
+    def db_for_read(self, model, **hints):
+        state = _routing_state.get()
+        if state is None or not state.use_replica or not replica_configured():
+            return DEFAULT_DB_ALIAS
+        # Reads inside a transaction must see its uncommitted writes
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        if not replica_available():
+            state.use_replica = False
+            return DEFAULT_DB_ALIAS
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            # Read-your-writes: the rest of this request reads from the primary
+            state.use_replica = False
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        aliases = {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
@@ -0,0 +1,235 @@
+"""
+Per-request performance metrics for ShareTools
+
+Collects query count, database time, serializer time and response size for
+every request (see ``config.middleware.RequestMetricsMiddleware``), keeps a
+rolling in-memory history per URL name and exposes it to staff users.
+"""
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods
+
+_current_metrics = ContextVar('sharetools_request_metrics', default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a view issues more queries than its declared budget"""
+
+
+class RequestMetrics:
+    """Measurements for a single request"""
+    __slots__ = ('started', 'query_count', 'db_time', 'timings', 'response_size', 'connections_opened')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.timings = defaultdict(float)
+        self.response_size = 0
+        self.connections_opened = 0
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+    def record_query(self, duration):
+        self.query_count += 1
+        self.db_time += duration
+
+    def server_timing(self):
+        """Format measurements as a ``Server-Timing`` header value"""
+        parts = [f'db;dur={self.db_time * 1000:.2f};desc="{self.query_count} queries"']
+        for name, duration in self.timings.items():
+            parts.append(f'{name};dur={duration * 1000:.2f}')
+        parts.append(f'total;dur={self.total_time * 1000:.2f}')
+        return ', '.join(parts)
+
+
+def current_metrics():
+    """Metrics of the request being handled, or ``None`` outside a request"""
+    return _current_metrics.get()
+
+
+class timed(ContextDecorator):
+    """
+    Add the duration of a block to a named phase of the current request.
+
+    Usable as ``with timed('serializer'):`` or as a decorator; does nothing
+    outside a request.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._started = None
+
+    def _recreate_cm(self):
+        # Fresh instance per decorated call so concurrent threads don't share state
+        return self.__class__(self.name)
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        duration = time.perf_counter() - self._started
+        metrics = _current_metrics.get()
+        if metrics is not None:
+            metrics.timings[self.name] += duration
+        return False
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper adding each query to the current request's metrics"""
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record_query(time.perf_counter() - started)
+
+
+def install_query_recorder(connection):
+    """
+    Attach ``record_query`` to a database connection.
+
+    Installed per connection rather than per request because async views run
+    their queries on other threads, which have connection objects of their own.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def connection_opened(sender, connection, **kwargs):
+    """``connection_created`` receiver: instrument the connection and count the connect"""
+    install_query_recorder(connection)
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.connections_opened += 1
+
+
+def query_budget(max_queries):
+    """
+    Declare the maximum number of queries a function view may issue.
+
+    Apply it as the outermost decorator. For DRF viewsets set a
+    ``query_budgets = {'list': 5, ...}`` class attribute instead.
+    """
+    def decorator(view_func):
+        view_func.query_budget = max_queries
+        return view_func
+    return decorator
+
+
+def get_query_budget(request, view_func):
+    """Resolve the declared query budget for a view, if any"""
+    budget = getattr(view_func, 'query_budget', None)
+    if budget is None and hasattr(view_func, 'cls'):
+        actions = getattr(view_func, 'actions', None) or {}
+        action = actions.get(request.method.lower())
+        budget = getattr(view_func.cls, 'query_budgets', {}).get(action)
+    return budget
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not values:
+        return 0.0
+    rank = math.ceil(pct / 100.0 * len(values)) - 1
+    return values[max(0, min(rank, len(values) - 1))]
+
+
+class MetricsRegistry:
+    """Rolling per-URL-name history of request measurements"""
+
+    def __init__(self, history_size=500):
+        self.history_size = history_size
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, url_name, metrics):
+        sample = (
+            metrics.total_time * 1000,
+            metrics.db_time * 1000,
+            metrics.query_count,
+            metrics.timings.get('serializer', 0.0) * 1000,
+            metrics.response_size,
+            metrics.connections_opened,
+        )
+        with self._lock:
+            samples = self._samples.get(url_name)
+            if samples is None:
+                samples = self._samples[url_name] = deque(maxlen=self.history_size)
+            samples.append(sample)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+    def snapshot(self):
+        """Summaries per URL name"""
+        with self._lock:
+            data = {name: list(samples) for name, samples in self._samples.items()}
+
+        summary = {}
+        for name, samples in sorted(data.items()):
+            # Requests that queried the database and did so over an already open connection
+            with_queries = sum(1 for sample in samples if sample[2])
+            reused = sum(1 for sample in samples if sample[2] and not sample[5])
+            total, db, queries, serializer, size, opened = (sorted(column) for column in zip(*samples))
+            count = len(samples)
+            summary[name] = {
+                'count': count,
+                'latency_ms': {
+                    'p50': round(percentile(total, 50), 2),
+                    'p95': round(percentile(total, 95), 2),
+                    'p99': round(percentile(total, 99), 2),
+                },
+                'db_ms': {
+                    'p50': round(percentile(db, 50), 2),
+                    'p95': round(percentile(db, 95), 2),
+                },
+                'serializer_ms': {
+                    'p50': round(percentile(serializer, 50), 2),
+                    'p95': round(percentile(serializer, 95), 2),
+                },
+                'queries': {
+                    'mean': round(sum(queries) / count, 2),
+                    'max': queries[-1],
+                },
+                'response_bytes': {
+                    'mean': round(sum(size) / count),
+                    'max': size[-1],
+                },
+                'connections': {
+                    'opened': sum(opened),
+                    'reuse_rate': round(reused / with_queries, 3) if with_queries else None,
+                },
+            }
+        return summary
+
+
+registry = MetricsRegistry(getattr(settings, 'METRICS_HISTORY_SIZE', 500))
+
+
+@require_http_methods(["GET"])
+def metrics_api(request):
+    """Request metrics API (staff only)"""
+    if not (request.user.is_authenticated and request.user.is_staff):
+        return JsonResponse({
+            'success': False,
+            'message': 'Staff access required'
+        }, status=403)
+
+    return JsonResponse({
+        'success': True,
+        'metrics': registry.snapshot()
+    })
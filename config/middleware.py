@@ -0,0 +1,148 @@
+"""
+ShareTools project middleware
+"""
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from .db_routers import REPLICA_PIN_COOKIE, end_request, replica_configured, start_request
+from .metrics import (
+    QueryBudgetExceeded, RequestMetrics, _current_metrics, connection_opened, get_query_budget,
+    install_query_recorder, registry,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RequestMetricsMiddleware:
+    """
+    Record query count, DB time, serializer/render time and response size
+    for each request.
+
+    Measurements are returned in a ``Server-Timing`` header and added to the
+    rolling per-URL-name history served at ``/api/_metrics/``. Views may
+    declare a query budget (``config.metrics.query_budget``); exceeding it
+    raises ``QueryBudgetExceeded`` when ``QUERY_BUDGET_ENFORCE`` is on and
+    logs a warning otherwise.
+
+    Works in both WSGI and ASGI mode, so async views under ASGI are not
+    forced back onto a worker thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        connection_created.connect(connection_opened, dispatch_uid='request_metrics_connection_opened')
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        """Attach Server-Timing, record the sample and check the view's query budget"""
+        if not response.streaming:
+            metrics.response_size = len(response.content)
+        response['Server-Timing'] = metrics.server_timing()
+
+        match = getattr(request, 'resolver_match', None)
+        registry.record(match.view_name if match else '<unresolved>', metrics)
+
+        budget = get_query_budget(request, match.func) if match else None
+        if budget is not None and metrics.query_count > budget:
+            message = (
+                f'{request.method} {request.path} issued {metrics.query_count} queries, '
+                f'budget is {budget}'
+            )
+            if getattr(settings, 'QUERY_BUDGET_ENFORCE', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
+
+    def process_template_response(self, request, response):
+        # Template and DRF responses are rendered after this hook returns
+        started = time.perf_counter()
+        metrics = _current_metrics.get()
+
+        def record_render(rendered):
+            if metrics is not None:
+                metrics.timings['render'] += time.perf_counter() - started
+
+        response.add_post_render_callback(record_render)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let GET and HEAD requests read from the replica (``config.db_routers``).
+
+    A request carrying the pin cookie reads from the primary. An unsafe
+    request that wrote sets the cookie, so the client sees its own writes
+    on the following requests even if the replica lags behind.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state, token = start_request(self.may_use_replica(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+        return self.finish(request, response, state)
+
+    async def __acall__(self, request):
+        state, token = start_request(self.may_use_replica(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_request(token)
+        return self.finish(request, response, state)
+
+    def may_use_replica(self, request):
+        return (
+            request.method in ('GET', 'HEAD')
+            and REPLICA_PIN_COOKIE not in request.COOKIES
+            and replica_configured()
+        )
+
+    def finish(self, request, response, state):
+        # Writes made while serving a GET (view counters, sessions) only pin that request
+        if state.wrote and request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE') and replica_configured():
+            response.set_cookie(
+                REPLICA_PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+        return response
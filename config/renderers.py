@@ -0,0 +1,69 @@
+"""
+JSON renderer for DRF responses backed by orjson when it is installed
+
+orjson encodes dicts, lists, strings, numbers, ``UUID``, ``date`` and
+``datetime`` in native code; only values it does not know (``Decimal``,
+lazy translation strings, querysets) go through DRF's encoder one at a time.
+Without orjson, or for requests DRF's renderer formats differently, this is
+exactly ``rest_framework.renderers.JSONRenderer``.
+
+The output parses to the same values as DRF's, but it is not always
+byte-identical:
+
+- Floats in exponent form have no ``+`` or leading zero in the exponent
+  (``1e20``, ``1.5e-7``; the stdlib writes ``1e+20``, ``1.5e-07``).
+- NaN and infinities are written as ``null``, where DRF's renderer writes
+  ``NaN``/``Infinity``, or raises ``ValueError`` under ``STRICT_JSON``
+  (the default).
+
+Our payloads carry amounts as ``Decimal`` strings and coordinates and
+distances as small finite floats, so neither case arises in practice.
+"""
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# Same escaping DRF applies: valid JSON, but not valid inside a JavaScript string
+_LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Drop-in ``JSONRenderer`` that produces equivalent JSON with orjson (see the module docstring)"""
+    orjson_options = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+    def __init__(self):
+        super().__init__()
+        self._fallback_encoder = self.encoder_class()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or not self.can_use_orjson(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            content = orjson.dumps(data, default=self._fallback_encoder.default, option=self.orjson_options)
+        except (orjson.JSONEncodeError, ValueError):
+            # Integers beyond 64 bits, unusual mapping types and the like
+            return super().render(data, accepted_media_type, renderer_context)
+        for raw, escaped in _LINE_SEPARATORS:
+            if raw in content:
+                content = content.replace(raw, escaped)
+        return content
+
+    def can_use_orjson(self, accepted_media_type, renderer_context):
+        """orjson always writes compact UTF-8 output with a fixed encoder"""
+        return (
+            self.get_indent(accepted_media_type, renderer_context or {}) is None
+            and self.compact
+            and not self.ensure_ascii
+            and self.encoder_class is JSONEncoder
+        )
+
+
+def json_response(data, status=200):
+    """``data`` rendered as a DRF JSON response, for views outside DRF such as async views"""
+    renderer = FastJSONRenderer()
+    return HttpResponse(renderer.render(data), status=status, content_type=renderer.media_type)
@@ -12,6 +12,9 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import sys
+
+from .db import connection_settings
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -49,6 +52,8 @@ INSTALLED_APPS = [
 AUTH_USER_MODEL = 'core.User'
 
 MIDDLEWARE = [
+    "config.middleware.RequestMetricsMiddleware",
+    "config.middleware.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -86,9 +91,11 @@ WSGI_APPLICATION = "config.wsgi.application"
 # 
 
 # MySQL database configuration (now using MySQL)
+# Persistent connections, health checks and the optional pool are configured from
+# the environment per alias (see config/db.py)
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.mysql",
+        **connection_settings("default", "django.db.backends.mysql"),
         "NAME": "sharetools_new",
         "USER": "root",
         "PASSWORD": "123456",  # MySQL password
@@ -101,6 +108,33 @@ DATABASES = {
     }
 }
 
+# Optional read replica for GET/HEAD requests (see config/db_routers.py).
+# Set DB_REPLICA_HOST to enable; other connection details match "default".
+if os.environ.get("DB_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        **connection_settings("replica", "django.db.backends.mysql"),
+        "HOST": os.environ["DB_REPLICA_HOST"],
+        "PORT": os.environ.get("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        # Tests run against a single database; the replica mirrors it
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["config.db_routers.PrimaryReplicaRouter"]
+
+# Seconds a client reads from the primary after a POST/PUT/PATCH/DELETE that
+# wrote, so it sees its own changes while the replica catches up
+REPLICA_PIN_SECONDS = 5
+
+# Cache (process-local; use a shared backend such as Redis or Memcached when
+# running several processes so cache invalidation reaches all of them)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "sharetools",
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -162,7 +196,9 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        # Equivalent to rest_framework.renderers.JSONRenderer (see config/renderers.py for the float
+        # formatting differences), faster when orjson is installed
+        'config.renderers.FastJSONRenderer',
     ],
 }
 
@@ -194,3 +230,36 @@ CSRF_EXEMPT_URLS = [
     r'^/api/',
     r'^/auth/',
 ]
+
+# Request metrics (see config/metrics.py)
+# Number of recent requests kept per URL name for /api/_metrics/
+METRICS_HISTORY_SIZE = 500
+
+# Raise QueryBudgetExceeded instead of logging when a view exceeds its query budget
+QUERY_BUDGET_ENFORCE = len(sys.argv) > 1 and sys.argv[1] == 'test'
+
+# Seconds a rendered location landing page (/location/<slug>/) stays cached;
+# item changes in that location invalidate it earlier
+LOCATION_PAGE_CACHE_TIMEOUT = 300
+
+# Seconds map clusters (/api/items/clusters/) stay cached; item changes invalidate them earlier
+ITEM_CLUSTERS_CACHE_TIMEOUT = 60
+
+# Seconds search facet counts (/api/items/search/?facets=1) stay cached per filter set
+ITEM_FACETS_CACHE_TIMEOUT = 30
+
+# Serve unsearched browse pages from the process-local item catalogue snapshot
+# (apps/core/catalogue.py), checking for changes at most every CATALOGUE_POLL_INTERVAL seconds
+CATALOGUE_SNAPSHOT_ENABLED = True
+CATALOGUE_POLL_INTERVAL = 5
+
+# Build item list responses (/api/items/, search, featured, my_items) from .values() rows
+# (apps/core/fast_serializers.py) instead of ItemListSerializer; the output is identical
+ITEM_LIST_FAST_SERIALIZER = True
+
+# Seconds between checks for RentalSettings changes made by other processes
+RENTAL_SETTINGS_POLL_INTERVAL = 5
+
+# Completed orders that ended more than this many days ago are moved to the
+# order archive by the archive_rental_orders command (apps/rental/archive.py)
+RENTAL_ARCHIVE_AFTER_DAYS = 365
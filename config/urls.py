@@ -20,8 +20,11 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from .metrics import metrics_api
+
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path('api/_metrics/', metrics_api, name='metrics_api'),  # Request metrics (staff only)
     path('', include('apps.core.urls')),  # 包含core应用的URL配置
     path('rental/', include('apps.rental.urls')),  # 包含rental应用的URL配置
 ]
@@ -1,6 +1,8 @@
 /**
  * Browse Things page interaction script
- * Implements search, category filtering, product display and other functions
+ * Implements search, category filtering, product display and other functions.
+ * Filtering and paging happen on the server: the grid is refreshed and extended
+ * with product card fragments requested from the browse view (?partial=1)
  */
 
 document.addEventListener('DOMContentLoaded', function() {
@@ -12,18 +14,27 @@ document.addEventListener('DOMContentLoaded', function() {
     const categoryItems = document.querySelectorAll('.category-item');
     const productsGrid = document.getElementById('productsGrid');
     const productCards = document.querySelectorAll('.product-card');
+    const productsSentinel = document.getElementById('productsSentinel');
     const makeWishBtn = document.getElementById('makeWishBtn');
 
-    // State management
-    let currentCategory = 'all';
-    let currentFilterType = 'category';
-    let searchQuery = '';
+    // Set on /location/<slug>/ pages, which are scoped to one location by the URL
+    const scopedLocation = productsGrid.dataset.location || '';
+
+    // State management (initial filters come from the server-rendered URL)
+    const initialParams = new URLSearchParams(window.location.search);
+    let currentCategory = initialParams.get('location') || initialParams.get('category') || 'all';
+    let currentFilterType = initialParams.get('location') ? 'location' : 'category';
+    let searchQuery = initialParams.get('q') || '';
+    let sortOrder = initialParams.get('sort') || '';
     let isCategoriesVisible = true;
+    let nextPage = readNextPage(productsGrid);
+    let isLoadingPage = false;
+    let latestRequest = 0;
 
     // ===== Initialization =====
     function init() {
         setupEventListeners();
-        updateProductDisplay();
+        setupInfiniteScroll();
         
         // Add page loading animation
         document.body.classList.add('loaded');
@@ -34,7 +45,7 @@ document.addEventListener('DOMContentLoaded', function() {
     // ===== Event listeners setup =====
     function setupEventListeners() {
         // Search functionality
-        searchInput.addEventListener('input', handleSearch);
+        searchInput.addEventListener('input', debouncedSearch);
         searchInput.addEventListener('keypress', function(e) {
             if (e.key === 'Enter') {
                 handleSearchSubmit();
@@ -53,14 +64,38 @@ document.addEventListener('DOMContentLoaded', function() {
                     return;
                 }
                 
+                // Locations have their own (cached) landing pages
+                const filterType = this.dataset.filterType || 'category';
+                if (filterType === 'location') {
+                    window.location.href = productsGrid.dataset.locationUrl.replace('__location__', this.dataset.category);
+                    return;
+                }
+                if (scopedLocation && this.dataset.category === 'all') {
+                    window.location.href = productsGrid.dataset.browseUrl;
+                    return;
+                }
+
                 // Update current filter
-                currentFilterType = this.dataset.filterType || 'category';
+                currentFilterType = filterType;
                 handleCategoryChange(this.dataset.category);
             });
         });
 
         // Product card interactions
-        productCards.forEach(card => {
+        bindProductCards(productCards);
+
+        // CTA button functionality
+        makeWishBtn.addEventListener('click', handleMakeWish);
+
+        // Responsive handling
+        window.addEventListener('resize', handleResize);
+        
+        // Keyboard shortcuts
+        document.addEventListener('keydown', handleKeyboardShortcuts);
+    }
+
+    function bindProductCards(cards) {
+        cards.forEach(card => {
             card.addEventListener('click', function() {
                 handleProductClick(this);
             });
@@ -74,20 +109,11 @@ document.addEventListener('DOMContentLoaded', function() {
                 this.style.transform = 'translateY(0)';
             });
         });
-
-        // CTA button functionality
-        makeWishBtn.addEventListener('click', handleMakeWish);
-
-        // Responsive handling
-        window.addEventListener('resize', handleResize);
-        
-        // Keyboard shortcuts
-        document.addEventListener('keydown', handleKeyboardShortcuts);
     }
 
     // ===== Search functionality =====
     function handleSearch() {
-        searchQuery = searchInput.value.toLowerCase().trim();
+        searchQuery = searchInput.value.trim();
         updateProductDisplay();
         
         // Real-time search suggestions
@@ -97,7 +123,7 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     function handleSearchSubmit() {
-        searchQuery = searchInput.value.toLowerCase().trim();
+        searchQuery = searchInput.value.trim();
         updateProductDisplay();
         
         // Record search behavior
@@ -133,6 +159,9 @@ document.addEventListener('DOMContentLoaded', function() {
     function handleCategoryChange(category) {
         // Update current category
         currentCategory = category;
+        if (category === 'all') {
+            currentFilterType = 'category';
+        }
         
         // Update active status
         categoryItems.forEach(item => {
@@ -159,69 +188,94 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     // ===== Product display update =====
-    function updateProductDisplay() {
-        let visibleCount = 0;
-        
-        productCards.forEach(card => {
-            const cardCategory = card.dataset.category;
-            const cardLocation = card.dataset.location;
-            const cardTitle = card.querySelector('.product-title').textContent.toLowerCase();
-            
-            // Filter logic based on filter type
-            let filterMatch = false;
-            if (currentCategory === 'all') {
-                filterMatch = true;
-            } else if (currentFilterType === 'category') {
-                filterMatch = cardCategory === currentCategory;
-            } else if (currentFilterType === 'location') {
-                filterMatch = cardLocation === currentCategory;
+    function filterParams() {
+        const params = new URLSearchParams();
+        if (currentCategory !== 'all') {
+            params.set(currentFilterType === 'location' ? 'location' : 'category', currentCategory);
+        }
+        if (searchQuery) {
+            params.set('q', searchQuery);
+        }
+        if (sortOrder) {
+            params.set('sort', sortOrder);
+        }
+        return params;
+    }
+
+    function readNextPage(container) {
+        const marker = container.querySelector('.products-page');
+        const page = marker && marker.dataset.nextPage ? Number(marker.dataset.nextPage) : null;
+        if (marker) {
+            marker.remove();
+        }
+        return page;
+    }
+
+    async function loadProducts(reset) {
+        if (!reset && (isLoadingPage || !nextPage)) {
+            return;
+        }
+
+        const params = filterParams();
+        if (reset) {
+            // Keep the address bar shareable without adding a history entry per keystroke
+            const query = params.toString();
+            history.replaceState(null, '', query ? '?' + query : window.location.pathname);
+        }
+        params.set('page', reset ? 1 : nextPage);
+        params.set('partial', '1');
+
+        const requestId = ++latestRequest;
+        isLoadingPage = true;
+        try {
+            const response = await fetch(window.location.pathname + '?' + params.toString(), {
+                credentials: 'same-origin',
+                headers: { 'X-Requested-With': 'XMLHttpRequest' }
+            });
+            if (!response.ok) {
+                throw new Error('Failed to load products: ' + response.status);
             }
-            
-            // Search filter logic
-            const searchMatch = searchQuery === '' || cardTitle.includes(searchQuery);
-            
-            // Show/hide product cards
-            if (filterMatch && searchMatch) {
-                card.classList.remove('hidden');
-                card.classList.add('filtered');
-                visibleCount++;
-                
-                // Add delayed animation effect
-                setTimeout(() => {
-                    card.style.opacity = '1';
-                    card.style.transform = 'translateY(0)';
-                }, visibleCount * 100);
-            } else {
-                card.classList.add('hidden');
-                card.classList.remove('filtered');
-                card.style.opacity = '0';
-                card.style.transform = 'translateY(20px)';
+            const html = await response.text();
+            if (requestId !== latestRequest) {
+                return;  // A newer filter change superseded this request
             }
-        });
-        
-        // Show no results message
-        showNoResultsMessage(visibleCount === 0);
-        
-        console.log(`Showing ${visibleCount} products`);
+
+            const fragment = document.createElement('template');
+            fragment.innerHTML = html;
+            nextPage = readNextPage(fragment.content);
+
+            const cards = fragment.content.querySelectorAll('.product-card');
+            bindProductCards(cards);
+            if (reset) {
+                productsGrid.replaceChildren();
+            }
+            productsGrid.appendChild(fragment.content);
+            animateCards(cards);
+
+            console.log(`Loaded ${cards.length} products`);
+        } catch (error) {
+            console.error(error);
+        } finally {
+            if (requestId === latestRequest) {
+                isLoadingPage = false;
+            }
+        }
     }
 
-    function showNoResultsMessage(show) {
-        let noResultsEl = document.querySelector('.no-results');
-        
-        if (show && !noResultsEl) {
-            noResultsEl = document.createElement('div');
-            noResultsEl.className = 'no-results';
-            noResultsEl.innerHTML = `
-                <div style="text-align: center; padding: 40px; color: #808080;">
-                    <i class="fas fa-search" style="font-size: 48px; margin-bottom: 16px; opacity: 0.5;"></i>
-                    <h3 style="margin-bottom: 8px;">No matching products found</h3>
-                    <p>Try adjusting search criteria or selecting a different category</p>
-                </div>
-            `;
-            productsGrid.appendChild(noResultsEl);
-        } else if (!show && noResultsEl) {
-            noResultsEl.remove();
+    function updateProductDisplay() {
+        loadProducts(true);
+    }
+
+    function setupInfiniteScroll() {
+        if (!productsSentinel || !('IntersectionObserver' in window)) {
+            return;
         }
+        // Fetch the next page shortly before the end of the grid scrolls into view
+        new IntersectionObserver(entries => {
+            if (entries.some(entry => entry.isIntersecting)) {
+                loadProducts(false);
+            }
+        }, { rootMargin: '400px' }).observe(productsSentinel);
     }
 
     // ===== Product interactions =====
@@ -324,6 +378,7 @@ document.addEventListener('DOMContentLoaded', function() {
         };
         
         if (categoryMap[e.key]) {
+            currentFilterType = 'category';
             handleCategoryChange(categoryMap[e.key]);
         }
     }
@@ -341,18 +396,16 @@ document.addEventListener('DOMContentLoaded', function() {
         };
     }
 
-    // Debounced search
+    // Debounced search (each search is a server request), bound in setupEventListeners
     const debouncedSearch = debounce(handleSearch, 300);
-    
-    // Replace original search event listener
-    if (searchInput) {
-        searchInput.removeEventListener('input', handleSearch);
-        searchInput.addEventListener('input', debouncedSearch);
-    }
 
     // ===== Animations and visual effects =====
     function addLoadingAnimation() {
-        productCards.forEach((card, index) => {
+        animateCards(productCards);
+    }
+
+    function animateCards(cards) {
+        cards.forEach((card, index) => {
             card.style.opacity = '0';
             card.style.transform = 'translateY(20px)';
             
@@ -0,0 +1,106 @@
+/**
+ * Rental order lists (My Rentals / My Item Rentals)
+ * Loads orders page by page from the cursor-paginated rental APIs and
+ * renders each one from a <template> element on the page
+ */
+
+document.addEventListener('DOMContentLoaded', function() {
+    const PLACEHOLDER_ID = '00000000-0000-0000-0000-000000000000';
+
+    // ===== Value formatting =====
+    function formatValue(value, format) {
+        if (value === null || value === undefined) {
+            return '';
+        }
+        if (format === 'date' || format === 'short-date') {
+            const options = { month: 'short', day: '2-digit' };
+            if (format === 'date') {
+                options.year = 'numeric';
+            }
+            return new Date(value + 'T00:00:00').toLocaleDateString('en-US', options);
+        }
+        if (format === 'money') {
+            return Number(value).toFixed(2);
+        }
+        return String(value);
+    }
+
+    // ===== Rendering =====
+    function renderOrder(order, template, detailUrl) {
+        const fragment = template.content.cloneNode(true);
+        const root = fragment.firstElementChild;
+        root.dataset.rentalId = order.id;
+
+        fragment.querySelectorAll('[data-show-status]').forEach(function(element) {
+            if (element.dataset.showStatus !== order.status) {
+                element.remove();
+            }
+        });
+        fragment.querySelectorAll('[data-field]').forEach(function(element) {
+            element.textContent = formatValue(order[element.dataset.field], element.dataset.format);
+        });
+        fragment.querySelectorAll('[data-status-class]').forEach(function(element) {
+            element.classList.add('status-' + order.status);
+        });
+        fragment.querySelectorAll('[data-detail-link]').forEach(function(element) {
+            element.href = detailUrl.replace(PLACEHOLDER_ID, order.id);
+        });
+        return fragment;
+    }
+
+    // ===== Paged loading =====
+    function setupList(list) {
+        const template = document.getElementById(list.dataset.template);
+        const loadMoreBtn = list.parentElement.querySelector('[data-load-more]');
+        const emptyState = list.querySelector('[data-empty-state]');
+        let nextUrl = list.dataset.url;
+        let loading = false;
+
+        async function loadPage() {
+            if (!nextUrl || loading) {
+                return;
+            }
+            loading = true;
+            try {
+                const response = await fetch(nextUrl, {
+                    credentials: 'same-origin',
+                    headers: { 'Accept': 'application/json' }
+                });
+                if (!response.ok) {
+                    throw new Error('Failed to load rentals: ' + response.status);
+                }
+                const page = await response.json();
+                page.results.forEach(function(order) {
+                    list.appendChild(renderOrder(order, template, list.dataset.detailUrl));
+                });
+                if (emptyState && !list.querySelector('[data-rental-id]')) {
+                    emptyState.hidden = false;
+                }
+                nextUrl = page.next;
+            } catch (error) {
+                console.error(error);
+            } finally {
+                loading = false;
+                if (loadMoreBtn) {
+                    loadMoreBtn.hidden = !nextUrl;
+                }
+            }
+        }
+
+        if (loadMoreBtn) {
+            loadMoreBtn.addEventListener('click', loadPage);
+            // Infinite scroll: fetch the next page as the button comes into view
+            if ('IntersectionObserver' in window) {
+                new IntersectionObserver(function(entries) {
+                    if (entries.some(function(entry) { return entry.isIntersecting; })) {
+                        loadPage();
+                    }
+                }, { rootMargin: '200px' }).observe(loadMoreBtn);
+            }
+        }
+
+        loadPage();
+    }
+
+    document.querySelectorAll('[data-rental-list]').forEach(setupList);
+});